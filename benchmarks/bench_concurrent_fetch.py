@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Benchmark concurrent description fetching against the local stub server.
+
+Runs fetch_jobs() once per worker count with the same shared rate limit and
+prints wall-clock time and speedup over a single worker.
+
+Usage:
+  python3 benchmarks/bench_concurrent_fetch.py
+  python3 benchmarks/bench_concurrent_fetch.py --jobs 50 --latency 0.3 --rate 20 --workers 1 2 4 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "linkedin-job-push" / "scripts"))
+
+import fetch_jobs  # noqa: E402
+from stub_server import StubServer, point_fetcher_at  # noqa: E402
+from util.http import format_stats, get_client  # noqa: E402
+
+
+def run_once(base_url: str, jobs: int, workers: int, rate: float) -> tuple[float, dict]:
+    point_fetcher_at(fetch_jobs, base_url)
+    config = {
+        "filters": {"keywords": ["React"], "country": "Canada", "maxResults": jobs},
+        "fetch": {"workers": workers, "requestsPerSecond": rate, "skipSeen": False},
+        "cache": {"enabled": False},
+    }
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = fetch_jobs.fetch_jobs(config)
+    elapsed = time.perf_counter() - started
+    assert len(result) == jobs and all(j["description"] for j in result), "incomplete fetch"
+    return elapsed, get_client().stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--jobs", type=int, default=30)
+    parser.add_argument("--latency", type=float, default=0.2, help="Stub response latency (s)")
+    parser.add_argument("--rate", type=float, default=20.0, help="Shared requests/second limit")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    print(f"{args.jobs} jobs, {args.latency * 1000:.0f}ms latency, {args.rate:g} req/s limit")
+    baseline = None
+    with StubServer(total_jobs=args.jobs, latency=args.latency) as server:
+        for workers in args.workers:
+            elapsed, stats = run_once(server.base_url, args.jobs, workers, args.rate)
+            baseline = baseline or elapsed
+            print(f"  workers={workers:<3} {elapsed:6.2f}s  speedup x{baseline / elapsed:.2f}  "
+                  f"{format_stats(stats)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""Benchmark a full fetch + push run against the local LinkedIn and Telegram stubs.
+
+Runs fetch_jobs.run() and push_jobs.push() in a temporary directory, with
+the stub serving the recorded LinkedIn pages (``--synthetic`` for the
+templated ones) under configurable latency, jitter and 429 injection. It
+prints end-to-end, fetch and push time, per-job description fetch latency
+percentiles (including the wait for the shared rate limiter), and the
+slowest stages from the run's metrics report. Every run starts cold: no
+description cache, seen IDs or archive. ``--lazy`` fetches descriptions
+only until ``--max-send`` jobs pass the filters (``fetch.lazyDescriptions``).
+
+Usage:
+  python3 benchmarks/bench_e2e.py
+  python3 benchmarks/bench_e2e.py --jobs 100 --latency 0.1 --jitter 0.2 --throttle-rate 0.05 --runs 3
+  python3 benchmarks/bench_e2e.py --lazy
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent / "linkedin-job-push" / "scripts"))
+
+import fetch_jobs  # noqa: E402
+import push_jobs  # noqa: E402
+from stub_server import StubServer, point_fetcher_at  # noqa: E402
+from telegram_stub import TelegramStub, point_pusher_at  # noqa: E402
+from util.profiles import load_profiles  # noqa: E402
+
+CHAT_ID = "111"
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))] if ordered else 0.0
+
+
+def use_workdir(workdir: Path):
+    """Point every file fetch_jobs and push_jobs read or write into ``workdir``."""
+    for module in (fetch_jobs, push_jobs):
+        module.STATE_PATH = workdir / "state.json"
+        module.SEEN_DB_PATH = workdir / "state.db"
+        module.ARCHIVE_PATH = workdir / "archive.db"
+        module.JOBS_STREAM_PATH = workdir / "jobs.jsonl"
+    fetch_jobs.JOBS_OUTPUT_PATH = push_jobs.JOBS_PATH = workdir / "jobs.json"
+    fetch_jobs.CACHE_PATH = workdir / "cache.db"
+    push_jobs.SECRETS_PATH = workdir / "secrets.json"
+
+
+def timed_descriptions(latencies: list[float]):
+    """Wrap fetch_job_description to record each job's fetch time in seconds."""
+    original = fetch_jobs.fetch_job_description
+    lock = threading.Lock()
+
+    def fetch_job_description(job_url: str):
+        started = time.perf_counter()
+        try:
+            return original(job_url)
+        finally:
+            with lock:
+                latencies.append(time.perf_counter() - started)
+
+    return original, fetch_job_description
+
+
+def run_once(args: argparse.Namespace) -> dict:
+    config = {
+        "filters": {"keywords": ["Developer", "Engineer"], "country": "Canada",
+                    "maxResults": args.jobs, "maxSend": args.max_send},
+        "fetch": {"workers": args.workers, "requestsPerSecond": args.rate,
+                  "maxRequestsPerSecond": args.rate * 2, "skipSeen": False,
+                  "lazyDescriptions": args.lazy},
+        "cache": {"enabled": False},
+    }
+    latencies: list[float] = []
+    original, wrapped = timed_descriptions(latencies)
+    output = io.StringIO()
+    with tempfile.TemporaryDirectory() as tmp, \
+            StubServer(total_jobs=args.jobs, latency=args.latency, jitter=args.jitter,
+                       recorded=not args.synthetic) as server, \
+            TelegramStub() as bot:
+        workdir = Path(tmp)
+        use_workdir(workdir)
+        config["metrics"] = {"reportFile": str(workdir / "run-report.jsonl")}
+        server.state.throttle_rate = args.throttle_rate
+        server.state.retry_after = str(args.retry_after)
+        point_fetcher_at(fetch_jobs, server.base_url)
+        point_pusher_at(push_jobs, bot.send_message_url)
+        (workdir / "secrets.json").write_text(
+            json.dumps({"TELEGRAM_BOT_TOKEN": "bench", "TELEGRAM_CHAT_ID": CHAT_ID}), encoding="utf-8")
+        environ = {name: os.environ.pop(name) for name in ("TELEGRAM_BOT_TOKEN", "TELEGRAM_CHAT_ID")
+                   if name in os.environ}
+
+        fetch_jobs.fetch_job_description = wrapped
+        try:
+            with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+                started = time.perf_counter()
+                fetched = fetch_jobs.run(config)
+                fetch_done = time.perf_counter()
+                pushed = push_jobs.push(config, push_jobs.JOBS_PATH, load_profiles(config))
+                finished = time.perf_counter()
+        finally:
+            fetch_jobs.fetch_job_description = original
+            os.environ.update(environ)
+
+        jobs = json.loads(push_jobs.JOBS_PATH.read_text(encoding="utf-8"))
+        reports = [json.loads(line) for line in (workdir / "run-report.jsonl").read_text().splitlines()]
+        complete = len(jobs) >= min(args.jobs, args.max_send) if args.lazy else len(jobs) == args.jobs
+        if not fetched or not pushed or not complete or not bot.state.messages.get(CHAT_ID):
+            print(output.getvalue(), file=sys.stderr)
+            raise SystemExit(f"incomplete run: {len(jobs)}/{args.jobs} jobs, fetch ok={fetched}, push ok={pushed}")
+
+    return {
+        "e2e_s": finished - started,
+        "fetch_s": fetch_done - started,
+        "push_s": finished - fetch_done,
+        "fetch_p50_ms": percentile(latencies, 0.5) * 1000,
+        "fetch_p90_ms": percentile(latencies, 0.9) * 1000,
+        "fetch_p99_ms": percentile(latencies, 0.99) * 1000,
+        "fetch_max_ms": max(latencies) * 1000,
+        "descriptions": len(latencies),
+        "requests": server.state.requests,
+        "throttled": server.state.throttled,
+        "messages": len(bot.state.messages[CHAT_ID]),
+        "stages": {report["run"]: report["stages"] for report in reports},
+    }
+
+
+def measure(args: argparse.Namespace) -> dict:
+    """Median of each number over ``args.runs`` runs; stages from the last run."""
+    runs = [run_once(args) for _ in range(args.runs)]
+    result = {key: statistics.median(run[key] for run in runs) for key in runs[0] if key != "stages"}
+    result["stages"] = runs[-1]["stages"]
+    return result
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.05, help="Stub response latency (s)")
+    parser.add_argument("--jitter", type=float, default=0.05, help="Extra random latency, up to (s)")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Share of requests answered with 429")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After on injected 429s (s)")
+    parser.add_argument("--rate", type=float, default=50.0, help="Starting requests/second limit")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--max-send", type=int, default=10)
+    parser.add_argument("--runs", type=int, default=1)
+    parser.add_argument("--synthetic", action="store_true", help="Serve templated pages, not the recorded ones")
+    parser.add_argument("--lazy", action="store_true", help="Fetch descriptions only until --max-send jobs qualify")
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+    result = measure(args)
+    print(f"{args.jobs} jobs, {args.latency * 1000:.0f}ms latency + up to {args.jitter * 1000:.0f}ms jitter, "
+          f"{args.throttle_rate:.0%} throttled, {args.workers} workers at {args.rate:g} req/s "
+          f"(median of {args.runs} runs)")
+    print(f"  end to end {result['e2e_s']:6.2f}s  (fetch {result['fetch_s']:.2f}s, push {result['push_s']:.2f}s)")
+    print(f"  per-job description fetch: p50 {result['fetch_p50_ms']:.0f}ms  p90 {result['fetch_p90_ms']:.0f}ms  "
+          f"p99 {result['fetch_p99_ms']:.0f}ms  max {result['fetch_max_ms']:.0f}ms")
+    print(f"  {result['requests']:.0f} LinkedIn requests ({result['throttled']:.0f} throttled), "
+          f"{result['descriptions']:.0f} descriptions fetched, {result['messages']:.0f} Telegram messages")
+    for run, stages in result["stages"].items():
+        slowest = sorted(stages.items(), key=lambda item: item[1]["seconds"], reverse=True)[:5]
+        print(f"  {run} stages: " + ", ".join(f"{name} {entry['seconds']:.2f}s" for name, entry in slowest))
+
+
+if __name__ == "__main__":
+    main()
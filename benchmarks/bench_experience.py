@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""Check and benchmark years-of-experience extraction.
+
+Checks util/experience.py against the labelled corpus in
+benchmarks/fixtures/experience_cases.json, one text at a time and in batch
+mode, then times extraction over synthetic descriptions built from the saved
+job posting. "legacy" is the single-regex extractor it replaced, which read
+"3-5 years" as 5; its disagreements with the corpus are listed for reference.
+
+Usage:
+  python3 benchmarks/bench_experience.py [--jobs 5000] [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+FIXTURES = BENCH_DIR / "fixtures"
+sys.path.insert(0, str(BENCH_DIR.parent / "linkedin-job-push" / "scripts"))
+
+from util.experience import extract_experience_batch, extract_min_experience_years  # noqa: E402
+from util.parser import get_parser  # noqa: E402
+
+_LEGACY_WORDS = {
+    "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7,
+    "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12,
+    "thirteen": 13, "fourteen": 14, "fifteen": 15, "sixteen": 16,
+    "seventeen": 17, "eighteen": 18, "nineteen": 19, "twenty": 20,
+}
+
+_LEGACY_RE = re.compile(
+    r"""(
+        \b(\d+)\s*(\+|plus)?\s*(?:years?|yrs?)\b
+        |
+        \b(\d+)\s*[-–]\s*(\d+)\s*(?:years?|yrs?)\b
+        |
+        \b(?:minimum|min\.?|at\s*least|at\s*min\.?)\s*(\d+)\s*(?:years?|yrs?)\b
+        |
+        \b(three|four|five|six|seven|eight|nine|ten|
+           eleven|twelve|thirteen|fourteen|fifteen|
+           sixteen|seventeen|eighteen|nineteen|twenty)
+        \s*(\+|plus)?\s*(?:years?|yrs?)\b
+    )""",
+    re.IGNORECASE | re.VERBOSE,
+)
+
+
+def legacy_extract(text: str) -> int | None:
+    """The original extractor: one verbose alternation over the whole text."""
+    if not text:
+        return None
+    max_years = None
+    for m in _LEGACY_RE.finditer(text):
+        if m.group(2):
+            years = int(m.group(2))
+        elif m.group(4) and m.group(5):
+            years = int(m.group(5))
+        elif m.group(6):
+            years = int(m.group(6))
+        elif m.group(7):
+            years = _LEGACY_WORDS.get(m.group(7).lower(), 0)
+        else:
+            continue
+        if max_years is None or years > max_years:
+            max_years = years
+    return max_years
+
+
+def check_corpus() -> bool:
+    cases = json.loads((FIXTURES / "experience_cases.json").read_text(encoding="utf-8"))
+    texts = [case["text"] for case in cases]
+    expected = [case["years"] for case in cases]
+    single = [extract_min_experience_years(text) for text in texts]
+    batch = extract_experience_batch(texts)
+
+    failures = [(t, e, s) for t, e, s in zip(texts, expected, single) if e != s]
+    for text, want, got in failures:
+        print(f"  FAIL {text!r}: expected {want}, got {got}")
+    if batch != single:
+        print("  FAIL batch mode disagrees with single-text extraction")
+    legacy_misses = sum(legacy_extract(t) != e for t, e in zip(texts, expected))
+    print(f"Corpus: {len(cases) - len(failures)}/{len(cases)} correct, batch mode "
+          f"{'agrees' if batch == single else 'DISAGREES'}; legacy extractor gets {legacy_misses} wrong")
+    return not failures and batch == single
+
+
+def synthetic_descriptions(count: int) -> list[str]:
+    """Variations of the saved posting: about a third state no requirement at all."""
+    base = get_parser("bs4").parse_description((FIXTURES / "job_posting.html").read_text(encoding="utf-8"))
+    base = re.sub(r"(?i)\b(?:years?|yrs?)\b", "", base)
+    phrases = ["{}+ years of experience", "{}-{} years in a similar role", "minimum {} yrs",
+               "at least five years", "{} to {} years of industry experience"]
+    rng = random.Random(42)
+    texts = []
+    for _ in range(count):
+        words = base.split()
+        if rng.random() < 2 / 3:
+            lo = rng.randint(1, 8)
+            phrase = rng.choice(phrases).format(lo, lo + rng.randint(1, 4))
+            words.insert(rng.randrange(len(words)), phrase)
+        texts.append(" ".join(words))
+    return texts
+
+
+def timed(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def measure(jobs: int, repeat: int) -> dict[str, float]:
+    """Best-of-``repeat`` seconds per extractor over ``jobs`` synthetic descriptions."""
+    texts = synthetic_descriptions(jobs)
+    runs = {
+        "legacy": lambda: [legacy_extract(t) for t in texts],
+        "two-stage": lambda: [extract_min_experience_years(t) for t in texts],
+        "two-stage batch": lambda: extract_experience_batch(texts),
+    }
+    return {"megabytes": sum(map(len, texts)) / 1e6, **{name: timed(fn, repeat) for name, fn in runs.items()}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    ok = check_corpus()
+
+    results = measure(args.jobs, args.repeat)
+    megabytes = results.pop("megabytes")
+    print(f"\n{args.jobs} descriptions, {megabytes:.1f} MB of text (best of {args.repeat})")
+    baseline = None
+    for name, seconds in results.items():
+        baseline = baseline or seconds
+        print(f"  {name:<16} {seconds * 1000:8.1f} ms  {args.jobs / seconds:10.0f} jobs/s  "
+              f"{megabytes / seconds:6.1f} MB/s  x{baseline / seconds:.1f}")
+
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""Benchmark push filter throughput over synthetic job corpora.
+
+Streams synthetic jobs through build_pipeline() with the example config's
+filters and prints jobs per second per corpus size. Titles, companies and
+locations come from small pools, descriptions are built from the saved job
+posting (a quarter of them without any keyword), and a tenth of the jobs
+are already seen. The jobs are generated on the fly, so a 1M-job
+corpus needs no more memory than a 10k one; generating them is timed
+separately and left out of the throughput. The "ranked" column also
+ranks the survivors for a 10-job message, as push_jobs.py does. Before
+timing, the ranking is checked against edge-case weights (e.g.
+``titleWeight: 0`` with a keyword only in the title); the run fails if
+any of them cannot be scored.
+
+Usage:
+  python3 benchmarks/bench_filter.py
+  python3 benchmarks/bench_filter.py --sizes 10000 100000 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Iterator
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent / "linkedin-job-push" / "scripts"))
+
+from bench_experience import synthetic_descriptions  # noqa: E402
+from util.filter import JobRanker, JobScorer, build_pipeline, build_scorer  # noqa: E402
+from util.jobio import JobRecord  # noqa: E402
+
+CONFIG = {
+    "filters": {
+        "keywords": ["React", "JavaScript", "TypeScript"],
+        "excludeKeyWords": ["Senior", "Lead", "Principal", "Staff"],
+        "excludeProvinces": ["QC", "AB"],
+        "excludeLocationKeywords": ["Quebec", "Montreal", "Montréal", "Alberta", "Calgary", "Edmonton"],
+        "maxExperienceYears": 3,
+    },
+}
+
+TITLES = ["Frontend Developer", "React Engineer", "Senior JavaScript Developer", "Software Engineer II",
+          "Full Stack Developer", "Lead Frontend Engineer", "Junior Web Developer", "Data Analyst",
+          "TypeScript Developer", "Backend Engineer (Go)"]
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Vandelay", "Stark", "Wayne"]
+LOCATIONS = ["Toronto, ON", "Vancouver, BC", "Montreal, QC", "Calgary, AB", "Ottawa, ON",
+             "Waterloo, ON", "Halifax, NS", "Remote, Canada"]
+
+# Descriptions are drawn from this many distinct texts
+DESCRIPTION_POOL = 200
+SEEN_SHARE = 0.1
+RANK_TOP = 10
+
+
+def synthetic_jobs(count: int, seed: int = 42) -> Iterator[dict]:
+    """``count`` job records, generated lazily; the same seed gives the same corpus."""
+    rng = random.Random(seed)
+    descriptions = synthetic_descriptions(DESCRIPTION_POOL)
+    keywords = re.compile("|".join(CONFIG["filters"]["keywords"]), re.IGNORECASE)
+    for i in range(0, len(descriptions), 4):
+        descriptions[i] = keywords.sub("", descriptions[i])
+    for index in range(count):
+        yield {
+            "id": str(4000000000 + index),
+            "title": rng.choice(TITLES),
+            "company": rng.choice(COMPANIES),
+            "location": rng.choice(LOCATIONS),
+            "url": f"https://www.linkedin.com/jobs/view/{4000000000 + index}",
+            "posted": f"2026-10-{rng.randint(1, 17):02d}",
+            "description": rng.choice(descriptions),
+        }
+
+
+def seen_ids(count: int) -> set[str]:
+    return {str(4000000000 + index) for index in range(0, count, int(1 / SEEN_SHARE))}
+
+
+def measure(size: int, rank: bool = False) -> dict:
+    """Filter (and with ``rank``, rank) one corpus of ``size`` jobs; seconds exclude generating the jobs."""
+    started = time.perf_counter()
+    for _ in synthetic_jobs(size):
+        pass
+    generate = time.perf_counter() - started
+
+    pipeline = build_pipeline(CONFIG, seen=seen_ids(size))
+    ranker = JobRanker(JobScorer(CONFIG), RANK_TOP, JobRecord.from_job)
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):  # exclude/experience stages print each drop
+        kept = 0
+        for job in pipeline.run(synthetic_jobs(size)):
+            kept += 1
+            if rank:
+                ranker.offer(job)
+        if rank:
+            ranker.top()
+    seconds = max(time.perf_counter() - started - generate, 1e-9)
+    return {"jobs": size, "kept": kept, "seconds": seconds, "jobs_per_s": size / seconds,
+            "generate_seconds": generate, "pipeline": pipeline}
+
+
+# Valid ranking settings at the edges of config.schema.json, with a job each must score
+EDGE_RANKINGS = [
+    {"titleWeight": 0},
+    {"titleWeight": 0, "recencyWeight": 0, "experienceWeight": 0},
+]
+EDGE_JOBS = [
+    {"id": "title-only", "title": "React Developer", "description": "We build things", "location": "Toronto, ON"},
+    {"id": "no-keyword", "title": "Data Analyst", "description": "", "location": "Toronto, ON"},
+]
+
+
+def check_ranking_edges() -> list[str]:
+    """Score the edge-case jobs under each edge-case ranking; the failures, if any."""
+    failures = []
+    for ranking in EDGE_RANKINGS:
+        scorer = build_scorer({**CONFIG, "ranking": ranking})
+        for job in EDGE_JOBS:
+            try:
+                tf = scorer.term_frequencies(job)
+                scorer.observe(tf)
+                scorer.keyword_score(tf) + scorer.prior(job)
+            except (ValueError, ZeroDivisionError) as e:
+                failures.append(f"ranking {ranking} on job {job['id']}: {e!r}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    failures = check_ranking_edges()
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"{'jobs':>9} {'kept':>8} {'filter':>10} {'jobs/s':>12} {'ranked':>10} {'jobs/s':>12} {'generate':>10}")
+    for size in args.sizes:
+        ranked = measure(size, rank=True)
+        result = measure(size)
+        print(f"{size:>9} {result['kept']:>8} {result['seconds']:>9.2f}s {result['jobs_per_s']:>12.0f} "
+              f"{ranked['seconds']:>9.2f}s {ranked['jobs_per_s']:>12.0f} {result['generate_seconds']:>9.2f}s")
+    print()
+    print(result["pipeline"].format_stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Check that push_jobs' peak memory does not grow with the size of its input.
+
+Writes jobs.json and jobs.jsonl files of increasing size (synthetic jobs
+with full-length descriptions), runs a dry-run push_jobs.push() over each
+under tracemalloc, and compares peak traced memory. "load all" is the
+earlier approach, json.load plus a list of every kept job, for reference.
+Fails if the largest input's peak exceeds the smallest's by more than
+``--slack`` MB.
+
+Usage:
+  python3 benchmarks/bench_memory.py
+  python3 benchmarks/bench_memory.py --sizes 1000 10000 50000 --slack 1
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent / "linkedin-job-push" / "scripts"))
+
+import push_jobs  # noqa: E402
+from bench_e2e import use_workdir  # noqa: E402
+from bench_filter import CONFIG, synthetic_jobs  # noqa: E402
+from util.filter import build_pipeline  # noqa: E402
+from util.profiles import load_profiles  # noqa: E402
+
+MB = 1024 * 1024
+
+
+def write_jobs(path: Path, count: int):
+    """Write ``count`` jobs as a JSON array or JSON Lines, without holding them all."""
+    with open(path, "w", encoding="utf-8") as f:
+        if path.suffix == ".jsonl":
+            for job in synthetic_jobs(count):
+                f.write(json.dumps(job, ensure_ascii=False) + "\n")
+            return
+        f.write("[\n")
+        for index, job in enumerate(synthetic_jobs(count)):
+            f.write(("" if index == 0 else ",\n") + json.dumps(job, ensure_ascii=False, indent=2))
+        f.write("\n]\n")
+
+
+def traced_peak(fn) -> tuple[float, float]:
+    """(peak traced MB, seconds) while ``fn`` runs, with output discarded."""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        fn()  # warm up lazy imports and caches outside the measurement
+        tracemalloc.start()
+        started = time.perf_counter()
+        try:
+            fn()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return peak / MB, time.perf_counter() - started
+
+
+def push_config() -> dict:
+    return {**CONFIG, "filters": {**CONFIG["filters"], "maxSend": 10}, "metrics": {"enabled": False}}
+
+
+def measure(size: int, name: str = "jobs.jsonl") -> float:
+    """Peak traced MB of a dry-run push over ``size`` jobs."""
+    config = push_config()
+    with tempfile.TemporaryDirectory() as tmp:
+        use_workdir(Path(tmp))
+        path = Path(tmp) / name
+        write_jobs(path, size)
+        return traced_peak(lambda: push_jobs.push(config, path, load_profiles(config), dry_run=True))[0]
+
+
+def load_all(config: dict, path: Path):
+    with open(path, "r", encoding="utf-8") as f:
+        jobs = json.load(f)
+    return list(build_pipeline(config, seen=set()).run(jobs))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--slack", type=float, default=1.0,
+                        help="Max MB the largest input's peak may exceed the smallest's")
+    args = parser.parse_args()
+
+    config = push_config()
+    profiles = load_profiles(config)
+    peaks: dict[str, list[float]] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        use_workdir(workdir)
+        print(f"{'jobs':>8} {'file':>10}   {'jobs.json':>16} {'jobs.jsonl':>16} {'load all':>16}")
+        for size in args.sizes:
+            row = []
+            for name in ("jobs.json", "jobs.jsonl"):
+                path = workdir / name
+                write_jobs(path, size)
+                peak, seconds = traced_peak(lambda: push_jobs.push(config, path, profiles, dry_run=True))
+                peaks.setdefault(name, []).append(peak)
+                row.append(f"{peak:>8.2f} MB {seconds:>4.1f}s")
+            peak, seconds = traced_peak(lambda: load_all(config, workdir / "jobs.json"))
+            row.append(f"{peak:>8.2f} MB {seconds:>4.1f}s")
+            megabytes = (workdir / "jobs.json").stat().st_size / MB
+            print(f"{size:>8} {megabytes:>7.1f} MB   " + " ".join(row))
+
+    growth = {name: values[-1] - values[0] for name, values in peaks.items()}
+    print("\nPeak growth from smallest to largest input: "
+          + ", ".join(f"{name} {mb:+.2f} MB" for name, mb in growth.items()))
+    if any(mb > args.slack for mb in growth.values()):
+        print(f"FAIL: push_jobs peak memory grew by more than {args.slack:g} MB", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""Benchmark near-duplicate checks against an index of already-sent jobs.
+
+Indexes ``--sent`` synthetic jobs in a temporary state.db, then checks
+reposts of some of them (an agency intro added, the closing text cut and a
+few words changed, under a new ID and company), as many new jobs, and
+as many exact copies of indexed jobs posted for another city. New jobs
+share their company's boilerplate with the indexed ones, as real
+postings do. Prints per-job check latency percentiles, how many reposts
+were caught and how many new or other-city jobs were wrongly collapsed.
+Fails if the median check takes longer than ``--budget-ms``.
+
+Usage:
+  python3 benchmarks/bench_neardup.py
+  python3 benchmarks/bench_neardup.py --sent 50000 --checks 1000 --threshold 0.7
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Iterator
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent / "linkedin-job-push" / "scripts"))
+
+from bench_e2e import percentile  # noqa: E402
+from bench_experience import synthetic_descriptions  # noqa: E402
+from bench_filter import TITLES  # noqa: E402
+from util.neardup import DEFAULT_THRESHOLD, NearDupIndex, signature  # noqa: E402
+
+COMPANIES = 200
+ROLE_WORDS = 250
+BOILERPLATE_WORDS = 120
+
+
+class Corpus:
+    """Synthetic postings: per-company boilerplate plus role text, from the saved posting's words."""
+
+    def __init__(self, seed: int = 42):
+        self.rng = random.Random(seed)
+        self.vocab = sorted(set(synthetic_descriptions(1)[0].split()))
+        self.boilerplate = [self.words(BOILERPLATE_WORDS) for _ in range(COMPANIES)]
+
+    def words(self, count: int) -> str:
+        return " ".join(self.rng.choice(self.vocab) for _ in range(count))
+
+    def job(self, job_id: str) -> dict:
+        company = self.rng.randrange(COMPANIES)
+        return {"id": job_id, "title": self.rng.choice(TITLES), "company": f"Company {company}",
+                "location": "Toronto, ON", "description": f"{self.words(ROLE_WORDS)} {self.boilerplate[company]}"}
+
+    def jobs(self, count: int, prefix: str) -> Iterator[dict]:
+        for i in range(count):
+            yield self.job(f"{prefix}{i}")
+
+    def relocated(self, job: dict, job_id: str) -> dict:
+        """The same opening, word for word, posted for another city."""
+        return {**job, "id": job_id, "location": "Vancouver, BC"}
+
+    def repost(self, job: dict, job_id: str) -> dict:
+        words = job["description"].split()
+        words = words[:len(words) - self.rng.randint(0, 30)]
+        for _ in range(len(words) // 50):
+            words[self.rng.randrange(len(words))] = self.rng.choice(self.vocab)
+        return {**job, "id": job_id, "company": "Talent Partners Staffing",
+                "description": "Talent Partners is hiring on behalf of our client. " + " ".join(words)}
+
+
+def measure(sent: int, checks: int = 500, threshold: float = DEFAULT_THRESHOLD) -> dict:
+    """Check latency and accuracy against an index of ``sent`` jobs."""
+    corpus = Corpus()
+    originals = []
+    with tempfile.TemporaryDirectory() as tmp:
+        index = NearDupIndex(Path(tmp) / "state.db", threshold=threshold)
+        batch = []
+        for job in corpus.jobs(sent, "sent-"):
+            index.check(job)
+            batch.append(job["id"])
+            if len(originals) < checks:
+                originals.append(job)
+            if len(batch) == 1000:
+                index.add_many(batch)
+                batch = []
+        index.add_many(batch)
+        index.close()
+
+        # A fresh connection, as the next push run would open
+        index = NearDupIndex(Path(tmp) / "state.db", threshold=threshold)
+        reposts = [corpus.repost(job, f"repost-{i}") for i, job in enumerate(originals)]
+        new_jobs = list(corpus.jobs(checks, "new-"))
+        relocated = [corpus.relocated(job, f"city-{i}") for i, job in enumerate(originals)]
+        latencies = []
+        caught = collapsed = collapsed_city = 0
+        for job in reposts + new_jobs + relocated:
+            started = time.perf_counter()
+            duplicate = index.check(job)
+            latencies.append(time.perf_counter() - started)
+            if job["id"].startswith("repost-"):
+                caught += duplicate is not None and duplicate.job_id == "sent-" + job["id"].split("-")[1]
+            elif job["id"].startswith("city-"):
+                collapsed_city += duplicate is not None
+            else:
+                collapsed += duplicate is not None
+        index.close()
+
+    started = time.perf_counter()
+    for job in new_jobs:
+        signature(job)
+    signature_s = (time.perf_counter() - started) / len(new_jobs)
+    return {
+        "check_p50_ms": percentile(latencies, 0.5) * 1000,
+        "check_p99_ms": percentile(latencies, 0.99) * 1000,
+        "signature_ms": signature_s * 1000,
+        "recall": caught / len(reposts),
+        "false_positive_rate": collapsed / len(new_jobs),
+        "other_city_rate": collapsed_city / len(relocated),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sent", type=int, nargs="+", default=[1000, 10000], help="Indexed job counts")
+    parser.add_argument("--checks", type=int, default=500, help="Reposts and new jobs checked, each")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--budget-ms", type=float, default=1.0, help="Max median check time")
+    args = parser.parse_args()
+
+    print(f"{'indexed':>8} {'check p50':>10} {'p99':>8} {'signature':>10} {'reposts caught':>15} "
+          f"{'new collapsed':>14} {'other city':>11}   (threshold {args.threshold:g})")
+    over = False
+    for sent in args.sent:
+        result = measure(sent, args.checks, args.threshold)
+        over = over or result["check_p50_ms"] > args.budget_ms
+        print(f"{sent:>8} {result['check_p50_ms']:>7.3f} ms {result['check_p99_ms']:>5.2f} ms "
+              f"{result['signature_ms']:>7.3f} ms {result['recall']:>15.1%} {result['false_positive_rate']:>14.1%} "
+              f"{result['other_city_rate']:>11.1%}")
+    if over:
+        print(f"FAIL: median check slower than {args.budget_ms:g} ms", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
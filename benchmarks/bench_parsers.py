@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Benchmark HTML parse time per page for each parser backend.
+
+Parses the saved LinkedIn fixtures in benchmarks/fixtures with every
+installed backend, checks they agree with the bs4 output, and prints
+milliseconds per page. "legacy" is the original full-tree html.parser code.
+
+Usage:
+  python3 benchmarks/bench_parsers.py [--repeat 50]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+FIXTURES = BENCH_DIR / "fixtures"
+sys.path.insert(0, str(BENCH_DIR.parent / "linkedin-job-push" / "scripts"))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from util.parser import available_backends, get_parser, parse_job_card  # noqa: E402
+
+
+class LegacyParser:
+    """The pre-backend code path: full html.parser tree, then find/find_all."""
+
+    name = "legacy"
+
+    def parse_cards(self, html: str) -> list[dict]:
+        soup = BeautifulSoup(html, "html.parser")
+        return [job for job in map(parse_job_card, soup.find_all("div", class_="base-card")) if job]
+
+    def parse_description(self, html: str) -> str:
+        soup = BeautifulSoup(html, "html.parser")
+        desc_el = soup.find("div", {"class": "show-more-less-html__markup"})
+        if desc_el:
+            return desc_el.get_text(strip=True, separator=" ")
+        for script in soup.find_all("script", type="application/ld+json"):
+            try:
+                data = json.loads(script.string or "")
+                if data.get("@type") == "JobPosting" and data.get("description"):
+                    return BeautifulSoup(data["description"], "html.parser").get_text(strip=True, separator=" ")
+            except (json.JSONDecodeError, AttributeError):
+                continue
+        desc_el = soup.find(attrs={"data-testid": "expandable-text-box"})
+        return desc_el.get_text(strip=True, separator=" ") if desc_el else ""
+
+
+def time_per_call(func, arg, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func(arg)
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+PAGES = [
+    ("search_page.html", "parse_cards"),
+    ("job_posting.html", "parse_description"),
+    ("job_posting_ld_json.html", "parse_description"),
+]
+
+
+def measure(repeat: int) -> dict[str, dict[str, float]]:
+    """Milliseconds per page, by backend and fixture; exits if a backend disagrees with bs4."""
+    parsers = [LegacyParser()] + [get_parser(name) for name in available_backends()]
+    expected = {name: getattr(get_parser("bs4"), method)((FIXTURES / name).read_text()) for name, method in PAGES}
+
+    results = {}
+    for p in parsers:
+        results[p.name] = {}
+        for name, method in PAGES:
+            html = (FIXTURES / name).read_text()
+            func = getattr(p, method)
+            if func(html) != expected[name]:
+                raise SystemExit(f"{p.name} output differs from bs4 on {name}")
+            results[p.name][name] = time_per_call(func, html, repeat)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'backend':<12}" + "".join(f"{name:>28}" for name, _ in PAGES))
+    for backend, pages in measure(args.repeat).items():
+        print(f"{backend:<12}" + "".join(f"{ms:>25.2f} ms" for ms in pages.values()))
+
+
+if __name__ == "__main__":
+    main()
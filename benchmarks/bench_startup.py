@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""Benchmark the cold start of a no-op `fetch_jobs.py --heartbeat`.
+
+Copies the scripts to a temporary directory with a config whose only slot
+has already run, then times the heartbeat against a bare interpreter start.
+A ``-X importtime`` run lists the slowest imports and fails if requests, an
+HTML parser, pytz or sqlite3 was loaded, or if the heartbeat costs more than
+``--budget`` milliseconds over the bare interpreter. Both sides are compared
+by their trimmed median (the slowest and fastest 20% of runs dropped), so a
+few runs slowed by the machine do not decide the check.
+
+Usage:
+  python3 benchmarks/bench_startup.py
+  python3 benchmarks/bench_startup.py --runs 50 --budget 30
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "linkedin-job-push" / "scripts"
+
+# Only the fetch path may load these
+HEAVY_MODULES = ("requests", "urllib3", "bs4", "selectolax", "lxml", "pytz", "sqlite3")
+
+
+def prepare(workdir: Path) -> Path:
+    """A copy of the scripts whose heartbeat finds nothing due."""
+    scripts = workdir / "scripts"
+    shutil.copytree(SCRIPTS_DIR, scripts, ignore=shutil.ignore_patterns(
+        "__pycache__", "*.db", "jobs.json*", "config.json", "state.json", "secrets.json", "daemon.lock"))
+    config = {
+        "filters": {"keywords": ["React"], "country": "Canada"},
+        "schedule": {"timezone": "UTC", "times": ["00:00"]},
+    }
+    (scripts / "config.json").write_text(json.dumps(config), encoding="utf-8")
+    (scripts / "state.json").write_text(
+        json.dumps({"last_slots": {"default": datetime.now(timezone.utc).isoformat()}}), encoding="utf-8")
+    return scripts
+
+
+def time_command(args: list[str], cwd: Path, runs: int) -> list[float]:
+    """Wall-clock milliseconds per run; the first (bytecode-compiling) run is discarded."""
+    timings = []
+    for _ in range(runs + 1):
+        started = time.perf_counter()
+        subprocess.run(args, cwd=cwd, check=True, stdout=subprocess.DEVNULL)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings[1:]
+
+
+def import_times(scripts: Path) -> list[tuple[int, str]]:
+    """(cumulative microseconds, module) for each top-level import of the heartbeat."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "fetch_jobs.py", "--heartbeat"],
+        cwd=scripts, check=True, capture_output=True, text=True,
+    )
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        imports.append((int(cumulative), name.rstrip()[1:]))
+    return imports
+
+
+def trimmed_median(timings: list[float], trim: float = 0.2) -> float:
+    """Median of ``timings`` without the fastest and slowest ``trim`` share."""
+    ordered = sorted(timings)
+    cut = int(len(ordered) * trim)
+    return statistics.median(ordered[cut:len(ordered) - cut] or ordered)
+
+
+def overhead_ms(bare: list[float], heartbeat: list[float]) -> float:
+    """What a no-op heartbeat costs over a bare interpreter start."""
+    return trimmed_median(heartbeat) - trimmed_median(bare)
+
+
+def summary(timings: list[float]) -> str:
+    ordered = sorted(timings)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return (f"median {statistics.median(ordered):6.1f}ms  trimmed {trimmed_median(ordered):6.1f}ms  "
+            f"p95 {p95:6.1f}ms  min {ordered[0]:6.1f}ms")
+
+
+def measure(runs: int) -> tuple[list[float], list[float], list[tuple[int, str]]]:
+    """Bare interpreter and no-op heartbeat timings (ms), and the heartbeat's imports."""
+    with tempfile.TemporaryDirectory() as tmp:
+        scripts = prepare(Path(tmp))
+        bare = time_command([sys.executable, "-c", "pass"], scripts, runs)
+        heartbeat = time_command([sys.executable, "fetch_jobs.py", "--heartbeat"], scripts, runs)
+        imports = import_times(scripts)
+    return bare, heartbeat, imports
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--budget", type=float, default=50.0,
+                        help="Max trimmed-median milliseconds over a bare interpreter start")
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports to list")
+    args = parser.parse_args()
+
+    bare, heartbeat, imports = measure(args.runs)
+    overhead = overhead_ms(bare, heartbeat)
+    print(f"{args.runs} runs each")
+    print(f"  python -c pass        {summary(bare)}")
+    print(f"  heartbeat (no-op)     {summary(heartbeat)}")
+    print(f"  overhead              {overhead:6.1f}ms (budget {args.budget:g}ms)")
+
+    print("\nSlowest top-level imports (cumulative):")
+    top_level = [(us, name) for us, name in imports if not name.startswith(" ")]
+    for us, name in sorted(top_level, reverse=True)[:args.top]:
+        print(f"  {us / 1000:6.1f}ms  {name.strip()}")
+
+    loaded = {name.strip() for _, name in imports}
+    heavy = [m for m in HEAVY_MODULES if m in loaded]
+    failed = False
+    if heavy:
+        print(f"\nFAIL: the heartbeat imported {', '.join(heavy)}", file=sys.stderr)
+        failed = True
+    if overhead > args.budget:
+        print(f"\nFAIL: heartbeat overhead {overhead:.1f}ms exceeds {args.budget:g}ms", file=sys.stderr)
+        failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""Run the benchmarks together and compare the results with a saved baseline.
+
+Collects parser speed, experience extraction, filter and ranking
+throughput, a full fetch + push run against the local stubs (with per-job
+fetch latency percentiles), push_jobs' peak memory, near-duplicate check
+latency, and the idle heartbeat's start-up overhead. Each number is
+compared with benchmarks/baseline.json: one that is more than
+``--tolerance`` worse is reported as a regression and the suite exits 1.
+``--save`` records the current numbers as the new baseline.
+
+Baselines are only comparable on the same machine and Python; the baseline
+file records both, and a mismatch is warned about. Metrics ending in
+``_per_s`` are better when higher, all others when lower.
+
+Usage:
+  python3 benchmarks/bench_suite.py                  # compare with baseline.json
+  python3 benchmarks/bench_suite.py --save           # record a new baseline
+  python3 benchmarks/bench_suite.py --only filter e2e --tolerance 0.1
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+from datetime import date
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+BASELINE_PATH = BENCH_DIR / "baseline.json"
+sys.path.insert(0, str(BENCH_DIR))
+
+import bench_e2e  # noqa: E402
+import bench_experience  # noqa: E402
+import bench_filter  # noqa: E402
+import bench_memory  # noqa: E402
+import bench_neardup  # noqa: E402
+import bench_parsers  # noqa: E402
+import bench_startup  # noqa: E402
+
+FILTER_SIZES = (10_000, 100_000)
+EXPERIENCE_JOBS = 5000
+MEMORY_JOBS = 5000
+NEARDUP_SENT = 10_000
+
+
+def parsers() -> dict[str, float]:
+    results = bench_parsers.measure(repeat=20)
+    return {f"parse.{backend}.{page.rsplit('.', 1)[0]}_ms": ms
+            for backend, pages in results.items() if backend != "legacy" for page, ms in pages.items()}
+
+
+def experience() -> dict[str, float]:
+    results = bench_experience.measure(EXPERIENCE_JOBS, repeat=3)
+    return {"experience.jobs_per_s": EXPERIENCE_JOBS / results["two-stage"],
+            "experience.batch.jobs_per_s": EXPERIENCE_JOBS / results["two-stage batch"]}
+
+
+def filters() -> dict[str, float]:
+    results = {f"filter.{size // 1000}k.jobs_per_s": bench_filter.measure(size)["jobs_per_s"]
+               for size in FILTER_SIZES}
+    results[f"filter.{FILTER_SIZES[0] // 1000}k.ranked.jobs_per_s"] = \
+        bench_filter.measure(FILTER_SIZES[0], rank=True)["jobs_per_s"]
+    return results
+
+
+def e2e() -> dict[str, float]:
+    results = {}
+    for name, argv in (("e2e", ["--runs", "3"]), ("e2e.throttled", ["--runs", "3", "--throttle-rate", "0.05"]),
+                       ("e2e.lazy", ["--runs", "3", "--lazy"])):
+        result = bench_e2e.measure(bench_e2e.parse_args(argv))
+        results.update({f"{name}.{key}": result[key] for key in ("e2e_s", "fetch_p50_ms", "fetch_p99_ms")})
+    return results
+
+
+def memory() -> dict[str, float]:
+    return {f"memory.push_{MEMORY_JOBS // 1000}k.peak_mb": bench_memory.measure(MEMORY_JOBS)}
+
+
+def neardup() -> dict[str, float]:
+    result = bench_neardup.measure(NEARDUP_SENT)
+    return {f"neardup.{NEARDUP_SENT // 1000}k.{key}": result[key] for key in ("check_p50_ms", "check_p99_ms")}
+
+
+def startup() -> dict[str, float]:
+    bare, heartbeat, _ = bench_startup.measure(runs=20)
+    return {"startup.heartbeat_overhead_ms": bench_startup.overhead_ms(bare, heartbeat)}
+
+
+BENCHMARKS = {"parsers": parsers, "experience": experience, "filter": filters, "e2e": e2e, "memory": memory,
+              "neardup": neardup, "startup": startup}
+
+
+def environment() -> dict[str, str]:
+    return {"python": platform.python_version(), "machine": f"{platform.system()} {platform.machine()}",
+            "processor": platform.processor() or "unknown"}
+
+
+def compare(results: dict[str, float], baseline: dict[str, float], tolerance: float) -> list[str]:
+    """Print each metric against the baseline; returns the regressed metric names."""
+    regressions = []
+    print(f"\n{'metric':<44} {'baseline':>12} {'now':>12} {'change':>8}")
+    for name, value in results.items():
+        before = baseline.get(name)
+        if before is None or before == 0:
+            print(f"{name:<44} {'—':>12} {value:>12.2f}")
+            continue
+        change = value / before - 1
+        worse = -change if name.endswith("_per_s") else change
+        flag = ""
+        if worse > tolerance:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        elif worse < -tolerance:
+            flag = "  improved"
+        print(f"{name:<44} {before:>12.2f} {value:>12.2f} {change:>+8.0%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), help="Run only these benchmarks")
+    parser.add_argument("--save", action="store_true", help=f"Write the results to {BASELINE_PATH.name}")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed slowdown before a metric counts as a regression (default: 0.25 = 25%%)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    args = parser.parse_args()
+
+    results: dict[str, float] = {}
+    for name in args.only or BENCHMARKS:
+        print(f"Running {name}...", flush=True)
+        results.update(BENCHMARKS[name]())
+
+    if args.save:
+        saved = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+        merged = {**saved.get("results", {}), **results}  # --only refreshes just those metrics
+        args.baseline.write_text(json.dumps(
+            {"recorded": date.today().isoformat(), **environment(),
+             "results": {name: round(value, 4) for name, value in merged.items()}}, indent=2) + "\n")
+        print(f"Saved {len(results)} metrics to {args.baseline}")
+        return
+
+    if not args.baseline.exists():
+        for name, value in results.items():
+            print(f"{name:<44} {value:>12.2f}")
+        print(f"\nNo baseline at {args.baseline}; run with --save to record one")
+        return
+
+    baseline = json.loads(args.baseline.read_text())
+    here = environment()
+    if any(baseline.get(key) != value for key, value in here.items()):
+        print(f"Warning: baseline was recorded on {baseline.get('machine')}, Python {baseline.get('python')} "
+              f"({baseline.get('recorded')}); numbers may not be comparable", file=sys.stderr)
+    regressions = compare(results, baseline["results"], args.tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} regressions beyond {args.tolerance:.0%}: {', '.join(regressions)}",
+              file=sys.stderr)
+        sys.exit(1)
+    print(f"\nNo regressions beyond {args.tolerance:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""Local stand-in for the LinkedIn guest job API, used by the benchmarks.
+
+Serves search pages of job cards and jobPosting description pages in the
+same HTML shape as LinkedIn, with configurable per-request latency (plus
+random jitter) and throttling injection. With ``recorded=True`` it serves
+the saved LinkedIn pages in benchmarks/fixtures instead, renumbered so each
+search offset returns new job IDs. Responses are gzip-compressed when the
+client accepts it, and postings carry an ETag so conditional requests get
+304s.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import random
+import re
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+CARD_TEMPLATE = """<li>
+<div class="base-card relative job-search-card" data-entity-urn="urn:li:jobPosting:{job_id}">
+  <a class="base-card__full-link" href="{base}/jobs/view/{slug}-{job_id}?refId=abc"></a>
+  <div class="base-search-card__info">
+    <h3 class="base-search-card__title">{title}</h3>
+    <h4 class="base-search-card__subtitle"><a>{company}</a></h4>
+    <div class="base-search-card__metadata">
+      <span class="job-search-card__location">{location}</span>
+      <time class="job-search-card__listdate" datetime="2026-10-17">1 hour ago</time>
+    </div>
+  </div>
+</div>
+</li>
+"""
+
+POSTING_TEMPLATE = """<html><head>
+<script type="application/ld+json">{{"@type": "WebPage"}}</script>
+</head><body>
+<section class="show-more-less-html">
+  <div class="show-more-less-html__markup">
+    <p>{title} at {company}.</p>
+    <p>We are looking for a developer with 2+ years of experience in React and JavaScript.</p>
+    <ul><li>Build UI components</li><li>Write tests</li><li>Review code</li></ul>
+  </div>
+</section>
+</body></html>
+"""
+
+TITLES = ["Frontend Developer", "React Engineer", "Senior JavaScript Developer",
+          "Software Engineer II", "Full Stack Developer"]
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli"]
+LOCATIONS = ["Toronto, ON", "Vancouver, BC", "Montreal, QC", "Calgary, AB", "Ottawa, ON"]
+
+
+def job_id_for(index: int) -> str:
+    return str(4000000000 + index)
+
+
+class RecordedPages:
+    """The saved search page and job posting, served for any offset and job ID."""
+
+    def __init__(self, fixtures: Path = FIXTURES):
+        html = (fixtures / "search_page.html").read_text(encoding="utf-8")
+        cards = re.findall(r"<li>.*?</li>", html, re.S)
+        self.cards = [(card, re.search(r"jobPosting:(\d+)", card).group(1)) for card in cards]
+        self.posting = (fixtures / "job_posting.html").read_text(encoding="utf-8")
+
+    def search_page(self, start: int, total_jobs: int) -> str:
+        page = []
+        for index in range(start, min(start + 10, total_jobs)):
+            card, recorded_id = self.cards[index % len(self.cards)]
+            page.append(card.replace(recorded_id, job_id_for(index)))
+        return "\n".join(page)
+
+
+class StubState:
+    """Shared knobs and counters for one server instance."""
+
+    def __init__(self, total_jobs: int = 100, latency: float = 0.0, jitter: float = 0.0,
+                 recorded: bool = False, seed: int = 0):
+        self.total_jobs = total_jobs
+        self.latency = latency
+        self.jitter = jitter  # up to this many extra seconds per response, uniformly
+        self.recorded = RecordedPages() if recorded else None
+        self.requests = 0
+        # Throttling injection: answer every Nth request, or a random share of
+        # requests, with throttle_status
+        self.throttle_every = 0
+        self.throttle_rate = 0.0
+        self.throttle_status = 429
+        self.retry_after: str | None = None
+        self.throttled = 0
+        self.not_modified = 0
+        self._random = random.Random(seed)
+        self.lock = threading.Lock()
+
+    def count(self) -> tuple[bool, float]:
+        """Count a request; returns whether to throttle it and how long to delay it."""
+        with self.lock:
+            self.requests += 1
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+            if (self.throttle_every and self.requests % self.throttle_every == 0) or (
+                    self.throttle_rate and self._random.random() < self.throttle_rate):
+                self.throttled += 1
+                return True, delay
+            return False, delay
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    state: StubState
+
+    def log_message(self, format, *args):  # noqa: A002 - stdlib signature
+        pass
+
+    def _reply(self, status: int, body: str, content_type: str = "text/html; charset=utf-8", headers=None):
+        data = body.encode("utf-8")
+        headers = dict(headers or {})
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            data = gzip.compress(data)
+            headers["Content-Encoding"] = "gzip"
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):  # noqa: N802 - stdlib naming
+        throttle, delay = self.state.count()
+        if delay:
+            time.sleep(delay)
+        if throttle:
+            headers = {"Retry-After": self.state.retry_after} if self.state.retry_after else None
+            self._reply(self.state.throttle_status, "throttled", "text/plain", headers)
+            return
+
+        parsed = urllib.parse.urlparse(self.path)
+        if parsed.path.endswith("/search"):
+            query = urllib.parse.parse_qs(parsed.query)
+            start = int(query.get("start", ["0"])[0])
+            self._reply(200, self._search_page(start))
+        elif "/jobPosting/" in parsed.path:
+            job_id = parsed.path.rsplit("/", 1)[-1]
+            index = int(job_id) - 4000000000
+            if self.state.recorded is not None:
+                body = self.state.recorded.posting
+            else:
+                body = POSTING_TEMPLATE.format(
+                    title=TITLES[index % len(TITLES)], company=COMPANIES[index % len(COMPANIES)])
+            etag = '"' + hashlib.sha1(body.encode("utf-8")).hexdigest()[:16] + '"'
+            if self.headers.get("If-None-Match") == etag:
+                with self.state.lock:
+                    self.state.not_modified += 1
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            self._reply(200, body, headers={"ETag": etag})
+        else:
+            self._reply(404, "not found", "text/plain")
+
+    def _search_page(self, start: int) -> str:
+        if self.state.recorded is not None:
+            return self.state.recorded.search_page(start, self.state.total_jobs)
+        base = f"http://{self.server.server_address[0]}:{self.server.server_address[1]}"
+        cards = []
+        for index in range(start, min(start + 10, self.state.total_jobs)):
+            title = TITLES[index % len(TITLES)]
+            cards.append(CARD_TEMPLATE.format(
+                base=base,
+                job_id=job_id_for(index),
+                slug=title.lower().replace(" ", "-"),
+                title=title,
+                company=COMPANIES[index % len(COMPANIES)],
+                location=LOCATIONS[index % len(LOCATIONS)],
+            ))
+        return "".join(cards)
+
+
+class StubServer:
+    """Run the stub in a background thread: ``with StubServer(...) as server:``."""
+
+    def __init__(self, total_jobs: int = 100, latency: float = 0.0, jitter: float = 0.0,
+                 recorded: bool = False):
+        self.state = StubState(total_jobs, latency, jitter, recorded)
+        handler = type("BoundStubHandler", (StubHandler,), {"state": self.state})
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "StubServer":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def point_fetcher_at(fetch_jobs_module, base_url: str):
+    """Redirect fetch_jobs' LinkedIn endpoints to the stub server."""
+    fetch_jobs_module.LINKEDIN_JOBS_SEARCH_URL = f"{base_url}/jobs-guest/jobs/api/seeMoreJobPostings/search"
+    fetch_jobs_module.LINKEDIN_JOB_POSTING_URL = f"{base_url}/jobs-guest/jobs/api/jobPosting/{{job_id}}"
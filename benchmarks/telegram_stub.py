@@ -0,0 +1,102 @@
+"""Local stand-in for the Telegram Bot API ``sendMessage`` method.
+
+Records every delivered message per chat and answers like Telegram does:
+``{"ok": true, ...}`` on success, a 429 with ``parameters.retry_after`` when a
+chat is messaged faster than ``min_interval``, a 400 for chats listed in
+``unknown_chats``, and a 502 while ``down`` is set.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class TelegramState:
+    """Shared knobs and recorded messages for one server instance."""
+
+    def __init__(self, min_interval: float = 0.0, retry_after: int = 1):
+        self.min_interval = min_interval
+        self.retry_after = retry_after
+        self.unknown_chats: set[str] = set()
+        self.down = False
+        self.messages: dict[str, list[str]] = {}
+        self.rate_limited = 0
+        self.requests = 0
+        self._last_sent: dict[str, float] = {}
+        self.lock = threading.Lock()
+
+    def accept(self, chat_id: str, text: str) -> tuple[int, dict]:
+        with self.lock:
+            self.requests += 1
+            if self.down:
+                return 502, {"ok": False, "error_code": 502, "description": "Bad Gateway"}
+            if chat_id in self.unknown_chats:
+                return 400, {"ok": False, "error_code": 400, "description": "Bad Request: chat not found"}
+            now = time.monotonic()
+            last = self._last_sent.get(chat_id)
+            if last is not None and now - last < self.min_interval:
+                self.rate_limited += 1
+                return 429, {
+                    "ok": False,
+                    "error_code": 429,
+                    "description": f"Too Many Requests: retry after {self.retry_after}",
+                    "parameters": {"retry_after": self.retry_after},
+                }
+            self._last_sent[chat_id] = now
+            self.messages.setdefault(chat_id, []).append(text)
+            return 200, {"ok": True, "result": {"message_id": self.requests, "chat": {"id": chat_id}}}
+
+
+class TelegramHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    state: TelegramState
+
+    def log_message(self, format, *args):  # noqa: A002 - stdlib signature
+        pass
+
+    def do_POST(self):  # noqa: N802 - stdlib naming
+        length = int(self.headers.get("Content-Length", "0"))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        if self.path.endswith("/sendMessage"):
+            status, body = self.state.accept(str(payload.get("chat_id", "")), payload.get("text", ""))
+        else:
+            status, body = 404, {"ok": False, "error_code": 404, "description": "Not Found"}
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class TelegramStub:
+    """Run the stub in a background thread: ``with TelegramStub(...) as bot:``."""
+
+    def __init__(self, min_interval: float = 0.0, retry_after: int = 1):
+        self.state = TelegramState(min_interval, retry_after)
+        handler = type("BoundTelegramHandler", (TelegramHandler,), {"state": self.state})
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def send_message_url(self) -> str:
+        """``sendMessage`` URL template, like ``constants.TELEGRAM_SEND_MESSAGE_URL``."""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/bot{{token}}/sendMessage"
+
+    def __enter__(self) -> "TelegramStub":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def point_pusher_at(push_jobs_module, send_message_url: str):
+    """Redirect push_jobs' Telegram endpoint to the stub server."""
+    push_jobs_module.TELEGRAM_SEND_MESSAGE_URL = send_message_url
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Query the local archive of every fetched job (archive.db).
+
+fetch_jobs.py adds each run's jobs to the archive. `query` applies a
+profile's filters (optionally with other keywords) to the whole history
+using the archive's indexes, so no re-scraping is needed.
+
+Usage:
+  python3 archive.py query                           # default profile's filters
+  python3 archive.py query --keywords React --location Ontario --since 30d --count
+  python3 archive.py query --profile alice --since 2026-09-01 --json
+  python3 archive.py import jobs.json old/jobs.jsonl  # add existing job files
+  python3 archive.py stats
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from util.archive import JobArchive, format_stats, parse_date
+from util.jobio import iter_jobs
+from util.profiles import load_profiles
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+CONFIG_PATH = SCRIPT_DIR / "config.json"
+ARCHIVE_PATH = SCRIPT_DIR / "archive.db"
+
+
+def load_config() -> dict:
+    if not CONFIG_PATH.exists():
+        return {}  # queries without a config use only the command-line criteria
+    with open(CONFIG_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def query_criteria(config: dict, args: argparse.Namespace) -> dict:
+    """The chosen profile, with any filters given on the command line applied over it."""
+    profiles = load_profiles(config)
+    profile = profiles[0]
+    if args.profile:
+        matches = [p for p in profiles if p["name"] == args.profile]
+        if not matches:
+            print(f"Error: no profile named '{args.profile}' in config.json", file=sys.stderr)
+            sys.exit(1)
+        profile = matches[0]
+
+    filters = dict(profile["filters"])
+    if args.keywords is not None:
+        filters["keywords"] = args.keywords
+    if args.max_experience is not None:
+        filters["maxExperienceYears"] = args.max_experience if args.max_experience >= 0 else None
+    return {**profile, "filters": filters}
+
+
+def cmd_query(archive: JobArchive, config: dict, args: argparse.Namespace):
+    criteria = query_criteria(config, args)
+    result = archive.query(
+        criteria,
+        since=args.since,
+        until=args.until,
+        company=args.company,
+        location=args.location,
+        limit=None if args.count else args.limit,
+    )
+
+    if args.json:
+        for job in result.jobs:
+            print(json.dumps({k: v for k, v in job.items() if k != "description"}, ensure_ascii=False))
+    elif not args.count:
+        for job in result.jobs:
+            print(f"{job['posted'] or '?':<10}  {job['title'][:60]} — {job['company']} ({job['location']})")
+            print(f"            {job['url']}")
+
+    indexed = ", ".join(result.indexed) or "none"
+    print(f"{len(result.jobs)} matching jobs in {result.ms:.1f} ms "
+          f"({result.candidates} candidates from indexes on: {indexed})",
+          file=sys.stderr if args.json else sys.stdout)
+
+
+def cmd_import(archive: JobArchive, paths: list[Path]):
+    for path in paths:
+        if not path.exists():
+            print(f"Error: {path} not found", file=sys.stderr)
+            sys.exit(1)
+        added = archive.add_many(iter_jobs(path))
+        print(f"{path}: {added} new jobs archived")
+    print(format_stats(archive.stats()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the local job archive")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    query = commands.add_parser("query", help="Filter archived jobs")
+    query.add_argument("--profile", help="Use this profile's filters (default: the first profile)")
+    query.add_argument("--keywords", nargs="+", help="Match these keywords instead of the profile's")
+    query.add_argument("--max-experience", type=int,
+                       help="Max years of experience instead of the profile's (-1: no limit)")
+    query.add_argument("--since", type=parse_date, help="Posted on or after: YYYY-MM-DD or Nd (days ago)")
+    query.add_argument("--until", type=parse_date, help="Posted on or before: YYYY-MM-DD or Nd")
+    query.add_argument("--company", help="Exact company name (case-insensitive)")
+    query.add_argument("--location", help="Text the location must contain (e.g. Ontario)")
+    query.add_argument("--limit", type=int, default=20, help="Jobs to list (default: 20)")
+    query.add_argument("--count", action="store_true", help="Only print how many jobs match")
+    query.add_argument("--json", action="store_true", help="Print matches as JSON lines, without descriptions")
+
+    import_ = commands.add_parser("import", help="Add jobs.json / jobs.jsonl files to the archive")
+    import_.add_argument("paths", nargs="+", type=Path)
+
+    commands.add_parser("stats", help="Show archive size and date range")
+    args = parser.parse_args()
+
+    archive = JobArchive(ARCHIVE_PATH)
+    try:
+        if args.command == "query":
+            cmd_query(archive, load_config(), args)
+        elif args.command == "import":
+            cmd_import(archive, args.paths)
+        else:
+            print(format_stats(archive.stats()))
+    finally:
+        archive.close()
+
+
+if __name__ == "__main__":
+    main()
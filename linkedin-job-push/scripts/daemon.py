@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Resident scheduler: fetch and push each profile at its scheduled times.
+
+One long-running process replaces the periodic `fetch_jobs.py --heartbeat`
+cold starts. Between runs it sleeps until the next slot, keeping imports,
+the HTTP connection pool, parser and cache.db open. Each profile may list
+several `schedule.times`. A slot missed while the daemon was down is caught
+up on start (based on the slots recorded in state.json), and each slot runs
+once: it is recorded only after its fetch and push finish. A run that fails,
+is stopped by the circuit breaker or is interrupted stays pending in
+state.json and is retried, resuming from jobs.jsonl, after RETRY_DELAY or
+when the daemon restarts.
+
+Usage:
+  python3 daemon.py          # run until stopped (Ctrl-C / SIGTERM)
+  python3 daemon.py --once   # run any due or missed slots, then exit
+"""
+
+from __future__ import annotations
+
+import argparse
+import signal
+import sys
+import threading
+import traceback
+from datetime import datetime, timedelta, timezone
+
+import fetch_jobs
+import push_jobs
+from util.profiles import load_profiles
+from util.schedule import due_slot, next_slot, parse_time, schedule_times
+from util.state import load_state, save_state, try_lock
+
+# Shared with fetch_jobs.py --heartbeat, so only one scheduler runs slots at a time
+LOCK_PATH = fetch_jobs.LOCK_PATH
+
+# Longest sleep between checks, so config.json edits are picked up
+MAX_SLEEP = timedelta(minutes=10)
+
+# Wait before retrying a failed run, so a throttled fetch is not repeated at once
+RETRY_DELAY = timedelta(minutes=15)
+
+_stop = threading.Event()
+
+
+def due_profiles(config: dict, state: dict, now: datetime) -> dict[str, datetime]:
+    """Profiles whose latest slot has not been run yet, with that slot."""
+    last_slots = state.get("last_slots", {})
+    due = {}
+    for profile in load_profiles(config):
+        last = parse_time(last_slots.get(profile["name"]))
+        slot = due_slot(profile.get("schedule", {}), now, last)
+        if slot is not None:
+            due[profile["name"]] = slot
+    return due
+
+
+def seconds_until_next_slot(config: dict, now: datetime) -> float:
+    upcoming = [next_slot(p.get("schedule", {}), now) for p in load_profiles(config)]
+    upcoming = [slot for slot in upcoming if slot is not None]
+    wake = min(upcoming + [now + MAX_SLEEP])
+    return max(1.0, (wake - now).total_seconds())
+
+
+def only_profiles(config: dict, names: list[str]) -> dict:
+    """``config`` narrowed to the named profiles."""
+    if not config.get("profiles"):
+        return config
+    return {**config, "profiles": [p for p in config["profiles"] if p["name"] in names]}
+
+
+def pending_slots(state: dict) -> dict[str, datetime]:
+    """Slots of a run that failed or was cut short, still to be retried."""
+    return {name: parse_time(slot) for name, slot in state.get("pending_run", {}).items()}
+
+
+def run_slots(config: dict, slots: dict[str, datetime], resume: bool = False) -> bool:
+    """Fetch and push the profiles in ``slots``; the slots are recorded only if both finish.
+
+    Until then the slots stay in ``pending_run``, so a failed run is retried.
+    Returns False if the run failed.
+    """
+    names = sorted(slots)
+    state = load_state(fetch_jobs.STATE_PATH)
+    state["pending_run"] = {name: slot.isoformat() for name, slot in slots.items()}
+    save_state(state, fetch_jobs.STATE_PATH)
+
+    print(f"\n[{datetime.now().isoformat(timespec='seconds')}] Running: {', '.join(names)}")
+    run_config = only_profiles(config, names)
+    ok = False
+    try:
+        if fetch_jobs.run(run_config, stream=True, resume=resume):
+            profiles = [p for p in load_profiles(run_config) if p["name"] in names]
+            # Undelivered messages wait in the outbox; the slot itself has run
+            push_jobs.push(run_config, fetch_jobs.JOBS_STREAM_PATH, profiles)
+            ok = True
+        else:
+            print("Fetch stopped early; the run will be retried", file=sys.stderr)
+    except SystemExit as e:
+        print(f"Run stopped with exit code {e.code}", file=sys.stderr)
+    except Exception:
+        traceback.print_exc()
+
+    if ok:
+        # push saved state.json meanwhile, so re-read before recording the slots
+        state = load_state(fetch_jobs.STATE_PATH)
+        state.setdefault("last_slots", {}).update(state.pop("pending_run", {}))
+        save_state(state, fetch_jobs.STATE_PATH)
+    return ok
+
+
+def _acquire_lock():
+    """Keep a second daemon, or a heartbeat, from running the same slots; held until exit."""
+    lock_file = try_lock(LOCK_PATH)
+    if lock_file is None:
+        print(f"Error: another daemon or heartbeat run holds {LOCK_PATH}", file=sys.stderr)
+        sys.exit(1)
+    return lock_file
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run LinkedIn job pushes on schedule")
+    parser.add_argument("--once", action="store_true", help="Run due or missed slots, then exit")
+    args = parser.parse_args()
+
+    lock = _acquire_lock()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: _stop.set())
+
+    config = fetch_jobs.load_config()
+    if not any(schedule_times(p.get("schedule", {})) for p in load_profiles(config)):
+        print("Error: no schedule.time or schedule.times configured in config.json", file=sys.stderr)
+        sys.exit(1)
+    fetch_jobs.open_caches(config)
+
+    try:
+        while not _stop.is_set():
+            new_config = fetch_jobs.load_config()
+            if new_config != config:
+                config = new_config
+                fetch_jobs.open_caches(config)
+
+            # A run that failed or was cut short is retried, resuming its jobs.jsonl,
+            # together with any slot that has come due since
+            now = datetime.now(timezone.utc)
+            state = load_state(fetch_jobs.STATE_PATH)
+            pending = pending_slots(state)
+            slots = {**pending, **due_profiles(config, state, now)}
+            if slots:
+                if run_slots(config, slots, resume=bool(pending)):
+                    continue
+                if args.once:
+                    break
+                _stop.wait(RETRY_DELAY.total_seconds())
+                continue
+            if args.once:
+                break
+            _stop.wait(seconds_until_next_slot(config, now))
+    finally:
+        fetch_jobs.close_caches()
+        lock.close()
+
+
+if __name__ == "__main__":
+    main()
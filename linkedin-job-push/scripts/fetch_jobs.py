@@ -5,7 +5,9 @@ Writes results to jobs.json in the same directory.
 
 Usage:
   python3 fetch_jobs.py              # fetch immediately
-  python3 fetch_jobs.py --heartbeat  # only fetch if current time matches schedule
+  python3 fetch_jobs.py --heartbeat  # only fetch if a scheduled time is due
+  python3 fetch_jobs.py --stream     # append each job to jobs.jsonl as it arrives
+  python3 fetch_jobs.py --resume     # continue an interrupted --stream run
 """
 
 from __future__ import annotations
@@ -14,23 +16,38 @@ import argparse
 import json
 import os
 import sys
-import time
+import threading
 import urllib.parse
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import TYPE_CHECKING, Callable
 
 import random
 
-import pytz
-import requests
-from bs4 import BeautifulSoup
-
+# Everything else, down to the project's own fetch helpers, is imported by
+# the functions that fetch, so a --heartbeat with nothing due exits without
+# loading it
 from constants import LINKEDIN_JOBS_SEARCH_URL, LINKEDIN_JOB_POSTING_URL, LINKEDIN_JOBS_REFERER
-from util.filter import filter_by_exclude_keywords
+from util.schedule import due_slot, parse_time, schedule_times
+from util.state import load_state, save_state, try_lock
+
+if TYPE_CHECKING:
+    from util.cache import DescriptionCache, ResponseCache
+    from util.jobio import JobStreamWriter, ResumePoint
+    from util.neardup import NearDupIndex
+    from util.ratelimit import AdaptiveRateLimiter, CircuitBreaker
+    from util.seen import SeenStore
 
 SCRIPT_DIR = Path(__file__).resolve().parent
 CONFIG_PATH = SCRIPT_DIR / "config.json"
 JOBS_OUTPUT_PATH = SCRIPT_DIR / "jobs.json"
+JOBS_STREAM_PATH = SCRIPT_DIR / "jobs.jsonl"
+CACHE_PATH = SCRIPT_DIR / "cache.db"
+STATE_PATH = SCRIPT_DIR / "state.json"
+SEEN_DB_PATH = SCRIPT_DIR / "state.db"
+ARCHIVE_PATH = SCRIPT_DIR / "archive.db"
+# Held by a heartbeat run or daemon.py, so only one of them runs slots at a time
+LOCK_PATH = SCRIPT_DIR / "daemon.lock"
 
 HEADERS = {
     "User-Agent": (
@@ -40,7 +57,7 @@ HEADERS = {
     ),
     "Accept-Language": "en-US,en;q=0.9",
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-    "Accept-Encoding": "gzip, deflate, br",
+    # Accept-Encoding is left to the requests session: only encodings urllib3 can decode here
     "Referer": LINKEDIN_JOBS_REFERER,
     "DNT": "1",
     "Connection": "keep-alive",
@@ -50,18 +67,92 @@ HEADERS = {
     "Sec-Fetch-Site": "same-origin",
 }
 
-
-def _get(url: str, retries: int = 3) -> requests.Response:
-    """GET with exponential backoff on 429."""
+DEFAULT_WORKERS = 4
+SEARCH_PAGE_SIZE = 10  # LinkedIn guest API returns 10 cards per page
+MAX_SEARCH_START = 1000  # guest search stops returning results past this offset
+DEFAULT_REQUESTS_PER_SECOND = 0.5
+DEFAULT_SEARCH_PREFETCH = 4  # max search pages requested ahead
+DEFAULT_MAX_CONSECUTIVE_THROTTLES = 5
+DEFAULT_MAX_RETRY_AFTER = 300  # seconds; a longer requested wait stops the run
+THROTTLE_STATUSES = (429, 500, 502, 503, 504)
+
+# Shared by every request in the process, including description workers;
+# created by the first fetch (see _rate_control())
+_limiter: AdaptiveRateLimiter | None = None
+
+# Stops the whole run once LinkedIn is throttling hard
+_breaker: CircuitBreaker | None = None
+_rate_lock = threading.Lock()
+
+# Fastest installed HTML backend unless fetch.parser pins one; created by the first fetch
+_parser = None
+
+# Opened for the duration of fetch_jobs(); None when caching is disabled
+_desc_cache: DescriptionCache | None = None
+_resp_cache: ResponseCache | None = None
+
+
+def _rate_control() -> tuple[AdaptiveRateLimiter, CircuitBreaker]:
+    """The process-wide rate limiter and circuit breaker, created on first use."""
+    global _limiter, _breaker
+    with _rate_lock:
+        if _limiter is None:
+            from util.ratelimit import AdaptiveRateLimiter, CircuitBreaker
+
+            _limiter = AdaptiveRateLimiter(DEFAULT_REQUESTS_PER_SECOND)
+            _breaker = CircuitBreaker(DEFAULT_MAX_CONSECUTIVE_THROTTLES, DEFAULT_MAX_RETRY_AFTER)
+        return _limiter, _breaker
+
+
+def _get(url: str, retries: int = 3, cancel: threading.Event | None = None) -> str:
+    """Rate-limited GET returning the response body text.
+
+    Healthy responses let the shared limiter recover its rate. A 429 or 5xx slows it down and
+    pauses every worker for ``Retry-After`` (or an exponential backoff). Once
+    the circuit breaker trips, every call raises ``CircuitOpen``. Setting
+    ``cancel`` abandons the request while it waits for the limiter. With the
+    response cache open, a stored response is revalidated and a 304 served
+    from it.
+    """
+    import requests
+
+    from util import metrics
+    from util.http import get_client, retry_after
+    from util.ratelimit import RequestCancelled
+
+    limiter, breaker = _rate_control()
+    cached = _resp_cache.get(url) if _resp_cache is not None else None
+    headers = HEADERS if cached is None else {**HEADERS, **cached.conditional_headers()}
     for attempt in range(retries):
-        resp = requests.get(url, headers=HEADERS, timeout=30)
-        if resp.status_code == 429:
-            wait = (2 ** attempt) * 5 + random.uniform(0, 3)
-            print(f"  Rate limited (429), retrying in {wait:.1f}s...", file=sys.stderr)
-            time.sleep(wait)
+        breaker.check()
+        with metrics.timed("rate_limit_wait"):
+            acquired = limiter.acquire(cancel)
+        if not acquired:
+            raise RequestCancelled(url)
+        breaker.check()
+        with metrics.timed("http"):
+            resp = get_client().get(url, headers=headers, timeout=30)
+        if resp.status_code in THROTTLE_STATUSES:
+            wait = retry_after(resp)
+            if wait is None:
+                wait = (2 ** attempt) * 5 + random.uniform(0, 3)
+            metrics.count("retries")
+            metrics.count("backoff_seconds", wait)
+            breaker.record_throttle(resp.status_code, wait)
+            breaker.check()
+            print(f"  Throttled ({resp.status_code}), retrying in {wait:.1f}s...", file=sys.stderr)
+            limiter.record_throttle(wait)
             continue
+        breaker.record_success()
+        limiter.record_success()
+        if cached is not None:
+            _resp_cache.record(url, cached, not_modified=resp.status_code == 304)
+            if resp.status_code == 304:
+                return cached.body
         resp.raise_for_status()
-        return resp
+        if _resp_cache is not None:
+            _resp_cache.put(url, resp.text, resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+        return resp.text
     raise requests.HTTPError(f"Failed after {retries} retries: {url}")
 
 # LinkedIn geoId mapping for common countries
@@ -105,159 +196,574 @@ def build_search_url(keywords: list[str], country: str, start: int = 0) -> str:
     return f"{LINKEDIN_JOBS_SEARCH_URL}?{urllib.parse.urlencode(params)}"
 
 
-def parse_job_card(card) -> dict | None:
-    """Parse a single LinkedIn job card from the HTML."""
-    title_el = card.find("h3", class_="base-search-card__title")
-    company_el = card.find("h4", class_="base-search-card__subtitle")
-    location_el = card.find("span", class_="job-search-card__location")
-    link_el = card.find("a", class_="base-card__full-link")
-    time_el = card.find("time")
-
-    if not title_el or not link_el:
-        return None
-
-    job_url = link_el.get("href", "").split("?")[0]
-    # Extract job ID from URL
-    job_id = ""
-    if "view/" in job_url:
-        job_id = job_url.split("view/")[-1].rstrip("/")
-    elif "-" in job_url:
-        job_id = job_url.split("-")[-1].rstrip("/")
-
-    return {
-        "id": job_id,
-        "title": title_el.get_text(strip=True),
-        "company": company_el.get_text(strip=True) if company_el else "Unknown",
-        "location": location_el.get_text(strip=True) if location_el else "Unknown",
-        "url": job_url,
-        "posted": time_el.get("datetime", "") if time_el else "",
-    }
+def fetch_job_description(job_url: str) -> tuple[str, int | None]:
+    """Fetch the full job description from LinkedIn job page URL.
 
+    Returns the description and the years of experience it requires.
+    """
+    from util.experience import extract_min_experience_years
 
-def fetch_job_description(job_url: str) -> str:
-    """Fetch the full job description from LinkedIn job page URL."""
     if not job_url:
-        return ""
+        return "", None
 
     # Extract numeric job ID from URL (e.g. "...at-stripe-4294958460" -> "4294958460")
     job_id = job_url.rstrip("/").split("-")[-1]
     if not job_id.isdigit():
-        return ""
+        return "", None
+
+    if _desc_cache is not None:
+        cached = _desc_cache.get(job_id)
+        if cached is not None:
+            return cached.text, cached.experience_years
+
+    description = _download_description(job_id)
+    if description is None:
+        return "", None
+    required = extract_min_experience_years(description)
+    if _desc_cache is not None:
+        _desc_cache.put(job_id, description, required)
+    return description, required
+
+
+def _download_description(job_id: str) -> str | None:
+    """Download and parse one job posting from the guest API; None if the request failed."""
+    import requests
+
+    from util import metrics
 
     try:
         # Use LinkedIn's guest job posting API — no login required, no authwall
         api_url = LINKEDIN_JOB_POSTING_URL.format(job_id=job_id)
-        resp = _get(api_url)
-        soup = BeautifulSoup(resp.text, "html.parser")
-
-        # Primary: guest API returns this structure
-        desc_el = soup.find("div", {"class": "show-more-less-html__markup"})
-        if desc_el:
-            return desc_el.get_text(strip=True, separator=" ")
-
-        # Fallback: JSON-LD structured data (schema.org JobPosting)
-        for script in soup.find_all("script", type="application/ld+json"):
-            try:
-                data = json.loads(script.string or "")
-                if data.get("@type") == "JobPosting" and data.get("description"):
-                    desc_soup = BeautifulSoup(
-                        data["description"], "html.parser")
-                    return desc_soup.get_text(strip=True, separator=" ")
-            except (json.JSONDecodeError, AttributeError):
-                continue
-
-        # Last resort: new LinkedIn design (requires login)
-        desc_el = soup.find(attrs={"data-testid": "expandable-text-box"})
-        if desc_el:
-            return desc_el.get_text(strip=True, separator=" ")
-
-        return ""
+        html = _get(api_url)
+        with metrics.timed("parse_description"):
+            return _parser.parse_description(html)
     except requests.RequestException as e:
+        metrics.count("description_failures")
         print(
             f"  Warning: failed to fetch description for job {job_id}: {e}", file=sys.stderr)
-        return ""
+        return None
 
 
-def fetch_jobs(config: dict) -> list[dict]:
-    """Fetch job listings from LinkedIn based on config filters."""
-    filters = config.get("filters", {})
-    keywords = filters.get("keywords", [])
-    country = filters.get("country", "Canada")
-    max_results = filters.get("maxResults", 30)
+def fetch_descriptions(
+    jobs: list[dict],
+    workers: int = DEFAULT_WORKERS,
+    on_done: Callable[[dict], None] | None = None,
+):
+    """Fill in ``job["description"]`` and ``job["experienceYears"]`` using a bounded worker pool.
 
-    if not keywords:
-        print("Error: no keywords configured in config.json", file=sys.stderr)
-        sys.exit(1)
+    Throughput is capped by the shared rate limiter, so adding workers only
+    overlaps network latency; it never raises the request rate. ``on_done``
+    is called with each job as soon as its description arrives.
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
 
-    all_jobs = []
-    start = 0
-    batch_size = 10  # LinkedIn guest API returns 10 per page
+    total = len(jobs)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {pool.submit(fetch_job_description, job["url"]): job for job in jobs}
+        for done, future in enumerate(as_completed(futures), 1):
+            job = futures[future]
+            if _store_description(job, future):
+                print(f"  [{done}/{total}] Fetched description for: {job['title'][:50]}...")
+                if on_done is not None:
+                    on_done(job)
 
-    print(f"Fetching jobs for: {', '.join(keywords)} in {country}")
 
-    while len(all_jobs) < max_results:
-        url = build_search_url(keywords, country, start)
+def _store_description(job: dict, future) -> bool:
+    """Copy a finished description fetch into ``job``; False if the run is stopping."""
+    from util.experience import EXPERIENCE_KEY, job_experience_years
+    from util.ratelimit import CircuitOpen
 
-        try:
-            resp = _get(url)
-        except requests.RequestException as e:
-            print(f"Request error at start={start}: {e}", file=sys.stderr)
+    try:
+        description, required = future.result()
+    except CircuitOpen:
+        return False  # leave the job for a later run
+    job["description"] = description
+    job[EXPERIENCE_KEY] = job_experience_years(job["title"], required)
+    return True
+
+
+def fetch_until_enough(
+    jobs: list[dict],
+    profiles: list[dict],
+    workers: int = DEFAULT_WORKERS,
+    on_done: Callable[[dict], None] | None = None,
+) -> int:
+    """Fetch descriptions in card order until each profile has ``maxSend`` jobs passing its filters.
+
+    Each description is run through its profiles' push filters (location,
+    exclude keywords, keywords, experience) as soon as it arrives. A card is
+    only requested while one of its profiles still needs more jobs than the
+    requests already in flight could supply, so at most ``workers`` fetches
+    are wasted once every profile has enough. Jobs that already have a
+    description (from a resumed run) count first. Returns how many cards were
+    left without a description.
+    """
+    from collections import deque
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+    from util.filter import build_pipeline
+    from util.profiles import DEFAULT_PROFILE
+
+    _, breaker = _rate_control()
+    pipelines = {p["name"]: build_pipeline(p, verbose=False) for p in profiles}
+    wanted = {p["name"]: p["filters"].get("maxSend", 10) for p in profiles}
+    found = dict.fromkeys(wanted, 0)
+    in_flight = dict.fromkeys(wanted, 0)
+
+    def qualify(job: dict):
+        for name in job["profiles"]:
+            if pipelines[name].explain(job) is None:
+                found[name] += 1
+
+    pending = deque()
+    for job in jobs:
+        if "description" in job:
+            qualify(job)
+        else:
+            pending.append(job)
+
+    def next_job() -> dict | None:
+        # Cards whose profiles all have enough are dropped; ones only waiting on
+        # requests in flight stay queued in case those jobs do not qualify
+        for index, job in enumerate(pending):
+            if all(found[name] >= wanted[name] for name in job["profiles"]):
+                continue
+            if any(found[name] + in_flight[name] < wanted[name] for name in job["profiles"]):
+                del pending[index]
+                return job
+        return None
+
+    fetched = 0
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures: dict = {}
+        while True:
+            while len(futures) < max(1, workers) and not breaker.is_open:
+                job = next_job()
+                if job is None:
+                    break
+                for name in job["profiles"]:
+                    in_flight[name] += 1
+                futures[pool.submit(fetch_job_description, job["url"])] = job
+            if not futures:
+                break
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                job = futures.pop(future)
+                for name in job["profiles"]:
+                    in_flight[name] -= 1
+                if not _store_description(job, future):
+                    continue
+                fetched += 1
+                qualify(job)
+                print(f"  [{fetched}] Fetched description for: {job['title'][:50]}... "
+                      f"({', '.join(f'{found[n]}/{wanted[n]}' for n in job['profiles'])} found)")
+                if on_done is not None:
+                    on_done(job)
+
+    unfetched = sum("description" not in job for job in pending)
+    for name in wanted:
+        label = "" if name == DEFAULT_PROFILE else f" for {name}"
+        print(f"{found[name]} fetched jobs pass the filters{label} (maxSend {wanted[name]})")
+    return unfetched
+
+
+def open_caches(config: dict):
+    """Open cache.db for the following fetch_jobs() calls, which then leave it open."""
+    from util.cache import open_description_cache, open_response_cache
+
+    global _desc_cache, _resp_cache
+    close_caches()
+    _desc_cache = open_description_cache(config, CACHE_PATH)
+    _resp_cache = open_response_cache(config, CACHE_PATH)
+
+
+def close_caches():
+    global _desc_cache, _resp_cache
+    if _desc_cache is not None:
+        _desc_cache.close()
+        _desc_cache = None
+    if _resp_cache is not None:
+        _resp_cache.close()
+        _resp_cache = None
+
+
+def fetch_jobs(config: dict, stream_path: Path | None = None, resume: bool = False) -> list[dict]:
+    """Fetch job listings from LinkedIn based on config filters.
+
+    With ``stream_path``, each job is appended to a JSON Lines file as soon as
+    its description arrives, and ``resume`` continues an interrupted file.
+    Caches are opened for this call unless ``open_caches()`` already did.
+    """
+    from util import metrics
+    from util.cache import format_response_stats
+    from util.cache import format_stats as format_cache_stats
+    from util.jobio import JobStreamWriter, read_resume_point
+
+    owns_caches = _desc_cache is None and _resp_cache is None
+    if owns_caches:
+        open_caches(config)
+    for cache in (_desc_cache, _resp_cache):
+        if cache is not None:
+            cache.reset_stats()
+    stream = None
+    resume_point = None
+    try:
+        if stream_path is not None:
+            if resume:
+                resume_point = read_resume_point(stream_path)
+                stream = JobStreamWriter(stream_path, truncate_at=resume_point.valid_bytes)
+                print(f"Resuming {stream_path.name}: {len(resume_point.done)} jobs done, "
+                      f"search offsets {resume_point.next_start}")
+            else:
+                stream = JobStreamWriter(stream_path)
+        return _fetch_jobs(config, stream, resume_point)
+    finally:
+        if stream is not None:
+            stream.close()
+        if _desc_cache is not None:
+            _desc_cache.prune()
+            metrics.record("description_cache", _desc_cache.stats())
+            print(format_cache_stats(_desc_cache.stats()))
+        if _resp_cache is not None:
+            _resp_cache.prune()
+            metrics.record("response_cache", _resp_cache.stats())
+            print(format_response_stats(_resp_cache.stats()))
+        if owns_caches:
+            close_caches()
+
+
+def _fetch_jobs(config: dict, stream: JobStreamWriter | None, resume_point: ResumePoint | None) -> list[dict]:
+    from util import metrics
+    from util.experience import EXPERIENCE_KEY
+    from util.http import configure_client
+    from util.neardup import NearDupIndex, near_dup_threshold
+    from util.parser import get_parser
+    from util.profiles import group_by_search, load_profiles
+    from util.seen import open_seen_store
+
+    limiter, breaker = _rate_control()
+
+    fetch_cfg = config.get("fetch", {})
+    workers = fetch_cfg.get("workers", DEFAULT_WORKERS)
+    rate = fetch_cfg.get("requestsPerSecond", DEFAULT_REQUESTS_PER_SECOND)
+    limiter.configure(
+        rate,
+        min_rate=fetch_cfg.get("minRequestsPerSecond"),
+        max_rate=fetch_cfg.get("maxRequestsPerSecond"),
+    )
+    breaker.configure(
+        fetch_cfg.get("maxConsecutiveThrottles", DEFAULT_MAX_CONSECUTIVE_THROTTLES),
+        fetch_cfg.get("maxRetryAfter", DEFAULT_MAX_RETRY_AFTER),
+    )
+    configure_client(config).reset_stats()
+
+    global _parser
+    backend = fetch_cfg.get("parser", "auto")
+    if _parser is None or backend not in ("auto", _parser.name):
+        _parser = get_parser(backend)
+
+    prefetch = fetch_cfg.get("searchPrefetch", DEFAULT_SEARCH_PREFETCH)
+
+    profiles = load_profiles(config)
+    for profile in profiles:
+        if not profile["filters"].get("keywords"):
+            print(f"Error: no keywords configured for profile '{profile['name']}' in config.json", file=sys.stderr)
+            sys.exit(1)
+
+    # Skip jobs already sent in earlier runs before paying for their descriptions
+    seen_store = open_seen_store(SEEN_DB_PATH, STATE_PATH) if fetch_cfg.get("skipSeen", True) else None
+    seen_views = {p["name"]: seen_store.for_profile(p["name"]) for p in profiles} if seen_store else None
+    # ...and, where filters.skipRepostedCards allows it, cards whose title, company
+    # and location exactly match a job already sent. Off by default: separate
+    # openings for the same role look identical at the card stage.
+    skip_reposts = [p["name"] for p in profiles
+                    if p["filters"].get("skipRepostedCards", False) and near_dup_threshold(p) is not None]
+    near_dups = NearDupIndex(SEEN_DB_PATH) if seen_store is not None and skip_reposts else None
+    repost_views = {name: near_dups.for_profile(name) for name in skip_reposts} if near_dups is not None else None
+
+    # Profiles sharing a query share its result pages; a job found by several
+    # searches is kept once, tagged with every profile it was collected for
+    groups = group_by_search(profiles)
+    by_id: dict[str, dict] = {}
+    for key, members in groups.items():
+        if breaker.is_open:
             break
+        with metrics.timed("search"):
+            found = _search(" @ ".join(key), members, seen_views, stream, resume_point, prefetch, repost_views)
+        for job in found:
+            existing = by_id.get(job["id"])
+            if existing is None:
+                by_id[job["id"]] = job
+            else:
+                existing["profiles"] += [name for name in job["profiles"] if name not in existing["profiles"]]
+
+    if seen_store is not None:
+        seen_store.close()
+    if near_dups is not None:
+        near_dups.close()
+
+    all_jobs = list(by_id.values())
+    if len(profiles) > 1:
+        print(f"\n{len(all_jobs)} unique jobs from {len(groups)} searches for {len(profiles)} profiles")
+    all_jobs = most_promising(profiles, all_jobs)
+
+    # Fetch descriptions for each job, reusing any finished before a resume
+    done = resume_point.done if resume_point is not None else {}
+    for job in all_jobs:
+        if job["id"] in done:
+            job["description"] = done[job["id"]]["description"]
+            if EXPERIENCE_KEY in done[job["id"]]:
+                job[EXPERIENCE_KEY] = done[job["id"]][EXPERIENCE_KEY]
+    pending = [job for job in all_jobs if job["id"] not in done]
+
+    on_done = stream.write_job if stream is not None else None
+    if not breaker.is_open and fetch_cfg.get("lazyDescriptions", False):
+        # Stop as soon as every profile has maxSend jobs that will pass push_jobs' filters
+        print(f"\nFetching job descriptions until each profile has maxSend matches "
+              f"({len(pending)} candidates, {workers} workers)...")
+        with metrics.timed("descriptions"):
+            skipped = fetch_until_enough(all_jobs, profiles, workers, on_done=on_done)
+        metrics.count("descriptions_skipped", skipped)
+        if skipped:
+            print(f"Skipped {skipped} descriptions that were no longer needed")
+    elif not breaker.is_open:
+        print(f"\nFetching job descriptions for {len(pending)} jobs ({workers} workers)...")
+        with metrics.timed("descriptions"):
+            fetch_descriptions(pending, workers, on_done=on_done)
+
+    # A tripped breaker leaves some jobs without descriptions; --resume picks them up
+    jobs = [job for job in all_jobs if "description" in job]
+    metrics.count("jobs", len(jobs))
+    return jobs
+
+
+def most_promising(profiles: list[dict], jobs: list[dict]) -> list[dict]:
+    """Keep each profile's ``maxDescriptions`` most promising cards, ranked by title keywords and recency.
+
+    Cards a profile does not keep lose its tag; cards no profile keeps are
+    dropped, so their descriptions are never fetched.
+    """
+    from util import metrics
+    from util.filter import build_scorer, rank_cards
+    from util.profiles import DEFAULT_PROFILE
+
+    for profile in profiles:
+        name = profile["name"]
+        limit = profile["filters"].get("maxDescriptions")
+        cards = [job for job in jobs if name in job["profiles"]]
+        if limit is None or len(cards) <= limit:
+            continue
+        chosen = rank_cards(profile, cards, limit) if build_scorer(profile) is not None else cards[:limit]
+        chosen_ids = {card["id"] for card in chosen}
+        for card in cards:
+            if card["id"] not in chosen_ids:
+                card["profiles"].remove(name)
+        label = "" if name == DEFAULT_PROFILE else f" ({name})"
+        print(f"Fetching descriptions for the {limit} most promising of {len(cards)} cards{label}")
+    kept = [job for job in jobs if job["profiles"]]
+    metrics.count("cards_not_described", len(jobs) - len(kept))
+    return kept
+
+
+def _search(
+    search: str,
+    members: list[dict],
+    seen_views: dict[str, SeenStore] | None,
+    stream: JobStreamWriter | None,
+    resume_point: ResumePoint | None,
+    prefetch: int = DEFAULT_SEARCH_PREFETCH,
+    repost_views: dict[str, NearDupIndex] | None = None,
+) -> list[dict]:
+    """Page through one LinkedIn search shared by the ``members`` profiles.
+
+    Each kept card is tagged with the profiles it is new, not a repost of a
+    sent job and not title-excluded for. Paging stops once every profile has
+    its ``maxResults`` or results run out.
+    """
+    import requests
+
+    from util import metrics
+    from util.filter import filter_by_exclude_keywords
+    from util.paginate import PagePrefetcher, pages_needed
+    from util.profiles import DEFAULT_PROFILE
+    from util.ratelimit import CircuitOpen
+
+    filters = members[0]["filters"]
+    keywords = filters["keywords"]
+    country = filters.get("country", "Canada")
+    wanted = {p["name"]: p["filters"].get("maxResults", 30) for p in members}
 
-        soup = BeautifulSoup(resp.text, "html.parser")
-        cards = soup.find_all("div", class_="base-card")
+    jobs: list[dict] = []
+    start = 0
+    search_done = False
+    if resume_point is not None:
+        jobs = list(resume_point.cards.get(search, []))
+        start = resume_point.next_start.get(search, 0)
+        search_done = search in resume_point.search_done
+    ids = {job["id"] for job in jobs}  # repeated cards across pages are dropped too
+    counts = {name: sum(name in job["profiles"] for job in jobs) for name in wanted}
+    skipped = 0
+
+    def satisfied() -> bool:
+        return all(counts[name] >= wanted[name] for name in wanted)
+
+    print(f"Fetching jobs for: {', '.join(keywords)} in {country}"
+          + (f" (profiles: {', '.join(wanted)})" if len(wanted) > 1 or DEFAULT_PROFILE not in wanted else ""))
+
+    def remaining() -> int:
+        return max(wanted[name] - counts[name] for name in wanted)
+
+    def fetch_page(offset: int, cancel: threading.Event) -> list[dict]:
+        html = _get(build_search_url(keywords, country, offset), cancel=cancel)
+        with metrics.timed("parse_cards"):
+            return _parser.parse_cards(html)
+
+    # Later pages are requested while earlier ones are processed; how far ahead
+    # follows how many more pages the observed card pass rate says are needed
+    pages = PagePrefetcher(fetch_page, start, page_size=SEARCH_PAGE_SIZE,
+                           max_start=MAX_SEARCH_START, max_depth=prefetch)
+    kept = seen_cards = 0
+    try:
+        if not search_done:
+            pages.set_depth(pages_needed(remaining(), kept, seen_cards, SEARCH_PAGE_SIZE))
+            for offset, cards in pages:
+                if not cards:
+                    search_done = True
+                    break
+
+                page_jobs = []
+                for job in cards:
+                    if not job["id"] or job["id"] in ids:
+                        continue
+                    ids.add(job["id"])
+                    targets = []
+                    for profile in members:
+                        name = profile["name"]
+                        if counts[name] >= wanted[name]:
+                            continue
+                        if seen_views is not None and job["id"] in seen_views[name]:
+                            continue
+                        if repost_views is not None and name in repost_views and repost_views[name].has_card(job):
+                            metrics.count("cards_reposted")
+                            continue
+                        if filter_by_exclude_keywords([job], profile, title_only=True):
+                            targets.append(name)
+                    if not targets:
+                        skipped += 1
+                        continue
+                    job["profiles"] = targets
+                    for name in targets:
+                        counts[name] += 1
+                    page_jobs.append(job)
+                jobs.extend(page_jobs)
+                kept += len(page_jobs)
+                seen_cards += len(cards)
+                metrics.count("cards", len(cards))
+                metrics.count("cards_skipped", len(cards) - len(page_jobs))
+
+                print(f"  Fetched {len(cards)} cards (new so far: {len(jobs)}, skipped: {skipped})")
+
+                start = offset + SEARCH_PAGE_SIZE
+                if stream is not None:
+                    stream.write_page(search, start, page_jobs)
+
+                if len(cards) < SEARCH_PAGE_SIZE:
+                    search_done = True
+                if search_done or satisfied():
+                    break
+                pages.set_depth(pages_needed(remaining(), kept, seen_cards, SEARCH_PAGE_SIZE))
+    except requests.RequestException as e:
+        print(f"Request error at start={start}: {e}", file=sys.stderr)
+    except CircuitOpen:
+        pass  # reported once in the run summary
+    finally:
+        pages.close()
 
-        print(('card>>>'), len(cards))
+    if pages.unused:
+        print(f"  Prefetched {pages.unused} search pages that were not needed")
 
-        if not cards:
-            break
+    if stream is not None and (search_done or satisfied()):
+        stream.mark_search_done(search)
+    return jobs
 
-        for card in cards:
-            job = parse_job_card(card)
-            if job and job["id"]:
-                excluded = filter_by_exclude_keywords([job], config, title_only=True)
-                if excluded:
-                    all_jobs.append(job)
 
-        print(f"  Fetched {len(cards)} cards (total so far: {len(all_jobs)})")
+def should_run_now(config: dict, now: datetime | None = None) -> datetime | None:
+    """Return the schedule slot a heartbeat run should cover now, if any.
 
-        if len(cards) < batch_size:
-            break
+    A slot stays due from its time until a run covering it succeeds, so a
+    heartbeat that misses the exact minute, or follows a failed run, still
+    catches up, and a second heartbeat after the run does not fire again.
+    Without a schedule every heartbeat runs.
+    """
+    schedule = config.get("schedule", {})
+    now = now or datetime.now(timezone.utc)
+    if not schedule_times(schedule):
+        # No schedule configured — always run
+        return now
 
-        start += batch_size
-        time.sleep(1.5)  # polite delay
+    # Only claimed slots count: a manual or dry-run push must not cancel a catch-up
+    state = load_state(STATE_PATH)
+    last = [parse_time(value) for value in state.get("last_slots", {}).values()]
+    last = [t for t in last if t is not None]
+    return due_slot(schedule, now, max(last) if last else None)
 
-    # Trim to max_results
-    all_jobs = all_jobs[:max_results]
 
-    # Fetch descriptions for each job
-    print(f"\nFetching job descriptions for {len(all_jobs)} jobs...")
-    for i, job in enumerate(all_jobs, 1):
-        print(
-            f"  [{i}/{len(all_jobs)}] Fetching description for: {job['title'][:50]}...")
-        job["description"] = fetch_job_description(job["url"])
-        time.sleep(3)  # polite delay between description fetches
+def claim_slot(slot: datetime, profiles: list[str]):
+    """Record in state.json that a run covering ``slot`` for ``profiles`` succeeded."""
+    state = load_state(STATE_PATH)
+    last_slots = state.setdefault("last_slots", {})
+    for name in profiles:
+        last_slots[name] = slot.isoformat()
+    save_state(state, STATE_PATH)
 
-    return all_jobs
 
+def archive_jobs(config: dict, jobs: list[dict]):
+    """Add fetched jobs to archive.db unless ``archive.enabled`` is false."""
+    from util import metrics
+    from util.archive import format_stats, open_archive
 
-def should_run_now(config: dict) -> bool:
-    """Check if current time matches the configured schedule (within ±5 minutes)."""
-    schedule = config.get("schedule", {})
-    target_time = schedule.get("time", "")
-    timezone_str = schedule.get("timezone", "America/Toronto")
+    archive = open_archive(config, ARCHIVE_PATH)
+    if archive is None:
+        return
+    try:
+        with metrics.timed("archive"):
+            added = archive.add_many(jobs)
+        print(f"Archived {added} new jobs. {format_stats(archive.stats())}")
+    finally:
+        archive.close()
 
-    if not target_time:
-        # No schedule configured — always run
-        return True
 
-    tz = pytz.timezone(timezone_str)
-    now = datetime.now(tz)
+def run(config: dict, stream: bool = False, resume: bool = False) -> bool:
+    """Fetch and write jobs.json (or jobs.jsonl); False if throttling stopped the run early.
 
-    target_hour, target_min = map(int, target_time.split(":"))
-    diff = abs(now.hour * 60 + now.minute - (target_hour * 60 + target_min))
+    The run's timings and stats are appended to the metrics report (``metrics.*``).
+    """
+    from util import metrics
+    from util.http import format_stats, get_client
+    from util.ratelimit import format_stats as format_rate_stats
 
-    return diff <= 5
+    limiter, breaker = _rate_control()
+    metrics.start_run("fetch")
+    ok = False
+    try:
+        if stream or resume:
+            jobs = fetch_jobs(config, stream_path=JOBS_STREAM_PATH, resume=resume)
+            print(f"Wrote {len(jobs)} jobs to {JOBS_STREAM_PATH}")
+        else:
+            jobs = fetch_jobs(config)
+            with metrics.timed("write_output"), open(JOBS_OUTPUT_PATH, "w", encoding="utf-8") as f:
+                json.dump(jobs, f, indent=2, ensure_ascii=False)
+            print(f"Wrote {len(jobs)} jobs to {JOBS_OUTPUT_PATH}")
+        archive_jobs(config, jobs)
+        print(format_stats(get_client().stats()))
+        print(format_rate_stats(limiter.stats(), breaker))
+        metrics.record("http", get_client().stats())
+        metrics.record("rate_limit", {**limiter.stats(), "circuit_open": breaker.is_open,
+                                      "statuses": {str(k): n for k, n in breaker.statuses.items()}})
+        ok = not breaker.is_open
+        return ok
+    finally:
+        metrics.finish_run(config, SCRIPT_DIR, ok)
 
 
 def main():
@@ -265,22 +771,42 @@ def main():
     parser.add_argument(
         "--heartbeat",
         action="store_true",
-        help="Only run if current time matches config schedule (±5 min)",
+        help="Only run if a scheduled time has passed that no run has covered yet",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help=f"Write jobs to {JOBS_STREAM_PATH.name} one per line as they are fetched",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help=f"Continue an interrupted --stream run from {JOBS_STREAM_PATH.name}",
     )
     args = parser.parse_args()
 
     config = load_config()
 
-    if args.heartbeat and not should_run_now(config):
-        print("Not scheduled time. Exiting silently.")
-        sys.exit(0)
-
-    jobs = fetch_jobs(config)
-
-    with open(JOBS_OUTPUT_PATH, "w", encoding="utf-8") as f:
-        json.dump(jobs, f, indent=2, ensure_ascii=False)
-
-    print(f"Wrote {len(jobs)} jobs to {JOBS_OUTPUT_PATH}")
+    slot = None
+    if args.heartbeat:
+        # Locked before checking, so a heartbeat that starts while another
+        # run is still going neither overlaps it nor repeats its slot
+        lock = try_lock(LOCK_PATH)
+        if lock is None:
+            print("Another scheduled run is in progress. Exiting silently.")
+            sys.exit(0)
+        slot = should_run_now(config)
+        if slot is None:
+            print("Not scheduled time. Exiting silently.")
+            sys.exit(0)
+
+    if not run(config, stream=args.stream, resume=args.resume):
+        sys.exit(1)  # the slot stays due, so the next heartbeat retries it
+
+    if slot is not None:
+        from util.profiles import load_profiles
+
+        claim_slot(slot, [p["name"] for p in load_profiles(config)])
 
 
 if __name__ == "__main__":
@@ -1,11 +1,16 @@
 #!/usr/bin/env python3
 """
-Read jobs.json, apply filters, deduplicate against state.json,
-and push new jobs to Telegram.
+Read jobs.json (or jobs.jsonl), apply filters, deduplicate against state.db,
+and push new jobs to Telegram. Messages that cannot be delivered are queued
+in state.db and retried first on the next --send run.
 
 Usage:
   python3 push_jobs.py --send       # filter + dedup + send to Telegram
   python3 push_jobs.py --dry-run    # filter + dedup + print (no Telegram)
+  python3 push_jobs.py --send --input jobs.jsonl
+  python3 push_jobs.py --send --profile alice   # one profile only
+  python3 push_jobs.py --replay candidate.json  # compare filters offline
+  python3 push_jobs.py --replay candidate.json --input jobs.json --since 30d
 """
 
 from __future__ import annotations
@@ -15,21 +20,35 @@ import json
 import os
 import re
 import sys
+import time
 from datetime import datetime
 from pathlib import Path
 
+from typing import Container
+
 import pytz
-import requests
 
 from constants import TELEGRAM_SEND_MESSAGE_URL
-from util.filter import deduplicate, filter_by_exclude_keywords, filter_by_experience, filter_by_keywords, filter_by_location
-from util.formatter import format_telegram_message, split_message
+from util import metrics
+from util.filter import JobRanker, build_pipeline, build_scorer
+from util.formatter import format_telegram_chunks, format_telegram_message
+from util.http import configure_client, format_stats, get_client
+from util.jobio import JobRecord, iter_jobs, latest_jobs_file
+from util.neardup import NearDupIndex, near_dup_threshold
+from util.outbox import DEFAULT_MAX_ATTEMPTS, Outbox
+from util.profiles import DEFAULT_PROFILE, job_targets, load_profiles
+from util.seen import SeenStore, open_seen_store
+from util.state import load_state, save_state
+from util.telegram import Chunk, create_sender
 
 SCRIPT_DIR = Path(__file__).resolve().parent
 CONFIG_PATH = SCRIPT_DIR / "config.json"
 SECRETS_PATH = SCRIPT_DIR / "secrets.json"
 JOBS_PATH = SCRIPT_DIR / "jobs.json"
+JOBS_STREAM_PATH = SCRIPT_DIR / "jobs.jsonl"
 STATE_PATH = SCRIPT_DIR / "state.json"
+SEEN_DB_PATH = SCRIPT_DIR / "state.db"
+ARCHIVE_PATH = SCRIPT_DIR / "archive.db"
 
 
 def load_json(path: Path) -> dict | list:
@@ -40,18 +59,6 @@ def load_json(path: Path) -> dict | list:
         return json.load(f)
 
 
-def save_state(state: dict):
-    with open(STATE_PATH, "w", encoding="utf-8") as f:
-        json.dump(state, f, indent=2, ensure_ascii=False)
-
-
-def load_state() -> dict:
-    if STATE_PATH.exists():
-        with open(STATE_PATH, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return {"seen_job_ids": [], "last_run": None}
-
-
 def load_secrets() -> dict:
     """Load Telegram credentials from secrets.json or environment variables."""
     token = os.environ.get("TELEGRAM_BOT_TOKEN", "")
@@ -71,108 +78,274 @@ def load_secrets() -> dict:
     sys.exit(1)
 
 
-def send_telegram(message: str, token: str, chat_id: str) -> bool:
-    """Send a message via Telegram Bot API."""
-    url = TELEGRAM_SEND_MESSAGE_URL.format(token=token)
-    payload = {
-        "chat_id": chat_id,
-        "text": message,
-        "parse_mode": "HTML",
-        "disable_web_page_preview": True,
-    }
-
-    try:
-        resp = requests.post(url, json=payload, timeout=30)
-        resp.raise_for_status()
-        result = resp.json()
-        if result.get("ok"):
-            print("Telegram message sent successfully.")
-            return True
-        else:
-            print(f"Telegram API error: {result}", file=sys.stderr)
-            return False
-    except requests.RequestException as e:
-        print(f"Telegram send failed: {e}", file=sys.stderr)
-        return False
-
-
-def main():
-    parser = argparse.ArgumentParser(description="Push LinkedIn jobs to Telegram")
-    group = parser.add_mutually_exclusive_group(required=True)
-    group.add_argument("--send", action="store_true", help="Send to Telegram")
-    group.add_argument("--dry-run", action="store_true", help="Print only, no send")
-    args = parser.parse_args()
-
-    config = load_json(CONFIG_PATH)
-    jobs = load_json(JOBS_PATH)
-    state = load_state()
-
-    filters = config.get("filters", {})
-
-    # Filter by keywords
-    filtered = filter_by_keywords(jobs, config)
-    print(f"After keyword filter: {len(filtered)}/{len(jobs)} jobs remain")
+class _SeenOrQueued:
+    """``in`` holds for jobs already delivered or waiting in the outbox."""
 
-    # Filter by location
-    filtered = filter_by_location(filtered, config)
-    print(f"After location filter: {len(filtered)}/{len(jobs)} jobs remain")
+    def __init__(self, seen: SeenStore, queued: set[str]):
+        self.seen = seen
+        self.queued = queued
 
-    # Filter by experience
-    max_exp = filters.get("maxExperienceYears")
-    filtered = filter_by_experience(filtered, max_exp)
-    if max_exp is not None:
-        print(f"After experience filter (≤{max_exp}yr): {len(filtered)} jobs remain")
+    def __contains__(self, job_id: object) -> bool:
+        return job_id in self.queued or job_id in self.seen
 
-    # Filter by exclude keywords (title + description)
-    filtered = filter_by_exclude_keywords(filtered, config)
-    print(f"After exclude-keyword filter: {len(filtered)}/{len(jobs)} jobs remain")
 
-    # Deduplicate
-    new_jobs = deduplicate(filtered, state)
-    print(f"After deduplication: {len(new_jobs)} new jobs")
+def push_profile(profile: dict, jobs_path: Path, seen: Container, dry_run: bool, chat_id: str = "",
+                 near_dups: NearDupIndex | None = None) -> list[Chunk]:
+    """Filter and format one profile's jobs; returns the chunks to deliver (none on a dry run)."""
+    name = profile["name"]
+    filters = profile.get("filters", {})
+    if name != DEFAULT_PROFILE:
+        print(f"\n=== Profile: {name} ===")
 
-    # Limit
+    # Filter + deduplicate in one lazy pass over the file, cheapest stages first.
+    # Survivors are ranked by relevance in a bounded heap (or, with ranking
+    # off, the first maxSend are taken) and kept as compact records without
+    # their descriptions, so memory does not grow with the input.
     max_send = filters.get("maxSend", 10)
-    print('maxSend >>>>> ', max_send)
-
-    to_send = new_jobs[:max_send]
+    pipeline = build_pipeline(profile, seen=seen, near_dups=near_dups)
+    scorer = build_scorer(profile)
+    ranker = JobRanker(scorer, max_send, JobRecord.from_job) if scorer is not None else None
+    jobs = (job for job in iter_jobs(jobs_path) if job_targets(job, name))
+    kept = 0
+    to_send: list[JobRecord] = []
+    with metrics.timed("filter"):
+        for job in pipeline.run(jobs):
+            kept += 1
+            if ranker is not None:
+                ranker.offer(job)
+            elif len(to_send) < max_send:
+                to_send.append(JobRecord.from_job(job))
+    if ranker is not None:
+        to_send = ranker.top()
+        metrics.add_time("rank", ranker.seconds)
+    metrics.record_filter(name, pipeline.stats())
+    metrics.count("jobs_read", pipeline.total)
+    metrics.count("jobs_kept", kept)
+    metrics.count("jobs_to_send", len(to_send))
+    print(pipeline.format_stats())
+    print(f"New jobs after filtering: {kept}"
+          + (f" (the {len(to_send)} most relevant are sent)" if ranker is not None and kept > len(to_send) else ""))
 
     # Format message
     keywords = filters.get("keywords", [])
     keyword_str = ", ".join(keywords)
-    message = format_telegram_message(to_send, keyword_str)
 
-    if args.dry_run:
+    if dry_run:
+        message = format_telegram_message(to_send, keyword_str)
         print("\n--- DRY RUN (message preview) ---\n")
         plain = re.sub(r"<[^>]+>", "", message)
         print(plain)
-    elif args.send:
+        return []
+
+    with metrics.timed("format"):
+        return [Chunk(name, chat_id, text, job_ids) for text, job_ids in format_telegram_chunks(to_send, keyword_str)]
+
+
+def push(config: dict, jobs_path: Path, profiles: list[dict], dry_run: bool = False) -> bool:
+    """Filter and deliver ``profiles``' jobs; False if any message stayed undelivered.
+
+    The run's timings and stats are appended to the metrics report (``metrics.*``).
+    """
+    metrics.start_run("push_dry_run" if dry_run else "push")
+    ok = False
+    try:
+        ok = _push(config, jobs_path, profiles, dry_run)
+        return ok
+    finally:
+        metrics.finish_run(config, SCRIPT_DIR, ok)
+
+
+def _push(config: dict, jobs_path: Path, profiles: list[dict], dry_run: bool) -> bool:
+    send = not dry_run
+
+    # A profile's own chat overrides the default one from secrets
+    token = ""
+    chat_ids = {}
+    if send:
         secrets = load_secrets()
         token = secrets["TELEGRAM_BOT_TOKEN"]
-        chat_id = secrets["TELEGRAM_CHAT_ID"]
+        if not token:
+            print("Error: TELEGRAM_BOT_TOKEN is empty", file=sys.stderr)
+            sys.exit(1)
+        for profile in profiles:
+            chat_ids[profile["name"]] = profile.get("telegram", {}).get("chatId") or secrets["TELEGRAM_CHAT_ID"]
+            if not chat_ids[profile["name"]]:
+                print(f"Error: no Telegram chat ID for profile '{profile['name']}'", file=sys.stderr)
+                sys.exit(1)
+
+    seen = open_seen_store(SEEN_DB_PATH, STATE_PATH)
+    outbox = Outbox(SEEN_DB_PATH)
+    near_dups = NearDupIndex(SEEN_DB_PATH)
+    state = load_state(STATE_PATH)
+
+    chunks: list[Chunk] = []
+    for profile in profiles:
+        name = profile["name"]
+        profile_seen = _SeenOrQueued(seen.for_profile(name), outbox.pending_job_ids(name))
+        threshold = near_dup_threshold(profile)
+        profile_near_dups = near_dups.for_profile(name, threshold) if threshold is not None else None
+        chunks += push_profile(profile, jobs_path, profile_seen, dry_run, chat_ids.get(name, ""), profile_near_dups)
+
+    undelivered: list[Chunk] = []
+    if send:
+        # Older undelivered chunks go first, so each chat still gets messages in order
+        queued = outbox.pending(profiles=set(chat_ids))
+        if queued:
+            print(f"\nRetrying {len(queued)} undelivered messages from the outbox")
+        configure_client(config).reset_stats()
+        sender = create_sender(config, token, TELEGRAM_SEND_MESSAGE_URL)
+        with metrics.timed("deliver"):
+            delivered, undelivered = sender.deliver(queued + chunks)
+        print(format_stats(get_client().stats()))
+        metrics.record("http", get_client().stats())
+        metrics.record("telegram", {"sent": sender.sent, "rate_limited": sender.rate_limited,
+                                    "retried_from_outbox": len(queued), "undelivered": len(undelivered)})
+
+        outbox.remove(c for c in delivered if c.outbox_id is not None)
+        # Every undelivered piece of a message announcing jobs is queued, so an
+        # entry split across pieces is re-sent whole; a "no new jobs" message is not
+        announcing = {c.profile for c in chunks if c.job_ids}
+        queue = [c for c in undelivered if c.outbox_id is None and c.profile in announcing]
+        outbox.add(queue)
+        for chunk in queue:
+            near_dups.for_profile(chunk.profile).hold_many(chunk.job_ids)
+        max_attempts = config.get("telegram", {}).get("outboxMaxAttempts", DEFAULT_MAX_ATTEMPTS)
+        for chunk in outbox.record_failure([c for c in undelivered if c.outbox_id is not None], max_attempts):
+            near_dups.for_profile(chunk.profile).release_many(chunk.job_ids)
+            print(f"Dropped a message to chat {chunk.chat_id} after {chunk.attempts} failed attempts; "
+                  f"its {len(chunk.job_ids)} jobs may be sent again", file=sys.stderr)
+
+        # Only jobs that reached their chat count as seen
+        delivered_ids: dict[str, list[str]] = {}
+        for chunk in delivered:
+            delivered_ids.setdefault(chunk.profile, []).extend(chunk.job_ids)
+        for name, job_ids in delivered_ids.items():
+            seen.for_profile(name).add_many(job_ids)
+            near_dups.for_profile(name).add_many(job_ids)
+            metrics.count("jobs_delivered", len(job_ids))
+
+    expiry_days = config.get("state", {}).get("seenExpiryDays")
+    for profile in profiles:
+        profile_seen = seen.for_profile(profile["name"])
+        if expiry_days:
+            expired = profile_seen.expire(expiry_days)
+            near_dups.for_profile(profile["name"]).expire(expiry_days)
+            if expired:
+                print(f"Expired {expired} seen job IDs older than {expiry_days} days")
+        print(f"Total seen jobs ({profile['name']}): {len(profile_seen)}")
+
+    if send:
+        state["last_run"] = datetime.now(pytz.timezone("America/Toronto")).isoformat()
+        save_state(state, STATE_PATH)
+    queued_count = len(outbox)
+    seen.close()
+    outbox.close()
+    near_dups.close()
+    print("State updated.")
+
+    if undelivered:
+        print(f"{len(undelivered)} messages were not delivered; {queued_count} are queued for the next run",
+              file=sys.stderr)
+        return False
+    return True
+
+
+def replay_jobs(jobs_path: Path | None, since: str | None) -> tuple[list[dict], str]:
+    """Stored jobs to replay filters over, and where they came from.
 
-        if not token or not chat_id:
-            print("Error: TELEGRAM_BOT_TOKEN or TELEGRAM_CHAT_ID is empty", file=sys.stderr)
+    Defaults to archive.db (every fetched job), else the latest jobs file.
+    """
+    if jobs_path is None and ARCHIVE_PATH.exists():
+        from util.archive import JobArchive
+
+        archive = JobArchive(ARCHIVE_PATH)
+        try:
+            jobs = list(archive.iter_jobs(since))
+        finally:
+            archive.close()
+        if jobs:
+            return jobs, f"{ARCHIVE_PATH.name}" + (f" (posted since {since})" if since else "")
+
+    jobs_path = jobs_path or latest_jobs_file(JOBS_PATH, JOBS_STREAM_PATH)
+    if not jobs_path.exists():
+        print(f"Error: no {ARCHIVE_PATH.name} or {jobs_path} to replay", file=sys.stderr)
+        sys.exit(1)
+    jobs = [job for job in iter_jobs(jobs_path) if not since or (job.get("posted") or "") >= since]
+    return jobs, jobs_path.name
+
+
+def replay(config: dict, candidate: dict, jobs_path: Path | None = None, since: str | None = None,
+           profile: str | None = None):
+    """Compare ``candidate``'s filters with ``config``'s over stored jobs: no network, no state changes."""
+    from util.replay import format_replay
+    from util.replay import replay as replay_profiles
+
+    started = time.perf_counter()
+    jobs, source = replay_jobs(jobs_path, since)
+    loaded = time.perf_counter()
+
+    current, candidates = load_profiles(config), load_profiles(candidate)
+    if profile:
+        current = [p for p in current if p["name"] == profile]
+        candidates = [p for p in candidates if p["name"] == profile]
+        if not current and not candidates:
+            print(f"Error: no profile named '{profile}' in either config", file=sys.stderr)
             sys.exit(1)
 
-        chunks = split_message(message)
-        success = True
-        for chunk in chunks:
-            if not send_telegram(chunk, token, chat_id):
-                success = False
-                break
+    results = replay_profiles(current, candidates, jobs)
+    finished = time.perf_counter()
+    print(f"Replaying {len(jobs)} jobs from {source} (loaded in {(loaded - started) * 1000:.0f} ms)")
+    print(format_replay(results))
+    print(f"\nReplay took {(finished - started) * 1000:.0f} ms "
+          f"({(finished - loaded) * 1000:.0f} ms filtering); nothing was sent or marked seen")
 
-        if not success:
+
+def main():
+    parser = argparse.ArgumentParser(description="Push LinkedIn jobs to Telegram")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--send", action="store_true", help="Send to Telegram")
+    group.add_argument("--dry-run", action="store_true", help="Print only, no send")
+    group.add_argument(
+        "--replay",
+        type=Path,
+        metavar="CONFIG",
+        help="Compare CONFIG's filters with config.json's over stored jobs, offline",
+    )
+    parser.add_argument(
+        "--input",
+        type=Path,
+        help="jobs.json or jobs.jsonl to read (default: whichever was written last; "
+             f"--replay defaults to {ARCHIVE_PATH.name})",
+    )
+    parser.add_argument("--profile", help="Only push this profile (default: all profiles)")
+    parser.add_argument("--since", help="With --replay: only jobs posted on or after YYYY-MM-DD or Nd (days ago)")
+    args = parser.parse_args()
+
+    config = load_json(CONFIG_PATH)
+    if args.replay:
+        from util.archive import parse_date
+
+        try:
+            since = parse_date(args.since) if args.since else None
+        except ValueError:
+            parser.error(f"--since expects YYYY-MM-DD or a day count like 30d, got '{args.since}'")
+        replay(config, load_json(args.replay), args.input, since, args.profile)
+        return
+
+    profiles = load_profiles(config)
+    if args.profile:
+        profiles = [p for p in profiles if p["name"] == args.profile]
+        if not profiles:
+            print(f"Error: no profile named '{args.profile}' in config.json", file=sys.stderr)
             sys.exit(1)
 
-    # Update state with all new job IDs (even if we only sent a subset)
-    seen = set(state.get("seen_job_ids", []))
-    for job in new_jobs:
-        seen.add(job["id"])
-    state["seen_job_ids"] = list(seen)
-    state["last_run"] = datetime.now(pytz.timezone("America/Toronto")).isoformat()
-    save_state(state)
-    print(f"State updated. Total seen jobs: {len(seen)}")
+    jobs_path = args.input or latest_jobs_file(JOBS_PATH, JOBS_STREAM_PATH)
+    if not jobs_path.exists():
+        print(f"Error: {jobs_path} not found", file=sys.stderr)
+        sys.exit(1)
+
+    if not push(config, jobs_path, profiles, dry_run=args.dry_run):
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,219 @@
+"""Every fetched job, kept in archive.db (SQLite) and searchable offline.
+
+jobs.json only holds the latest run. The archive keeps each posting once,
+refreshed whenever it is fetched again. Title and description have a
+trigram FTS5 index (case-insensitive substring search), and company,
+location, posted date and experience have B-tree indexes.
+
+``query()`` turns a profile's filters into an indexed candidate query:
+keywords become an FTS match, ``maxExperienceYears`` and the date range
+become index lookups. The usual filter pipeline then runs over those
+candidates only, so the results are exactly what push_jobs would keep.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from util.experience import EXPERIENCE_KEY, annotate_experience
+from util.filter import build_pipeline
+
+# The trigram tokenizer cannot match anything shorter
+_MIN_FTS_TERM = 3
+
+_COLUMNS = "job_id, title, company, location, url, posted, description, experience_years"
+
+
+def _row_job(row: tuple) -> dict:
+    job_id, title, company, location, url, posted, description, years = row
+    return {"id": job_id, "title": title, "company": company, "location": location, "url": url,
+            "posted": posted, "description": description or "", EXPERIENCE_KEY: years}
+
+
+class ArchiveQuery:
+    """Matches of one ``JobArchive.query()`` call and how they were found."""
+
+    __slots__ = ("jobs", "candidates", "indexed", "ms")
+
+    def __init__(self, jobs: list[dict], candidates: int, indexed: list[str], ms: float):
+        self.jobs = jobs
+        self.candidates = candidates  # rows read from the indexes into the filter pipeline
+        self.indexed = indexed        # criteria answered by an index
+        self.ms = ms
+
+
+class JobArchive:
+    def __init__(self, path: Path):
+        self.path = path
+        self._db = sqlite3.connect(str(path))
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY,
+                job_id TEXT NOT NULL UNIQUE,
+                title TEXT NOT NULL,
+                company TEXT,
+                location TEXT,
+                url TEXT,
+                posted TEXT,
+                description TEXT,
+                experience_years INTEGER,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL
+            )"""
+        )
+        for column in ("company COLLATE NOCASE", "location COLLATE NOCASE", "posted", "experience_years"):
+            name = column.split()[0]
+            self._db.execute(f"CREATE INDEX IF NOT EXISTS idx_jobs_{name} ON jobs ({column})")
+        self.fts = self._create_fts()
+        self._db.commit()
+
+    def _create_fts(self) -> bool:
+        """Set up the FTS5 index; False if this SQLite lacks FTS5 or its trigram tokenizer (< 3.34)."""
+        try:
+            self._db.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5("
+                "title, description, content='jobs', content_rowid='id', tokenize='trigram')"
+            )
+        except sqlite3.OperationalError:
+            return False
+        self._db.executescript(
+            """
+            CREATE TRIGGER IF NOT EXISTS jobs_fts_insert AFTER INSERT ON jobs BEGIN
+                INSERT INTO jobs_fts (rowid, title, description) VALUES (new.id, new.title, new.description);
+            END;
+            CREATE TRIGGER IF NOT EXISTS jobs_fts_delete AFTER DELETE ON jobs BEGIN
+                INSERT INTO jobs_fts (jobs_fts, rowid, title, description)
+                VALUES ('delete', old.id, old.title, old.description);
+            END;
+            CREATE TRIGGER IF NOT EXISTS jobs_fts_update AFTER UPDATE OF title, description ON jobs
+            WHEN old.title IS NOT new.title OR old.description IS NOT new.description BEGIN
+                INSERT INTO jobs_fts (jobs_fts, rowid, title, description)
+                VALUES ('delete', old.id, old.title, old.description);
+                INSERT INTO jobs_fts (rowid, title, description) VALUES (new.id, new.title, new.description);
+            END;
+            """
+        )
+        return True
+
+    def add_many(self, jobs: Iterable[dict], when: float | None = None) -> int:
+        """Insert or refresh jobs; returns how many were new to the archive."""
+        when = time.time() if when is None else when
+        jobs = [job for job in annotate_experience(jobs) if job.get("id")]
+        before = len(self)
+        self._db.executemany(
+            f"INSERT INTO jobs ({_COLUMNS}, first_seen, last_seen) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (job_id) DO UPDATE SET title = excluded.title, company = excluded.company, "
+            "location = excluded.location, url = excluded.url, posted = excluded.posted, "
+            "description = excluded.description, experience_years = excluded.experience_years, "
+            "last_seen = excluded.last_seen",
+            (
+                (job["id"], job.get("title", ""), job.get("company"), job.get("location"), job.get("url"),
+                 job.get("posted"), job.get("description", ""), job[EXPERIENCE_KEY], when, when)
+                for job in jobs
+            ),
+        )
+        self._db.commit()
+        return len(self) - before
+
+    def query(
+        self,
+        config: dict,
+        *,
+        since: str | None = None,
+        until: str | None = None,
+        company: str | None = None,
+        location: str | None = None,
+        limit: int | None = None,
+    ) -> ArchiveQuery:
+        """Archived jobs passing ``config``'s filters, newest posting first.
+
+        Args:
+            config: A config or profile; its ``filters`` are applied as push_jobs would.
+            since / until: Inclusive ``posted`` date bounds (YYYY-MM-DD).
+            company: Exact company name, case-insensitive.
+            location: Substring of the location, case-insensitive.
+        """
+        started = time.perf_counter()
+        filters = config.get("filters", {})
+        where: list[str] = []
+        params: list = []
+        indexed: list[str] = []
+
+        keywords = [k.strip() for k in filters.get("keywords", []) if k.strip()]
+        if self.fts and keywords and all(len(k) >= _MIN_FTS_TERM for k in keywords):
+            # Substring matches are a superset of the matcher's (whole-word) matches
+            where.append("id IN (SELECT rowid FROM jobs_fts WHERE jobs_fts MATCH ?)")
+            params.append(" OR ".join('"' + k.replace('"', '""') + '"' for k in keywords))
+            indexed.append("keywords")
+        max_years = filters.get("maxExperienceYears")
+        if max_years is not None:
+            where.append("(experience_years IS NULL OR experience_years <= ?)")
+            params.append(max_years)
+            indexed.append("experience")
+        if since:
+            where.append("posted >= ?")
+            params.append(since)
+            indexed.append("since")
+        if until:
+            where.append("posted <= ?")
+            params.append(until)
+            indexed.append("until")
+        if company:
+            where.append("company = ? COLLATE NOCASE")
+            params.append(company)
+            indexed.append("company")
+        if location:
+            where.append("location LIKE ?")
+            params.append(f"%{location}%")
+
+        sql = f"SELECT {_COLUMNS} FROM jobs"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY posted DESC, id DESC"
+        rows = self._db.execute(sql, params)
+
+        pipeline = build_pipeline(config, verbose=False)
+        jobs = list(pipeline.run(map(_row_job, rows), limit))
+        return ArchiveQuery(jobs, pipeline.total, indexed, (time.perf_counter() - started) * 1000)
+
+    def iter_jobs(self, since: str | None = None) -> Iterator[dict]:
+        """Archived job records, optionally only those posted on or after ``since``."""
+        if since:
+            rows = self._db.execute(f"SELECT {_COLUMNS} FROM jobs WHERE posted >= ? ORDER BY id", (since,))
+        else:
+            rows = self._db.execute(f"SELECT {_COLUMNS} FROM jobs ORDER BY id")
+        return map(_row_job, rows)
+
+    def stats(self) -> dict:
+        count, oldest, newest = self._db.execute("SELECT COUNT(*), MIN(posted), MAX(posted) FROM jobs").fetchone()
+        return {"jobs": count, "oldest": oldest, "newest": newest, "fts": self.fts}
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def close(self):
+        self._db.close()
+
+
+def parse_date(value: str) -> str:
+    """``YYYY-MM-DD``, or ``Nd`` for N days before today, as a ``posted`` bound."""
+    if value.endswith("d") and value[:-1].isdigit():
+        return (date.today() - timedelta(days=int(value[:-1]))).isoformat()
+    return date.fromisoformat(value).isoformat()
+
+
+def open_archive(config: dict, path: Path) -> JobArchive | None:
+    """Open archive.db unless the optional ``archive.enabled`` is false."""
+    if not config.get("archive", {}).get("enabled", True):
+        return None
+    return JobArchive(path)
+
+
+def format_stats(stats: dict) -> str:
+    span = f", posted {stats['oldest']} to {stats['newest']}" if stats["jobs"] else ""
+    search = "" if stats["fts"] else " (no FTS5 in this SQLite: keyword queries scan)"
+    return f"Archive: {stats['jobs']} jobs{span}{search}"
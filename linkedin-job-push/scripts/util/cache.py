@@ -0,0 +1,275 @@
+"""Persistent caches in cache.db (SQLite).
+
+- ``DescriptionCache``: parsed job descriptions by job ID, with TTL and LRU eviction,
+  and the years of experience each one requires.
+- ``ResponseCache``: raw response bodies with their ``ETag`` / ``Last-Modified``
+  validators, so repeat requests can be made conditional and a 304 served locally.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+
+from util.experience import extract_experience_batch
+
+DEFAULT_TTL_DAYS = 30
+DEFAULT_MAX_ENTRIES = 5000
+
+
+class CachedDescription:
+    """A stored description and the experience it requires (None: not stated)."""
+
+    __slots__ = ("text", "experience_years")
+
+    def __init__(self, text: str, experience_years: int | None):
+        self.text = text
+        self.experience_years = experience_years
+
+
+class DescriptionCache:
+    """Job ID -> parsed description text, stored next to ``state.json``.
+
+    Each description is stored with its experience requirement, so it is
+    extracted once per posting. Entries older than ``ttl_days`` are treated
+    as misses. ``prune()`` drops expired entries and then the least recently
+    read ones beyond ``max_entries``. Safe to share between fetch worker threads.
+    """
+
+    def __init__(self, path: Path, ttl_days: float = DEFAULT_TTL_DAYS, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl_days * 86400
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS descriptions (
+                job_id TEXT PRIMARY KEY,
+                description TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                experience_years INTEGER
+            ) WITHOUT ROWID"""
+        )
+        columns = [row[1] for row in self._db.execute("PRAGMA table_info(descriptions)")]
+        if "experience_years" not in columns:
+            self._add_experience_column()
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_desc_accessed ON descriptions (accessed_at)")
+        self._db.commit()
+
+    def _add_experience_column(self):
+        """Upgrade a cache.db from before experience was stored, extracting it for every entry."""
+        self._db.execute("ALTER TABLE descriptions ADD COLUMN experience_years INTEGER")
+        rows = self._db.execute("SELECT job_id, description FROM descriptions").fetchall()
+        years = extract_experience_batch([description for _, description in rows])
+        self._db.executemany(
+            "UPDATE descriptions SET experience_years = ? WHERE job_id = ?",
+            ((required, job_id) for (job_id, _), required in zip(rows, years)),
+        )
+
+    def get(self, job_id: str) -> CachedDescription | None:
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT description, fetched_at, experience_years FROM descriptions WHERE job_id = ?", (job_id,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                self.misses += 1
+                return None
+            self._db.execute("UPDATE descriptions SET accessed_at = ? WHERE job_id = ?", (now, job_id))
+            self.hits += 1
+            return CachedDescription(row[0], row[2])
+
+    def put(self, job_id: str, description: str, experience_years: int | None):
+        if not description:
+            return  # failed fetches are retried next run
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO descriptions "
+                "(job_id, description, fetched_at, accessed_at, experience_years) VALUES (?, ?, ?, ?, ?)",
+                (job_id, description, now, now, experience_years),
+            )
+            self._db.commit()
+
+    def prune(self):
+        """Drop expired entries, then evict least recently used beyond max_entries."""
+        with self._lock:
+            self._db.execute("DELETE FROM descriptions WHERE fetched_at < ?", (time.time() - self.ttl,))
+            self._db.execute(
+                "DELETE FROM descriptions WHERE job_id IN ("
+                "  SELECT job_id FROM descriptions ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self._db.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM descriptions").fetchone()[0]
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self),
+        }
+
+    def close(self):
+        with self._lock:
+            self._db.commit()
+            self._db.close()
+
+
+class CachedResponse:
+    """A stored response body and the validators to revalidate it with."""
+
+    __slots__ = ("body", "etag", "last_modified")
+
+    def __init__(self, body: str, etag: str | None, last_modified: str | None):
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+
+    def conditional_headers(self) -> dict:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """URL -> last response body plus validators, stored zlib-compressed.
+
+    Only responses carrying an ``ETag`` or ``Last-Modified`` header are kept,
+    and ``prune()`` evicts the least recently used beyond ``max_entries``.
+    Safe to share between fetch worker threads.
+    """
+
+    def __init__(self, path: Path, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.conditional = 0      # requests sent with validators
+        self.not_modified = 0     # of those, answered 304
+        self.bytes_saved = 0      # body bytes served locally instead of re-downloaded
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                accessed_at REAL NOT NULL
+            ) WITHOUT ROWID"""
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_resp_accessed ON responses (accessed_at)")
+        self._db.commit()
+
+    def get(self, url: str) -> CachedResponse | None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT body, etag, last_modified FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        return CachedResponse(zlib.decompress(row[0]).decode("utf-8"), row[1], row[2])
+
+    def put(self, url: str, body: str, etag: str | None, last_modified: str | None):
+        if not (etag or last_modified):
+            return  # nothing to revalidate with
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (url, body, etag, last_modified, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (url, zlib.compress(body.encode("utf-8")), etag, last_modified, time.time()),
+            )
+            self._db.commit()
+
+    def record(self, url: str, cached: CachedResponse, not_modified: bool):
+        """Count one conditional request; a 304 also marks the entry as used."""
+        with self._lock:
+            self.conditional += 1
+            if not_modified:
+                self.not_modified += 1
+                self.bytes_saved += len(cached.body.encode("utf-8"))
+                self._db.execute("UPDATE responses SET accessed_at = ? WHERE url = ?", (time.time(), url))
+                self._db.commit()
+
+    def reset_stats(self):
+        with self._lock:
+            self.conditional = 0
+            self.not_modified = 0
+            self.bytes_saved = 0
+
+    def prune(self):
+        """Evict least recently used responses beyond max_entries."""
+        with self._lock:
+            self._db.execute(
+                "DELETE FROM responses WHERE url IN ("
+                "  SELECT url FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self._db.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return {
+            "conditional": self.conditional,
+            "not_modified": self.not_modified,
+            "bytes_saved": self.bytes_saved,
+            "entries": entries,
+        }
+
+    def close(self):
+        with self._lock:
+            self._db.commit()
+            self._db.close()
+
+
+def open_description_cache(config: dict, path: Path) -> DescriptionCache | None:
+    """Open the cache described by the optional ``cache`` config block, or None if disabled."""
+    cache_cfg = config.get("cache", {})
+    if not cache_cfg.get("enabled", True):
+        return None
+    return DescriptionCache(
+        path,
+        ttl_days=cache_cfg.get("ttlDays", DEFAULT_TTL_DAYS),
+        max_entries=cache_cfg.get("maxEntries", DEFAULT_MAX_ENTRIES),
+    )
+
+
+def open_response_cache(config: dict, path: Path) -> ResponseCache | None:
+    """Open the validator cache unless ``cache.enabled`` or ``cache.conditional`` is false."""
+    cache_cfg = config.get("cache", {})
+    if not cache_cfg.get("enabled", True) or not cache_cfg.get("conditional", True):
+        return None
+    return ResponseCache(path, max_entries=cache_cfg.get("maxEntries", DEFAULT_MAX_ENTRIES))
+
+
+def format_stats(stats: dict) -> str:
+    return (
+        f"Description cache: {stats['hits']} hits, {stats['misses']} misses "
+        f"({stats['hit_rate']:.0%} hit rate), {stats['entries']} entries"
+    )
+
+
+def format_response_stats(stats: dict) -> str:
+    saved_kb = stats["bytes_saved"] / 1024
+    return (
+        f"Conditional requests: {stats['conditional']} sent, {stats['not_modified']} not modified "
+        f"({saved_kb:.1f} KB served locally), {stats['entries']} stored"
+    )
@@ -0,0 +1,123 @@
+"""Years-of-experience requirements in job postings.
+
+Extraction runs in two stages. A plain substring check for "year"/"yr"
+rejects most text without touching the regex engine; otherwise each
+"year(s)"/"yr(s)" token is located and only the few characters before it
+are parsed for a number, a word number or a range. A range such as
+"3-5 years" requires its lower bound. The strictest requirement in a
+posting wins ("5+ years of Python, 2 years of AWS" requires 5).
+
+Fetching stores the result in the job record (``experienceYears``) and in
+cache.db, so each posting is parsed once.
+"""
+
+from __future__ import annotations
+
+import bisect
+import re
+from typing import Iterable, Sequence
+
+EXPERIENCE_KEY = "experienceYears"
+
+# Map English number words to integers
+_WORD_TO_NUM = {
+    "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7,
+    "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12,
+    "thirteen": 13, "fourteen": 14, "fifteen": 15, "sixteen": 16,
+    "seventeen": 17, "eighteen": 18, "nineteen": 19, "twenty": 20,
+}
+
+# Characters before a unit token that may hold its number ("twelve to fifteen ")
+_WINDOW = 32
+
+# Stage 2a: the unit tokens, in lower-cased text
+_UNIT_RE = re.compile(r"(?:years?|yrs?)\b")
+
+_NUM = r"(\d{1,2}|" + "|".join(_WORD_TO_NUM) + r")"
+
+# Stage 2b: the number (or range) directly before a unit token:
+# "3 years" / "5+ years" / "8 yrs" / "3-5 years" / "4 to 7 years" / "five plus years"
+_BEFORE_UNIT_RE = re.compile(rf"(?:\b{_NUM}\s*(?:-|–|—|to)\s*)?\b{_NUM}\s*(?:\+|plus)?\s*\Z")
+
+
+def _number(token: str) -> int:
+    return int(token) if token.isdigit() else _WORD_TO_NUM[token]
+
+
+def _requirement(lower: str, unit: int, floor: int) -> int | None:
+    """Years stated right before the unit token at ``unit``, not looking before ``floor``."""
+    m = _BEFORE_UNIT_RE.search(lower, max(floor, unit - _WINDOW), unit)
+    if m is None:
+        return None
+    return _number(m.group(1) or m.group(2))  # a range requires its lower bound
+
+
+def _strictest(current: int | None, years: int | None) -> int | None:
+    if years is None:
+        return current
+    return years if current is None or years > current else current
+
+
+def extract_min_experience_years(text: str) -> int | None:
+    """Extract the minimum years of experience required from text.
+
+    Each mention counts with its lower bound; returns the highest of those,
+    or None if no experience requirement is mentioned.
+    """
+    if not text:
+        return None
+    lower = text.lower()
+    if "yr" not in lower and "year" not in lower:
+        return None
+
+    required = None
+    for unit in _UNIT_RE.finditer(lower):
+        required = _strictest(required, _requirement(lower, unit.start(), 0))
+    return required
+
+
+def extract_experience_batch(texts: Sequence[str]) -> list[int | None]:
+    """``extract_min_experience_years`` for many texts in one regex pass.
+
+    The texts are joined and scanned once; each unit token is mapped back to
+    its text, so per-text overhead is a lookup rather than a scan.
+    """
+    lowered = [text.lower() for text in texts]  # lower() may change a text's length
+    results: list[int | None] = [None] * len(texts)
+    starts = []
+    offset = 0
+    for text in lowered:
+        starts.append(offset)
+        offset += len(text) + 1
+    lower = "\x00".join(lowered)  # a separator that no number or unit can span
+
+    for unit in _UNIT_RE.finditer(lower):
+        index = bisect.bisect_right(starts, unit.start()) - 1
+        years = _requirement(lower, unit.start(), starts[index])
+        results[index] = _strictest(results[index], years)
+    return results
+
+
+def _job_text(job: dict) -> str:
+    return f"{job.get('title', '')} {job.get('description', '')}"
+
+
+def experience_years(job: dict) -> int | None:
+    """The job's ``experienceYears``, extracted and stored in the record if missing."""
+    if EXPERIENCE_KEY not in job:
+        job[EXPERIENCE_KEY] = extract_min_experience_years(_job_text(job))
+    return job[EXPERIENCE_KEY]
+
+
+def annotate_experience(jobs: Iterable[dict]) -> list[dict]:
+    """Batch mode: fill in ``experienceYears`` for the jobs that lack it."""
+    jobs = list(jobs)
+    missing = [job for job in jobs if EXPERIENCE_KEY not in job]
+    for job, years in zip(missing, extract_experience_batch([_job_text(job) for job in missing])):
+        job[EXPERIENCE_KEY] = years
+    return jobs
+
+
+def job_experience_years(title: str, description_years: int | None) -> int | None:
+    """Combine a title with the (cached) requirement of its description."""
+    return _strictest(extract_min_experience_years(title), description_years)
@@ -1,107 +1,35 @@
-"""Job filtering and deduplication logic."""
+"""Job filtering, deduplication and relevance ranking logic."""
 
 from __future__ import annotations
 
-import re
-
-# Map English number words to integers
-_WORD_TO_NUM = {
-    "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7,
-    "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12,
-    "thirteen": 13, "fourteen": 14, "fifteen": 15, "sixteen": 16,
-    "seventeen": 17, "eighteen": 18, "nineteen": 19, "twenty": 20,
-}
-
-# Regex to extract years-of-experience mentions from job text
-_EXPER_RE = re.compile(
-    r"""(
-        # "3 years" / "5+ years" / "8 yrs" / "7-10 years"
-        \b(\d+)\s*(\+|plus)?\s*(?:years?|yrs?)\b
-        |
-        # "3-5 years" / "4 – 7 years"
-        \b(\d+)\s*[-–]\s*(\d+)\s*(?:years?|yrs?)\b
-        |
-        # "minimum 3 years" / "at least 5 years"
-        \b(?:minimum|min\.?|at\s*least|at\s*min\.?)\s*(\d+)\s*(?:years?|yrs?)\b
-        |
-        # English words: "three years" / "five+ years"
-        \b(three|four|five|six|seven|eight|nine|ten|
-           eleven|twelve|thirteen|fourteen|fifteen|
-           sixteen|seventeen|eighteen|nineteen|twenty)
-        \s*(\+|plus)?\s*(?:years?|yrs?)\b
-    )""",
-    re.IGNORECASE | re.VERBOSE,
-)
-
-
-def extract_min_experience_years(text: str) -> int | None:
-    """Extract the minimum years of experience required from text.
-
-    Returns the highest number found across all matches, or None if
-    no experience requirement is mentioned.
-    """
-    if not text:
-        return None
-
-    max_years = None
-    for m in _EXPER_RE.finditer(text):
-        if m.group(2):
-            years = int(m.group(2))
-        elif m.group(4) and m.group(5):
-            years = int(m.group(5))
-        elif m.group(6):
-            years = int(m.group(6))
-        elif m.group(7):
-            years = _WORD_TO_NUM.get(m.group(7).lower(), 0)
-        else:
-            continue
+import heapq
+import itertools
+import math
+import time
+from datetime import date
+from typing import TYPE_CHECKING, Callable, Container, Generic, Iterable, Iterator, TypeVar
 
-        if max_years is None or years > max_years:
-            max_years = years
+from util.experience import annotate_experience, experience_years
+from util.experience import extract_min_experience_years  # noqa: F401 - re-exported
+from util.matcher import get_matcher
 
-    return max_years
+if TYPE_CHECKING:
+    from util.neardup import NearDupIndex
 
 
 def filter_by_keywords(jobs: list[dict], config: dict) -> list[dict]:
     """Keep only jobs whose title or description contains at least one keyword."""
-    keywords = [k.lower() for k in config.get("filters", {}).get("keywords", [])]
-    if not keywords:
+    matcher = get_matcher(config)
+    if not matcher.has_include:
         return jobs
 
-    filtered = []
-    for job in jobs:
-        text = f"{job.get('title', '')} {job.get('description', '')}".lower()
-        if any(kw in text for kw in keywords):
-            filtered.append(job)
-    return filtered
+    return [job for job in jobs if matcher.scan(job).include]
 
 
 def filter_by_location(jobs: list[dict], config: dict) -> list[dict]:
-    """Apply location-based exclusion filters."""
-    filters = config.get("filters", {})
-    exclude_provinces = [p.lower() for p in filters.get("excludeProvinces", [])]
-    exclude_keywords = [k.lower() for k in filters.get("excludeLocationKeywords", [])]
-
-    filtered = []
-    for job in jobs:
-        location = job.get("location", "").lower()
-
-        excluded = False
-        for prov in exclude_provinces:
-            if prov in location:
-                excluded = True
-                break
-
-        if not excluded:
-            for kw in exclude_keywords:
-                if kw in location:
-                    excluded = True
-                    break
-
-        if not excluded:
-            filtered.append(job)
-
-    return filtered
+    """Apply location-based exclusion filters (excludeProvinces + excludeLocationKeywords)."""
+    matcher = get_matcher(config)
+    return [job for job in jobs if not matcher.scan(job).location]
 
 
 def filter_by_experience(jobs: list[dict], max_years: int | None) -> list[dict]:
@@ -113,9 +41,8 @@ def filter_by_experience(jobs: list[dict], max_years: int | None) -> list[dict]:
         return jobs
 
     filtered = []
-    for job in jobs:
-        text = f"{job.get('title', '')} {job.get('description', '')}"
-        required = extract_min_experience_years(text)
+    for job in annotate_experience(jobs):
+        required = experience_years(job)
         if required is not None and required > max_years:
             print(f"  Excluded (requires {required}yr): {job['title'][:60]}")
             continue
@@ -130,18 +57,14 @@ def filter_by_exclude_keywords(jobs: list[dict], config: dict, *, title_only: bo
         title_only: If True, only check the job title (used at card-parse time
                     before descriptions are fetched). If False, check title+description.
     """
-    exclude_kws = [k.lower() for k in config.get("filters", {}).get("excludeKeyWords", [])]
-    if not exclude_kws:
+    if not config.get("filters", {}).get("excludeKeyWords"):
         return jobs
 
+    matcher = get_matcher(config)
     filtered = []
     for job in jobs:
-        if title_only:
-            text = job.get("title", "").lower()
-        else:
-            text = f"{job.get('title', '')} {job.get('description', '')}".lower()
-
-        matched = next((kw for kw in exclude_kws if kw in text), None)
+        result = matcher.scan(job)
+        matched = result.exclude_title if title_only else result.exclude
         if matched:
             print(f"  Excluded (keyword '{matched}'): {job['title'][:60]}")
             continue
@@ -149,7 +72,303 @@ def filter_by_exclude_keywords(jobs: list[dict], config: dict, *, title_only: bo
     return filtered
 
 
-def deduplicate(jobs: list[dict], state: dict) -> list[dict]:
-    """Remove jobs that have already been sent."""
-    seen = set(state.get("seen_job_ids", []))
+def deduplicate(jobs: list[dict], seen: Container[str]) -> list[dict]:
+    """Remove jobs that have already been sent (``seen`` is a set or SeenStore)."""
     return [j for j in jobs if j["id"] not in seen]
+
+
+class FilterStage:
+    """One pipeline step: ``check(job)`` returns a drop reason, or None to keep the job."""
+
+    def __init__(self, name: str, check: Callable[[dict], str | None], *, verbose: bool = False):
+        self.name = name
+        self.check = check
+        self.verbose = verbose
+        self.seen = 0
+        self.dropped = 0
+        self.seconds = 0.0
+
+    def apply(self, jobs: Iterable[dict]) -> Iterator[dict]:
+        check = self.check
+        for job in jobs:
+            self.seen += 1
+            started = time.perf_counter()
+            reason = check(job)
+            self.seconds += time.perf_counter() - started
+            if reason:
+                self.dropped += 1
+                if self.verbose:
+                    print(f"  Excluded ({reason}): {job['title'][:60]}")
+                continue
+            yield job
+
+
+class FilterPipeline:
+    """Lazily chains filter stages; each job stops at the first stage that drops it."""
+
+    def __init__(self, stages: list[FilterStage]):
+        self.stages = stages
+        self.total = 0
+
+    def _count(self, jobs: Iterable[dict]) -> Iterator[dict]:
+        for job in jobs:
+            self.total += 1
+            yield job
+
+    def run(self, jobs: Iterable[dict], limit: int | None = None) -> Iterator[dict]:
+        """Yield jobs passing every stage, stopping after ``limit`` if given."""
+        stream = self._count(jobs)
+        for stage in self.stages:
+            stream = stage.apply(stream)
+        return itertools.islice(stream, limit)
+
+    def explain(self, job: dict) -> tuple[FilterStage, str] | None:
+        """Run one job through the stages: the stage that drops it and why, or None if kept."""
+        self.total += 1
+        for stage in self.stages:
+            stage.seen += 1
+            started = time.perf_counter()
+            reason = stage.check(job)
+            stage.seconds += time.perf_counter() - started
+            if reason:
+                stage.dropped += 1
+                return stage, reason
+        return None
+
+    def stats(self) -> list[dict]:
+        return [
+            {"stage": s.name, "in": s.seen, "dropped": s.dropped, "ms": s.seconds * 1000}
+            for s in self.stages
+        ]
+
+    def format_stats(self) -> str:
+        lines = [f"Filter pipeline ({self.total} jobs in):"]
+        remaining = self.total
+        for s in self.stages:
+            remaining -= s.dropped
+            lines.append(
+                f"  {s.name:<18} dropped {s.dropped:>5}, {remaining:>5} remain  ({s.seconds * 1000:.1f} ms)")
+        return "\n".join(lines)
+
+
+def build_pipeline(config: dict, seen: Container[str] | None = None, *, near_dups: NearDupIndex | None = None,
+                   verbose: bool = True) -> FilterPipeline:
+    """Build the push-stage filters for a config, cheapest stages first.
+
+    Dedup is a set lookup; location, exclude and keyword stages share a single
+    matcher scan per job; the experience check runs on what is left, and
+    reads ``experienceYears`` from the job record when fetching stored it.
+    With ``near_dups``, a last stage drops jobs too similar to one already
+    sent or kept earlier in the run (reposts and agency copies).
+    ``verbose=False`` stops the exclude, experience and near-duplicate stages
+    printing each drop.
+    """
+    filters = config.get("filters", {})
+    matcher = get_matcher(config)
+    max_years = filters.get("maxExperienceYears")
+
+    def check_dedup(job: dict) -> str | None:
+        return "already sent" if job["id"] in seen else None
+
+    def check_location(job: dict) -> str | None:
+        matched = matcher.scan(job).location
+        return f"location '{matched}'" if matched else None
+
+    def check_exclude(job: dict) -> str | None:
+        matched = matcher.scan(job).exclude
+        return f"keyword '{matched}'" if matched else None
+
+    def check_keywords(job: dict) -> str | None:
+        return None if matcher.scan(job).include else "no keyword"
+
+    def check_experience(job: dict) -> str | None:
+        required = experience_years(job)
+        if required is not None and required > max_years:
+            return f"requires {required}yr"
+        return None
+
+    def check_near_dup(job: dict) -> str | None:
+        duplicate = near_dups.check(job)
+        if duplicate is None:
+            return None
+        return f"near-duplicate of '{(duplicate.title or duplicate.job_id)[:40]}', {duplicate.similarity:.0%}"
+
+    stages = []
+    if seen is not None:
+        stages.append(FilterStage("dedup", check_dedup))
+    stages.append(FilterStage("location", check_location))
+    if filters.get("excludeKeyWords"):
+        stages.append(FilterStage("exclude-keyword", check_exclude, verbose=verbose))
+    if matcher.has_include:
+        stages.append(FilterStage("keyword", check_keywords))
+    if max_years is not None:
+        stages.append(FilterStage(f"experience (≤{max_years}yr)", check_experience, verbose=verbose))
+    if near_dups is not None:
+        stages.append(FilterStage("near-duplicate", check_near_dup, verbose=verbose))
+    return FilterPipeline(stages)
+
+
+DEFAULT_TITLE_WEIGHT = 3.0
+DEFAULT_RECENCY_WEIGHT = 1.0
+DEFAULT_RECENCY_HALF_LIFE_DAYS = 7.0
+DEFAULT_EXPERIENCE_WEIGHT = 0.5
+
+# Jobs kept for the final ranking, per job to send: scores depend on keyword
+# frequencies across every job, so a few more than maxSend are re-ranked
+# once all have been seen
+RANK_POOL_FACTOR = 4
+
+T = TypeVar("T")
+
+
+def _posted_date(job: dict) -> date | None:
+    try:
+        return date.fromisoformat((job.get("posted") or "")[:10])
+    except ValueError:
+        return None
+
+
+class JobScorer:
+    """Relevance of a job: TF-IDF weighted keyword hits, recency and experience fit.
+
+    ``score = Σ tf·idf / len(keywords) + recencyWeight · recency + experienceWeight · fit``
+
+    - tf of a keyword: ``1 + ln(titleWeight · title hits + description hits)``
+    - idf: ``1 + ln((1 + jobs) / (1 + jobs mentioning it))`` over the jobs
+      ``observe()``d so far, so keywords most postings mention count for less
+    - recency: ``0.5 ^ (days since posted / recencyHalfLifeDays)``, 0 if unknown
+    - fit: 1 for a stated requirement of exactly ``maxExperienceYears``, down
+      to 0.5 for none at all; 0 for every job without ``maxExperienceYears``
+    """
+
+    def __init__(self, config: dict, *, today: date | None = None, use_experience: bool = True):
+        ranking = config.get("ranking", {})
+        filters = config.get("filters", {})
+        self.matcher = get_matcher(config)
+        self.keyword_count = max(1, len(filters.get("keywords", [])))
+        self.title_weight = ranking.get("titleWeight", DEFAULT_TITLE_WEIGHT)
+        self.recency_weight = ranking.get("recencyWeight", DEFAULT_RECENCY_WEIGHT)
+        self.half_life = ranking.get("recencyHalfLifeDays", DEFAULT_RECENCY_HALF_LIFE_DAYS)
+        self.experience_weight = ranking.get("experienceWeight", DEFAULT_EXPERIENCE_WEIGHT) if use_experience else 0
+        self.max_years = filters.get("maxExperienceYears")
+        self.today = today or date.today()
+        self.jobs = 0
+        self.df: dict[str, int] = {}
+
+    def term_frequencies(self, job: dict) -> dict[str, float]:
+        """Sublinear, title-weighted frequency of each keyword the job mentions.
+
+        With ``titleWeight`` 0, a keyword found only in the title does not count.
+        """
+        tf = {}
+        for term, (title, description) in self.matcher.include_hits(job).items():
+            count = self.title_weight * title + description
+            if count > 0:
+                tf[term] = 1 + math.log(count)
+        return tf
+
+    def observe(self, tf: dict[str, float]):
+        """Count one job's keywords towards the document frequencies."""
+        self.jobs += 1
+        for term in tf:
+            self.df[term] = self.df.get(term, 0) + 1
+
+    def keyword_score(self, tf: dict[str, float]) -> float:
+        jobs, df = self.jobs, self.df
+        return sum(weight * (1 + math.log((1 + jobs) / (1 + df.get(term, 0))))
+                   for term, weight in tf.items()) / self.keyword_count
+
+    def prior(self, job: dict) -> float:
+        """The keyword-independent part of the score: recency and experience fit."""
+        score = 0.0
+        posted = _posted_date(job)
+        if posted is not None and self.recency_weight:
+            score += self.recency_weight * 0.5 ** (max(0, (self.today - posted).days) / self.half_life)
+        if self.max_years is not None and self.experience_weight:
+            required = experience_years(job)
+            fit = 0.5 if required is None else 1 - max(0, self.max_years - required) / (2 * max(1, self.max_years))
+            score += self.experience_weight * fit
+        return score
+
+
+class TopK(Generic[T]):
+    """Keeps the ``k`` highest-scoring items of a stream in a min-heap.
+
+    Ties keep the item offered first, so equal scores stay in input order.
+    """
+
+    def __init__(self, k: int):
+        self.k = k
+        self._heap: list[tuple[float, int, T]] = []
+        self._offered = 0
+
+    def offer(self, score: float, item: T):
+        self._offered += 1
+        entry = (score, -self._offered, item)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry > self._heap[0]:
+            heapq.heapreplace(self._heap, entry)
+
+    def items(self) -> list[T]:
+        """The kept items, highest score first."""
+        return [item for _, _, item in sorted(self._heap, reverse=True)]
+
+
+class JobRanker(Generic[T]):
+    """Streams jobs in and returns the ``k`` most relevant, holding at most ``pool`` of them.
+
+    Each offered job is scored against the keyword frequencies seen so far and
+    kept in a bounded heap; ``top()`` re-scores the kept jobs with the final
+    frequencies and returns the best ``k``. ``record`` turns a job into what
+    is kept (e.g. a compact ``JobRecord``).
+    """
+
+    def __init__(self, scorer: JobScorer, k: int, record: Callable[[dict], T], pool: int | None = None):
+        self.scorer = scorer
+        self.k = k
+        self.record = record
+        self._pool: TopK[tuple[dict[str, float], float, T]] = TopK(pool if pool is not None else k * RANK_POOL_FACTOR)
+        self.seconds = 0.0
+
+    def offer(self, job: dict):
+        started = time.perf_counter()
+        scorer = self.scorer
+        tf = scorer.term_frequencies(job)
+        scorer.observe(tf)
+        prior = scorer.prior(job)
+        self._pool.offer(scorer.keyword_score(tf) + prior, (tf, prior, self.record(job)))
+        self.seconds += time.perf_counter() - started
+
+    def top(self) -> list[T]:
+        """The ``k`` best jobs by their final scores, best first."""
+        started = time.perf_counter()
+        scorer = self.scorer
+        final = TopK(self.k)
+        for tf, prior, item in self._pool.items():
+            final.offer(scorer.keyword_score(tf) + prior, item)
+        self.seconds += time.perf_counter() - started
+        return final.items()
+
+
+def build_scorer(config: dict, **kwargs) -> JobScorer | None:
+    """The config's ``JobScorer``, or None when ``ranking.enabled`` is false (send in input order)."""
+    if not config.get("ranking", {}).get("enabled", True):
+        return None
+    return JobScorer(config, **kwargs)
+
+
+def rank_cards(config: dict, cards: list[dict], k: int, *, today: date | None = None) -> list[dict]:
+    """The ``k`` most promising search cards by title keywords and recency.
+
+    Cards have no description yet, so this scores titles only; keyword
+    frequencies come from all of ``cards``.
+    """
+    scorer = JobScorer(config, today=today, use_experience=False)
+    frequencies = [scorer.term_frequencies(card) for card in cards]
+    for tf in frequencies:
+        scorer.observe(tf)
+    top = TopK(k)
+    for card, tf in zip(cards, frequencies):
+        top.offer(scorer.keyword_score(tf) + scorer.prior(card), card)
+    return top.items()
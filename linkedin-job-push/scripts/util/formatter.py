@@ -3,35 +3,74 @@
 from __future__ import annotations
 
 from datetime import datetime
+from typing import TYPE_CHECKING
 
 import pytz
 
+if TYPE_CHECKING:
+    from util.jobio import JobRecord
 
-def format_telegram_message(jobs: list[dict], keyword_str: str) -> str:
-    """Format jobs into a Telegram-friendly message (HTML parse mode)."""
+
+def _header(job_count: int, keyword_str: str) -> str:
     tz = pytz.timezone("America/Toronto")
     now = datetime.now(tz).strftime("%Y-%m-%d %H:%M %Z")
     lines = [
         "<b>LinkedIn Jobs Daily Push</b>",
         f"<i>{now}</i>",
         f"Keywords: {keyword_str}",
-        f"New jobs found: {len(jobs)}",
+        f"New jobs found: {job_count}",
         "",
     ]
+    return "\n".join(lines)
+
+
+def _job_entry(i: int, job: JobRecord) -> str:
+    lines = [
+        f"{i}. <a href=\"{job.url}\">{job.title}</a>\n"
+        f"   {job.company} | {job.location}"
+    ]
+    if job.posted:
+        lines.append(f"   Posted: {job.posted}")
+    lines.append("")
+    return "\n".join(lines)
 
-    for i, job in enumerate(jobs, 1):
-        lines.append(
-            f"{i}. <a href=\"{job['url']}\">{job['title']}</a>\n"
-            f"   {job['company']} | {job['location']}"
-        )
-        if job.get("posted"):
-            lines.append(f"   Posted: {job['posted']}")
-        lines.append("")
 
+def format_telegram_message(jobs: list[JobRecord], keyword_str: str) -> str:
+    """Format jobs into a Telegram-friendly message (HTML parse mode)."""
+    parts = [_header(len(jobs), keyword_str)]
+    parts += [_job_entry(i, job) for i, job in enumerate(jobs, 1)]
     if not jobs:
-        lines.append("No new jobs matching your filters today.")
+        parts.append("No new jobs matching your filters today.")
+    return "\n".join(parts)
 
-    return "\n".join(lines)
+
+def format_telegram_chunks(jobs: list[JobRecord], keyword_str: str, max_len: int = 4096) -> list[tuple[str, list[str]]]:
+    """Format jobs like ``format_telegram_message``, split only between jobs.
+
+    Returns ``(text, job IDs in text)`` pairs, so delivery can be tracked per job.
+    """
+    parts = [(_header(len(jobs), keyword_str), None)]
+    parts += [(_job_entry(i, job), job.id) for i, job in enumerate(jobs, 1)]
+    if not jobs:
+        parts.append(("No new jobs matching your filters today.", None))
+
+    chunks: list[tuple[str, list[str]]] = []
+    text, ids = "", []
+    for part, job_id in parts:
+        if text and len(text) + len(part) + 1 > max_len:
+            chunks.append((text, ids))
+            text, ids = "", []
+        text = f"{text}\n{part}" if text else part
+        if job_id is not None:
+            ids.append(job_id)
+    chunks.append((text, ids))
+
+    # A single entry longer than the limit still has to be cut up
+    fitted = []
+    for text, ids in chunks:
+        pieces = split_message(text, max_len)
+        fitted += [(piece, ids if n == len(pieces) - 1 else []) for n, piece in enumerate(pieces)]
+    return fitted
 
 
 def split_message(text: str, max_len: int = 4096) -> list[str]:
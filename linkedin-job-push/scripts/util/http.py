@@ -0,0 +1,212 @@
+"""Shared, pooled HTTP client used for LinkedIn and Telegram requests."""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+import urllib.parse
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_PER_HOST_LIMIT = 4
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 1.0
+
+# Content encodings urllib3 can decode in this environment: gzip and deflate
+# always, br only with the brotli package installed, zstd with zstandard
+DECODABLE_ENCODINGS = frozenset(e.strip() for e in ACCEPT_ENCODING.split(","))
+
+
+class HttpClient:
+    """A keep-alive ``requests.Session`` with bounded per-host concurrency.
+
+    Args:
+        pool_size: Idle connections kept open per host for reuse.
+        per_host_limit: Max requests in flight to one host at a time.
+        retries: Retries on connection errors. Throttling responses (429, 5xx)
+                 are left to the caller so it can back off its own rate limiter.
+        backoff: urllib3 backoff factor between those retries.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        per_host_limit: int = DEFAULT_PER_HOST_LIMIT,
+        retries: int = DEFAULT_RETRIES,
+        backoff: float = DEFAULT_BACKOFF,
+    ):
+        self.per_host_limit = max(1, per_host_limit)
+        self._host_slots: dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+        self.wire_bytes = 0
+        self.decoded_bytes = 0
+        self.encodings: dict[str, int] = {}
+        self._baseline = (0, 0)
+
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=0,
+            respect_retry_after_header=False,
+            backoff_factor=backoff,
+            raise_on_status=False,
+        )
+        self._adapter = HTTPAdapter(
+            pool_connections=DEFAULT_POOL_SIZE,
+            pool_maxsize=max(1, pool_size),
+            pool_block=True,
+            max_retries=retry,
+        )
+        self.session = requests.Session()
+        self.session.mount("https://", self._adapter)
+        self.session.mount("http://", self._adapter)
+
+    def _slot(self, url: str) -> threading.BoundedSemaphore:
+        host = urllib.parse.urlsplit(url).netloc
+        with self._lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = self._host_slots[host] = threading.BoundedSemaphore(self.per_host_limit)
+            return slot
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        with self._slot(url):
+            resp = self.session.request(method, url, **kwargs)
+        self._count_bytes(resp)
+        return resp
+
+    def _count_bytes(self, resp: requests.Response):
+        encoding = resp.headers.get("Content-Encoding", "identity").lower()
+        if encoding != "identity" and encoding not in DECODABLE_ENCODINGS:
+            print(f"Warning: {resp.url} was sent with Content-Encoding {encoding}, "
+                  "which cannot be decoded here", file=sys.stderr)
+        decoded = len(resp.content)
+        try:
+            wire = resp.raw.tell()  # bytes read off the socket, before decoding
+        except AttributeError:
+            wire = decoded
+        with self._lock:
+            self.wire_bytes += wire
+            self.decoded_bytes += decoded
+            self.encodings[encoding] = self.encodings.get(encoding, 0) + 1
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def _pool_counts(self) -> tuple[int, int]:
+        pools = self._adapter.poolmanager.pools
+        sent = opened = 0
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is not None:
+                sent += pool.num_requests
+                opened += pool.num_connections
+        return sent, opened
+
+    def reset_stats(self):
+        """Start counting afresh; connections kept open from before count as reused."""
+        with self._lock:
+            self._baseline = self._pool_counts()
+            self.wire_bytes = 0
+            self.decoded_bytes = 0
+            self.encodings = {}
+
+    def stats(self) -> dict:
+        """Requests sent, TCP/TLS connections opened, and how many requests reused one."""
+        sent, opened = self._pool_counts()
+        with self._lock:
+            sent -= self._baseline[0]
+            opened -= self._baseline[1]
+            return {
+                "requests": sent,
+                "connections": opened,
+                "reused": max(0, sent - opened),
+                "wire_bytes": self.wire_bytes,
+                "decoded_bytes": self.decoded_bytes,
+                "encodings": dict(self.encodings),
+            }
+
+    def close(self):
+        self.session.close()
+
+
+def retry_after(resp: requests.Response) -> float | None:
+    """Seconds to wait from a ``Retry-After`` header (delta-seconds or HTTP date)."""
+    value = resp.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+_client: HttpClient | None = None
+_client_settings: dict | None = None
+
+
+def configure_client(config: dict) -> HttpClient:
+    """(Re)create the shared client from the optional ``http`` config block.
+
+    An existing client with the same settings is kept, so a long-running
+    process reuses its warm connections across runs.
+    """
+    global _client, _client_settings
+    http_cfg = config.get("http", {})
+    settings = {
+        "pool_size": http_cfg.get("poolSize", DEFAULT_POOL_SIZE),
+        "per_host_limit": http_cfg.get("perHostLimit", DEFAULT_PER_HOST_LIMIT),
+        "retries": http_cfg.get("retries", DEFAULT_RETRIES),
+        "backoff": http_cfg.get("retryBackoff", DEFAULT_BACKOFF),
+    }
+    if _client is not None:
+        if settings == _client_settings:
+            return _client
+        _client.close()
+    _client = HttpClient(**settings)
+    _client_settings = settings
+    return _client
+
+
+def get_client() -> HttpClient:
+    """Return the shared client, creating one with defaults on first use."""
+    global _client
+    if _client is None:
+        _client = HttpClient()
+    return _client
+
+
+def format_bytes(n: float) -> str:
+    for unit in ("B", "KB", "MB"):
+        if n < 1024:
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GB"
+
+
+def format_stats(stats: dict) -> str:
+    line = (
+        f"HTTP: {stats['requests']} requests over {stats['connections']} connections "
+        f"({stats['reused']} reused)"
+    )
+    if stats.get("decoded_bytes"):
+        encodings = ", ".join(f"{name} x{n}" for name, n in sorted(stats["encodings"].items()))
+        line += (
+            f"; {format_bytes(stats['wire_bytes'])} on the wire, "
+            f"{format_bytes(stats['decoded_bytes'])} decoded ({encodings})"
+        )
+    return line
@@ -0,0 +1,166 @@
+"""Reading and writing job files: jobs.json arrays and streaming jobs.jsonl.
+
+Both formats are read one job at a time, so memory use does not grow with
+the file. The JSON Lines format holds one finished job (with description)
+per line. Lines whose only key starts with ``_`` are fetch checkpoints, so
+an interrupted run can be resumed:
+
+  {"_page": {"search": "...", "next_start": 30, "cards": [...]}}   search page processed
+  {"_search_done": "..."}                                          search needs no more pages
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from pathlib import Path
+from typing import IO, Iterator
+
+_CHUNK_SIZE = 64 * 1024
+_SEPARATORS = re.compile(r"[\s,]*")
+_decoder = json.JSONDecoder()
+
+
+class JobRecord:
+    """A job kept for sending: what its message needs, without the description."""
+
+    __slots__ = ("id", "title", "company", "location", "url", "posted")
+
+    def __init__(self, job_id: str, title: str, company: str, location: str, url: str, posted: str = ""):
+        self.id = job_id
+        self.title = title
+        self.company = company
+        self.location = location
+        self.url = url
+        self.posted = posted
+
+    @classmethod
+    def from_job(cls, job: dict) -> JobRecord:
+        return cls(job["id"], job.get("title", ""), job.get("company", ""), job.get("location", ""),
+                   job.get("url", ""), job.get("posted") or "")
+
+
+class JobStreamWriter:
+    """Append-only JSON Lines writer that fsyncs after every record."""
+
+    def __init__(self, path: Path, *, truncate_at: int | None = None):
+        self.path = path
+        if truncate_at is None or not path.exists():
+            self._f = open(path, "w", encoding="utf-8")
+        else:
+            # Resume: drop any half-written trailing line before appending
+            os.truncate(path, truncate_at)
+            self._f = open(path, "a", encoding="utf-8")
+
+    def _write(self, record: dict):
+        self._f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._f.flush()
+        os.fsync(self._f.fileno())
+
+    def write_page(self, search: str, next_start: int, cards: list[dict]):
+        self._write({"_page": {"search": search, "next_start": next_start, "cards": cards}})
+
+    def write_job(self, job: dict):
+        self._write(job)
+
+    def mark_search_done(self, search: str):
+        self._write({"_search_done": search})
+
+    def close(self):
+        self._f.close()
+
+
+class ResumePoint:
+    """What an interrupted jobs.jsonl run had finished."""
+
+    def __init__(self):
+        self.cards: dict[str, list[dict]] = {}  # search -> cards kept from its pages, in order
+        self.done: dict[str, dict] = {}         # job ID -> job with description
+        self.next_start: dict[str, int] = {}    # search -> next page offset
+        self.search_done: set[str] = set()
+        self.valid_bytes = 0                    # offset just past the last complete line
+
+
+def read_resume_point(path: Path) -> ResumePoint:
+    point = ResumePoint()
+    if not path.exists():
+        return point
+    with open(path, "rb") as f:
+        for raw in f:
+            if not raw.endswith(b"\n"):
+                break  # interrupted mid-write
+            try:
+                record = json.loads(raw)
+            except json.JSONDecodeError:
+                break
+            point.valid_bytes += len(raw)
+            if "_page" in record:
+                page = record["_page"]
+                point.cards.setdefault(page["search"], []).extend(page["cards"])
+                point.next_start[page["search"]] = max(point.next_start.get(page["search"], 0), page["next_start"])
+            elif "_search_done" in record:
+                point.search_done.add(record["_search_done"])
+            else:
+                point.done[record["id"]] = record
+    return point
+
+
+def _iter_json_array(f: IO[str], chunk_size: int = _CHUNK_SIZE) -> Iterator:
+    """Decode the elements of a top-level JSON array one at a time.
+
+    Only the element being decoded and about one chunk of text are held in
+    memory. A read that does not complete an element doubles the next read,
+    so very large elements still decode in linear time.
+    """
+    buf = f.read(chunk_size).lstrip()
+    if not buf.startswith("["):
+        raise ValueError(f"{getattr(f, 'name', 'input')}: expected a JSON array of jobs")
+    pos = 1
+    eof = False
+    while True:
+        pos = _SEPARATORS.match(buf, pos).end()
+        if pos == len(buf):
+            if eof:
+                raise ValueError(f"{getattr(f, 'name', 'input')}: unterminated JSON array")
+            buf, pos = f.read(chunk_size), 0
+            eof = not buf
+            continue
+        if buf[pos] == "]":
+            return
+        try:
+            item, pos = _decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            more = f.read(max(chunk_size, len(buf) - pos))
+            eof = not more
+            buf, pos = buf[pos:] + more, 0
+            continue
+        yield item
+        if pos >= chunk_size:
+            buf, pos = buf[pos:], 0  # let go of the text already decoded
+
+
+def iter_jobs(path: Path) -> Iterator[dict]:
+    """Yield finished jobs from a jobs.json array or a jobs.jsonl stream, one at a time."""
+    if path.suffix != ".jsonl":
+        with open(path, "r", encoding="utf-8") as f:
+            yield from _iter_json_array(f)
+        return
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.endswith("\n"):
+                break  # interrupted mid-write
+            record = json.loads(line)
+            if not any(key.startswith("_") for key in record):
+                yield record
+
+
+def latest_jobs_file(*paths: Path) -> Path:
+    """Pick the most recently written of the candidate job files."""
+    existing = [p for p in paths if p.exists()]
+    if not existing:
+        return paths[0]
+    return max(existing, key=lambda p: p.stat().st_mtime)
@@ -0,0 +1,182 @@
+"""Precompiled single-pass keyword matching for job filters.
+
+All include, exclude and location terms from one config are compiled into a
+single trie-shaped regex, so each job's text is scanned once no matter how
+many keywords are configured.
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+
+INCLUDE = "include"
+EXCLUDE = "exclude"
+LOCATION = "location"
+
+# Regions of the scanned text, joined with a separator no term can contain
+_SEP = "\x00"
+_LOCATION, _TITLE, _DESCRIPTION = range(3)
+
+_WORD_CHAR = re.compile(r"\w")
+
+# Scans remembered per matcher: the filter stages look at each job in turn,
+# so only the last few jobs are asked about again
+_MEMO_SIZE = 64
+
+
+def _trie_pattern(terms: list[str]) -> str:
+    """Build a regex alternation shaped like a trie of ``terms``.
+
+    Greedy optional groups make the longest term win at each position, and
+    shared prefixes are only tried once.
+    """
+    trie: dict = {}
+    for term in terms:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def build(node: dict) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+class MatchResult:
+    """Terms found in one job, grouped by what the filters need."""
+
+    __slots__ = ("include", "exclude_title", "exclude", "location")
+
+    def __init__(self):
+        self.include: str | None = None        # first include term in title/description
+        self.exclude_title: str | None = None  # first exclude term in the title
+        self.exclude: str | None = None        # first exclude term in title/description
+        self.location: str | None = None       # first location term in the location
+
+
+class JobMatcher:
+    """Matches a job's location, title and description against every term in one pass.
+
+    Args:
+        include: Terms a job must mention in its title or description.
+        exclude: Terms that disqualify a job (title, or title+description).
+        location: Terms that disqualify a job's location.
+        whole_words: Only match terms not glued to other word characters.
+    """
+
+    def __init__(self, include=(), exclude=(), location=(), *, whole_words: bool = False):
+        self.roles: dict[str, set[str]] = {}
+        for role, terms in ((INCLUDE, include), (EXCLUDE, exclude), (LOCATION, location)):
+            for term in terms:
+                term = term.lower().replace(_SEP, "")
+                if term:
+                    self.roles.setdefault(term, set()).add(role)
+        self.has_include = any(INCLUDE in r for r in self.roles.values())
+
+        # The regex reports only the longest term starting at each position, so
+        # each term also carries the roles of shorter terms that prefix it.
+        self._implied: dict[str, list[tuple[str, frozenset]]] = {}
+        for term in self.roles:
+            implied = []
+            for other, roles in self.roles.items():
+                if len(other) <= len(term) and term.startswith(other):
+                    if whole_words and len(other) < len(term) and _WORD_CHAR.match(term[len(other)]):
+                        continue  # the prefix would be glued to the rest of the word
+                    implied.append((other, frozenset(roles)))
+            implied.sort(key=lambda item: len(item[0]))
+            self._implied[term] = implied
+
+        self._regex = None
+        if self.roles:
+            pattern = _trie_pattern(sorted(self.roles))
+            if whole_words:
+                pattern = rf"(?<!\w)(?:{pattern})(?!\w)"
+            self._regex = re.compile(pattern)
+
+        self._memo: dict[int, tuple] = {}
+
+    def scan(self, job: dict) -> MatchResult:
+        """Scan one job's location, title and description together."""
+        location = job.get("location", "")
+        title = job.get("title", "")
+        description = job.get("description", "")
+
+        memo = self._memo.get(id(job))
+        if memo is not None and memo[0] is job and memo[1] is location and memo[2] is title and memo[3] is description:
+            return memo[4]
+
+        result = MatchResult()
+        if self._regex is not None:
+            # lower() may change a segment's length, so offsets come from the lowered parts
+            location_lower, title_lower = location.lower(), title.lower()
+            text = f"{location_lower}{_SEP}{title_lower}{_SEP}{description.lower()}"
+            title_start = len(location_lower) + 1
+            desc_start = title_start + len(title_lower) + 1
+            search = self._regex.search
+            m = search(text)
+            while m is not None:
+                pos = m.start()
+                # Resume right after the match start so overlapping terms are still found
+                m_term, m = m.group(), search(text, pos + 1)
+                region = _LOCATION if pos < title_start else _TITLE if pos < desc_start else _DESCRIPTION
+                for term, roles in self._implied[m_term]:
+                    if region == _LOCATION:
+                        if LOCATION in roles and result.location is None:
+                            result.location = term
+                        continue
+                    if INCLUDE in roles and result.include is None:
+                        result.include = term
+                    if EXCLUDE in roles:
+                        if result.exclude is None:
+                            result.exclude = term
+                        if region == _TITLE and result.exclude_title is None:
+                            result.exclude_title = term
+
+        if len(self._memo) > _MEMO_SIZE:
+            self._memo.clear()
+        self._memo[id(job)] = (job, location, title, description, result)
+        return result
+
+    def include_hits(self, job: dict) -> dict[str, list[int]]:
+        """Count each include term in a job: ``{term: [title hits, description hits]}``.
+
+        Only terms that occur are listed. Unlike ``scan()`` this counts every
+        occurrence, so it is meant for the few jobs that are being ranked.
+        """
+        hits: dict[str, list[int]] = {}
+        if not self.has_include:
+            return hits
+        title = job.get("title", "").lower()
+        text = f"{title}{_SEP}{job.get('description', '').lower()}"
+        desc_start = len(title) + 1
+        search = self._regex.search
+        m = search(text)
+        while m is not None:
+            pos = m.start()
+            m_term, m = m.group(), search(text, pos + 1)
+            for term, roles in self._implied[m_term]:
+                if INCLUDE in roles:
+                    hits.setdefault(term, [0, 0])[pos >= desc_start] += 1
+        return hits
+
+
+@lru_cache(maxsize=32)
+def _compile(include: tuple, exclude: tuple, location: tuple, whole_words: bool) -> JobMatcher:
+    return JobMatcher(include, exclude, location, whole_words=whole_words)
+
+
+def get_matcher(config: dict) -> JobMatcher:
+    """Return the compiled matcher for a config, built once per distinct term set."""
+    filters = config.get("filters", {})
+    return _compile(
+        tuple(filters.get("keywords", [])),
+        tuple(filters.get("excludeKeyWords", [])),
+        tuple(filters.get("excludeProvinces", [])) + tuple(filters.get("excludeLocationKeywords", [])),
+        bool(filters.get("matchWholeWords", False)),
+    )
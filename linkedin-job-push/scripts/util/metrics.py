@@ -0,0 +1,266 @@
+"""Run metrics: per-stage wall time, counters and component stats.
+
+fetch_jobs.py and push_jobs.py each start a run, time their stages with
+``timed()``, bump ``count()`` counters and ``record()`` the stats their
+components already keep (HTTP client, rate limiter, caches, filters).
+``finish_run()`` appends the run's report as one JSON line to the report
+file, so runs can be compared over time, and optionally writes a
+Prometheus textfile for node_exporter's textfile collector. The report
+file keeps the last ``metrics.maxReports`` runs.
+
+Stages are timed on whichever thread runs them, so stages inside the
+description workers (``http``, ``parse``, ``rate_limit_wait``) add up
+time across workers and can exceed the run's wall time.
+
+With no run started every helper is a no-op, so library code can be
+instrumented unconditionally.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+DEFAULT_REPORT_FILE = "run-report.jsonl"
+DEFAULT_MAX_REPORTS = 1000
+PROMETHEUS_PREFIX = "clawcareer"
+
+# How much of the end of the report file to search for the previous run
+_TAIL_BYTES = 256 * 1024
+
+
+class RunMetrics:
+    """Timings, counters and stats collected during one fetch or push run."""
+
+    def __init__(self, run: str):
+        self.run = run
+        self.started_at = time.time()
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+        self.stages: dict[str, list] = {}  # name -> [seconds, calls]
+        self.counters: dict[str, float] = {}
+        self.sections: dict[str, dict] = {}
+        self.filters: dict[str, list[dict]] = {}  # profile -> FilterPipeline.stats()
+
+    @contextmanager
+    def timed(self, stage: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(stage, time.perf_counter() - started)
+
+    def add_time(self, stage: str, seconds: float):
+        with self._lock:
+            entry = self.stages.setdefault(stage, [0.0, 0])
+            entry[0] += seconds
+            entry[1] += 1
+
+    def count(self, name: str, n: float = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def record(self, section: str, values: dict):
+        with self._lock:
+            self.sections[section] = dict(values)
+
+    def record_filter(self, profile: str, stages: list[dict]):
+        with self._lock:
+            self.filters[profile] = stages
+
+    def report(self, ok: bool = True) -> dict:
+        with self._lock:
+            return {
+                "run": self.run,
+                "started": self.started_at,
+                "seconds": round(time.perf_counter() - self._started, 4),
+                "ok": ok,
+                "stages": {name: {"seconds": round(seconds, 4), "calls": calls}
+                           for name, (seconds, calls) in self.stages.items()},
+                "counters": dict(self.counters),
+                **self.sections,
+                "filters": {profile: list(stages) for profile, stages in self.filters.items()},
+            }
+
+
+# The run being measured, if any; set by start_run() and cleared by finish_run()
+_active: RunMetrics | None = None
+
+
+def start_run(run: str) -> RunMetrics:
+    global _active
+    _active = RunMetrics(run)
+    return _active
+
+
+@contextmanager
+def timed(stage: str) -> Iterator[None]:
+    """Add the block's wall time to ``stage`` of the active run."""
+    metrics = _active
+    if metrics is None:
+        yield
+        return
+    with metrics.timed(stage):
+        yield
+
+
+def add_time(stage: str, seconds: float):
+    """Add time measured elsewhere (e.g. summed over many small steps) to ``stage``."""
+    if _active is not None:
+        _active.add_time(stage, seconds)
+
+
+def count(name: str, n: float = 1):
+    if _active is not None:
+        _active.count(name, n)
+
+
+def record(section: str, values: dict):
+    if _active is not None:
+        _active.record(section, values)
+
+
+def record_filter(profile: str, stages: list[dict]):
+    if _active is not None:
+        _active.record_filter(profile, stages)
+
+
+def finish_run(config: dict, base_dir: Path, ok: bool = True) -> dict | None:
+    """Write the active run's report as configured by ``metrics.*`` and end the run.
+
+    Returns the report, or None if no run was active or ``metrics.enabled`` is false.
+    """
+    global _active
+    metrics, _active = _active, None
+    metrics_cfg = config.get("metrics", {})
+    if metrics is None or not metrics_cfg.get("enabled", True):
+        return None
+
+    report = metrics.report(ok)
+    report_path = base_dir / metrics_cfg.get("reportFile", DEFAULT_REPORT_FILE)
+    previous = previous_report(report_path, metrics.run)
+    with open(report_path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(report, ensure_ascii=False) + "\n")
+    max_reports = metrics_cfg.get("maxReports", DEFAULT_MAX_REPORTS)
+    if max_reports:
+        trim_reports(report_path, max_reports)
+
+    prometheus_dir = metrics_cfg.get("prometheusDir")
+    if prometheus_dir:
+        path = base_dir / prometheus_dir / f"{PROMETHEUS_PREFIX}_{metrics.run}.prom"
+        write_textfile(path, to_prometheus(report))
+
+    print(format_summary(report, previous))
+    return report
+
+
+def previous_report(path: Path, run: str) -> dict | None:
+    """The latest report for ``run`` in a report file, read from its tail."""
+    if not path.exists():
+        return None
+    with open(path, "rb") as f:
+        f.seek(max(0, path.stat().st_size - _TAIL_BYTES))
+        lines = f.read().splitlines()
+    for line in reversed(lines):
+        try:
+            report = json.loads(line)
+        except ValueError:
+            continue  # a partial first line, or a run killed mid-write
+        if isinstance(report, dict) and report.get("run") == run:
+            return report
+    return None
+
+
+def trim_reports(path: Path, keep: int) -> int:
+    """Drop all but the last ``keep`` reports from a report file; returns how many were dropped.
+
+    The file is only rewritten once it holds a tenth more than ``keep``, so
+    most runs just count its lines.
+    """
+    with open(path, "rb") as f:
+        lines = f.readlines()
+    if len(lines) <= keep + keep // 10:
+        return 0
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.writelines(lines[-keep:])
+    os.replace(tmp, path)
+    return len(lines) - keep
+
+
+def _metric_name(*parts: str) -> str:
+    return re.sub(r"[^a-zA-Z0-9_]", "_", "_".join((PROMETHEUS_PREFIX,) + parts)).lower()
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _numeric(prefix: tuple, values: dict) -> Iterator[tuple[tuple, float]]:
+    for key, value in values.items():
+        if isinstance(value, bool):
+            yield prefix + (key,), int(value)
+        elif isinstance(value, (int, float)):
+            yield prefix + (key,), value
+        elif isinstance(value, dict):
+            yield from _numeric(prefix + (key,), value)
+
+
+def to_prometheus(report: dict) -> str:
+    """A report in the Prometheus text exposition format (all gauges, last run's values)."""
+    run = f'run="{_label(report["run"])}"'
+    samples: dict[str, list[str]] = {}
+
+    def add(name: str, labels: str, value: float):
+        samples.setdefault(name, []).append(f"{name}{{{labels}}} {value!r}")
+
+    add(_metric_name("run_timestamp_seconds"), run, report["started"])
+    add(_metric_name("run_duration_seconds"), run, report["seconds"])
+    add(_metric_name("run_success"), run, int(report["ok"]))
+    for stage, entry in report["stages"].items():
+        labels = f'{run},stage="{_label(stage)}"'
+        add(_metric_name("stage_seconds"), labels, entry["seconds"])
+        add(_metric_name("stage_calls"), labels, entry["calls"])
+    for profile, stages in report["filters"].items():
+        for entry in stages:
+            labels = f'{run},profile="{_label(profile)}",stage="{_label(entry["stage"])}"'
+            add(_metric_name("filter_in"), labels, entry["in"])
+            add(_metric_name("filter_dropped"), labels, entry["dropped"])
+            add(_metric_name("filter_seconds"), labels, entry["ms"] / 1000)
+    for counter, value in report["counters"].items():
+        add(_metric_name(counter), run, value)
+    reserved = {"run", "started", "seconds", "ok", "stages", "counters", "filters"}
+    sections = {key: value for key, value in report.items() if key not in reserved}
+    for path, value in _numeric((), sections):
+        add(_metric_name(*path), run, value)
+
+    lines = []
+    for name, values in samples.items():
+        lines.append(f"# TYPE {name} gauge")
+        lines += values
+    return "\n".join(lines) + "\n"
+
+
+def write_textfile(path: Path, text: str):
+    """Replace ``path`` atomically, so the collector never reads a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+def format_summary(report: dict, previous: dict | None = None) -> str:
+    """One line of the slowest stages, with the previous run of the same kind for comparison."""
+    stages = sorted(report["stages"].items(), key=lambda item: item[1]["seconds"], reverse=True)
+    parts = ", ".join(f"{name} {entry['seconds']:.2f}s" for name, entry in stages[:6])
+    line = f"Timing ({report['run']}): {report['seconds']:.2f}s total"
+    if previous is not None:
+        line += f" (previous run {previous['seconds']:.2f}s)"
+    return line + (f" — {parts}" if parts else "")
@@ -0,0 +1,301 @@
+"""Near-duplicate job detection: MinHash signatures with an LSH index in state.db.
+
+A repost under a new job ID, or the same role posted by several agencies,
+has a different ID but almost the same text. Each job gets a 64-value
+MinHash signature over shingles of its normalized title words, company
+and description word pairs (one-permutation hashing: every shingle is
+hashed once and falls into one of 64 bins). The fraction of equal bins
+estimates the Jaccard similarity of two jobs' shingle sets. Every shingle
+hash is keyed by the job's city (the location up to its first comma), so
+the same opening posted for another city never counts as a duplicate.
+
+Signatures are split into 16 bands of 4 values. Jobs sharing any band are
+candidates, and a candidate counts as a duplicate when its estimated
+similarity reaches the threshold, so a check is a few indexed lookups
+rather than a comparison with every job. Sent jobs are indexed per profile
+in state.db; jobs kept earlier in the same run are indexed in temporary
+tables, so memory use stays flat however many jobs are checked. Jobs
+whose message is queued in the outbox keep their signatures in state.db
+(unindexed) until a later run delivers them.
+
+Each sent job's exact title, company and location are also kept, so
+fetch_jobs can skip a reposted card before paying for its description
+when ``filters.skipRepostedCards`` asks for it.
+"""
+
+from __future__ import annotations
+
+import re
+import sqlite3
+import time
+import zlib
+from array import array
+from pathlib import Path
+from typing import Iterable
+
+from util.profiles import DEFAULT_PROFILE
+
+DEFAULT_THRESHOLD = 0.7
+NUM_BINS = 64
+BANDS = 16
+ROWS = NUM_BINS // BANDS
+_BIN_BITS = 6  # log2(NUM_BINS)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_MASK = 0xFFFFFFFF
+_EMPTY = _MASK  # bin value meaning "no shingle fell here"
+
+
+def _tokens(text: str) -> list[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _shingle_hashes(job: dict) -> set[int]:
+    """32-bit hashes of the job's title words, company and description word pairs.
+
+    Word pairs are hashed as ``a * K + b`` of the two words' CRCs, whose high
+    bits mix both words; the top 6 bits pick the MinHash bin. Every hash is
+    XORed with a hash of the city, so jobs in different cities hash their
+    shingles differently and share almost no bins.
+    """
+    crc = zlib.crc32
+    hashes = {(crc(token.encode()) * 0x5BD1E995) & _MASK for token in _tokens(job.get("title", ""))}
+    company = " ".join(_tokens(job.get("company", "")))
+    if company:
+        hashes.add((crc(company.encode()) * 0x1B873593) & _MASK)
+    words = [crc(token.encode()) for token in _tokens(job.get("description", ""))]
+    hashes.update([(a * 0x9E3779B1 + b) & _MASK for a, b in zip(words, words[1:])])
+    city = " ".join(_tokens(job.get("location", "").split(",")[0]))
+    if city and hashes:
+        key = (crc(city.encode()) * 0xCC9E2D51) & _MASK
+        hashes = {h ^ key for h in hashes}
+    return hashes
+
+
+def signature(job: dict) -> array | None:
+    """The job's MinHash signature, or None if it has no text to compare."""
+    hashes = _shingle_hashes(job)
+    if not hashes:
+        return None
+    sig = array("I", [_EMPTY]) * NUM_BINS
+    shift = 32 - _BIN_BITS
+    for h in hashes:
+        b = h >> shift
+        if h < sig[b]:
+            sig[b] = h  # hashes in one bin share their high bits, so this compares the rest
+    # Densify: an empty bin borrows the next filled bin's value, offset by the
+    # distance, so short texts still compare bin for bin
+    if _EMPTY in sig:
+        filled = [b for b in range(NUM_BINS) if sig[b] != _EMPTY]
+        for b in range(NUM_BINS):
+            if sig[b] == _EMPTY:
+                source = next((f for f in filled if f > b), filled[0])
+                sig[b] = (sig[source] + (source - b) % NUM_BINS * 0x3C6EF372) & _MASK
+    return sig
+
+
+def similarity(a: array, b: array) -> float:
+    """Estimated Jaccard similarity of two signatures' shingle sets."""
+    return sum(x == y for x, y in zip(a, b)) / NUM_BINS
+
+
+def band_keys(sig: array) -> list[int]:
+    """One index key per band: the band number and a hash of its values."""
+    raw = sig.tobytes()
+    width = ROWS * sig.itemsize
+    return [(band << 32) | zlib.crc32(raw[band * width:(band + 1) * width]) for band in range(BANDS)]
+
+
+def card_key(job: dict) -> str:
+    """Normalized title, company and location: what a job's message shows."""
+    return "|".join(" ".join(_tokens(job.get(field, ""))) for field in ("title", "company", "location"))
+
+
+class NearDuplicate:
+    """The earlier job a checked job duplicates."""
+
+    __slots__ = ("job_id", "title", "company", "similarity")
+
+    def __init__(self, job_id: str, title: str, company: str, similarity: float):
+        self.job_id = job_id
+        self.title = title
+        self.company = company
+        self.similarity = similarity
+
+
+class NearDupIndex:
+    """One profile's index of sent jobs, plus the jobs kept so far in this run.
+
+    ``check(job)`` returns the sent or earlier-kept job it duplicates, or None
+    and remembers the job for the rest of the run. ``add_many(job_ids)`` then
+    moves the jobs that were actually delivered into the persistent index;
+    ``hold_many(job_ids)`` keeps queued ones until a later run delivers them.
+    ``for_profile()`` returns a view of another profile over the same connection.
+    """
+
+    def __init__(self, path: Path, profile: str = DEFAULT_PROFILE, threshold: float = DEFAULT_THRESHOLD,
+                 _db: sqlite3.Connection | None = None):
+        self.path = path
+        self.profile = profile
+        self.threshold = threshold
+        self._owner = _db is None
+        self._db = _db if _db is not None else self._connect(path)
+
+    @staticmethod
+    def _connect(path: Path) -> sqlite3.Connection:
+        db = sqlite3.connect(str(path))
+        for schema in ("main", "temp"):
+            db.executescript(
+                f"""
+                CREATE TABLE IF NOT EXISTS {schema}.near_dup (
+                    profile TEXT NOT NULL,
+                    job_id TEXT NOT NULL,
+                    signature BLOB NOT NULL,
+                    card_key TEXT NOT NULL,
+                    title TEXT,
+                    company TEXT,
+                    added REAL NOT NULL,
+                    PRIMARY KEY (profile, job_id)
+                ) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS {schema}.near_dup_bands (
+                    profile TEXT NOT NULL,
+                    band_key INTEGER NOT NULL,
+                    job_id TEXT NOT NULL,
+                    PRIMARY KEY (profile, band_key, job_id)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS {schema}.idx_near_dup_card ON near_dup (profile, card_key);
+                """
+            )
+        # Signatures of jobs waiting in the outbox, indexed once delivered
+        db.execute(
+            """CREATE TABLE IF NOT EXISTS main.near_dup_held (
+                profile TEXT NOT NULL,
+                job_id TEXT NOT NULL,
+                signature BLOB NOT NULL,
+                card_key TEXT NOT NULL,
+                title TEXT,
+                company TEXT,
+                added REAL NOT NULL,
+                PRIMARY KEY (profile, job_id)
+            ) WITHOUT ROWID"""
+        )
+        db.commit()
+        return db
+
+    def for_profile(self, profile: str, threshold: float | None = None) -> NearDupIndex:
+        return NearDupIndex(self.path, profile, self.threshold if threshold is None else threshold, _db=self._db)
+
+    def find(self, sig: array, keys: list[int] | None = None) -> NearDuplicate | None:
+        """The most similar sent or earlier-kept job at or above the threshold."""
+        keys = band_keys(sig) if keys is None else keys
+        marks = ",".join("?" * len(keys))
+        rows = self._db.execute(
+            " UNION ALL ".join(
+                f"SELECT job_id, signature, title, company FROM {schema}.near_dup WHERE profile = ? AND job_id IN "
+                f"(SELECT job_id FROM {schema}.near_dup_bands WHERE profile = ? AND band_key IN ({marks}))"
+                for schema in ("main", "temp")
+            ),
+            (self.profile, self.profile, *keys) * 2,
+        )
+        best = None
+        for job_id, blob, title, company in rows:
+            score = similarity(sig, array("I", blob))
+            if score >= self.threshold and (best is None or score > best.similarity):
+                best = NearDuplicate(job_id, title, company, score)
+        return best
+
+    def check(self, job: dict) -> NearDuplicate | None:
+        """The job this one duplicates, if any; otherwise remember it for this run."""
+        sig = signature(job)
+        if sig is None:
+            return None
+        keys = band_keys(sig)
+        duplicate = self.find(sig, keys)
+        if duplicate is None:
+            self._remember("temp", job["id"], sig, keys, card_key(job), job.get("title"), job.get("company"))
+            self._db.commit()  # end the transaction, or its read lock on state.db blocks other writers
+        return duplicate
+
+    def _remember(self, schema: str, job_id: str, sig: array, keys: list[int], key: str,
+                  title: str | None, company: str | None):
+        self._db.execute(
+            f"INSERT OR REPLACE INTO {schema}.near_dup VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (self.profile, job_id, sig.tobytes(), key, title, company, time.time()),
+        )
+        self._db.executemany(
+            f"INSERT OR IGNORE INTO {schema}.near_dup_bands VALUES (?, ?, ?)",
+            ((self.profile, band_key, job_id) for band_key in keys),
+        )
+
+    def _checked(self, job_id: str) -> tuple | None:
+        """``(signature, card_key, title, company)`` of a job checked in this run or held from an earlier one."""
+        for table in ("temp.near_dup", "main.near_dup_held"):
+            row = self._db.execute(
+                f"SELECT signature, card_key, title, company FROM {table} WHERE profile = ? AND job_id = ?",
+                (self.profile, job_id),
+            ).fetchone()
+            if row is not None:
+                return row
+        return None
+
+    def add_many(self, job_ids: Iterable[str]):
+        """Index delivered jobs, which must have passed ``check()`` in this run or been held."""
+        for job_id in job_ids:
+            row = self._checked(job_id)
+            if row is not None:
+                sig = array("I", row[0])
+                self._remember("main", job_id, sig, band_keys(sig), *row[1:])
+                self._db.execute("DELETE FROM main.near_dup_held WHERE profile = ? AND job_id = ?",
+                                 (self.profile, job_id))
+        self._db.commit()
+
+    def hold_many(self, job_ids: Iterable[str]):
+        """Keep the signatures of jobs checked in this run whose message was queued, for ``add_many()`` later."""
+        self._db.executemany(
+            "INSERT OR REPLACE INTO main.near_dup_held "
+            "SELECT profile, job_id, signature, card_key, title, company, added "
+            "FROM temp.near_dup WHERE profile = ? AND job_id = ?",
+            ((self.profile, job_id) for job_id in job_ids),
+        )
+        self._db.commit()
+
+    def release_many(self, job_ids: Iterable[str]):
+        """Forget held jobs whose queued message was given up on."""
+        self._db.executemany(
+            "DELETE FROM main.near_dup_held WHERE profile = ? AND job_id = ?",
+            ((self.profile, job_id) for job_id in job_ids),
+        )
+        self._db.commit()
+
+    def has_card(self, job: dict) -> bool:
+        """Whether a sent job showed exactly this title, company and location."""
+        row = self._db.execute(
+            "SELECT 1 FROM main.near_dup WHERE profile = ? AND card_key = ? LIMIT 1", (self.profile, card_key(job))
+        ).fetchone()
+        return row is not None
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM main.near_dup WHERE profile = ?", (self.profile,)).fetchone()[0]
+
+    def expire(self, days: float) -> int:
+        """Forget sent jobs indexed more than ``days`` ago; returns how many were removed."""
+        cutoff = time.time() - days * 86400
+        self._db.execute(
+            "DELETE FROM main.near_dup_bands WHERE profile = ? AND job_id IN "
+            "(SELECT job_id FROM main.near_dup WHERE profile = ? AND added < ?)",
+            (self.profile, self.profile, cutoff),
+        )
+        cur = self._db.execute("DELETE FROM main.near_dup WHERE profile = ? AND added < ?", (self.profile, cutoff))
+        removed = cur.rowcount
+        self._db.execute("DELETE FROM main.near_dup_held WHERE profile = ? AND added < ?", (self.profile, cutoff))
+        self._db.commit()
+        return removed
+
+    def close(self):
+        if self._owner:
+            self._db.close()
+
+
+def near_dup_threshold(config: dict) -> float | None:
+    """``filters.nearDuplicateThreshold``: None (null) turns detection off."""
+    return config.get("filters", {}).get("nearDuplicateThreshold", DEFAULT_THRESHOLD)
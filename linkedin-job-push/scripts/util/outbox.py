@@ -0,0 +1,85 @@
+"""Telegram chunks that could not be delivered, kept in state.db for the next run.
+
+Jobs in a queued chunk are not marked seen until the chunk is delivered, so
+``pending_job_ids()`` lets the push filters skip them meanwhile instead of
+announcing them twice.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Container, Iterable
+
+from util.telegram import Chunk
+
+DEFAULT_MAX_ATTEMPTS = 5
+
+
+class Outbox:
+    def __init__(self, path: Path):
+        self.path = path
+        self._db = sqlite3.connect(str(path))
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                profile TEXT NOT NULL,
+                chat_id TEXT NOT NULL,
+                text TEXT NOT NULL,
+                job_ids TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                attempts INTEGER NOT NULL
+            )"""
+        )
+        self._db.commit()
+
+    def pending(self, profiles: Container[str] | None = None) -> list[Chunk]:
+        """Queued chunks, oldest first, optionally only for some profiles."""
+        rows = self._db.execute(
+            "SELECT id, profile, chat_id, text, job_ids, attempts FROM outbox ORDER BY id"
+        ).fetchall()
+        return [
+            Chunk(profile, chat_id, text, json.loads(job_ids), outbox_id=row_id, attempts=attempts)
+            for row_id, profile, chat_id, text, job_ids, attempts in rows
+            if profiles is None or profile in profiles
+        ]
+
+    def pending_job_ids(self, profile: str) -> set[str]:
+        ids: set[str] = set()
+        for (job_ids,) in self._db.execute("SELECT job_ids FROM outbox WHERE profile = ?", (profile,)):
+            ids.update(json.loads(job_ids))
+        return ids
+
+    def add(self, chunks: Iterable[Chunk]):
+        """Queue chunks that failed for the first time."""
+        now = time.time()
+        self._db.executemany(
+            "INSERT INTO outbox (profile, chat_id, text, job_ids, created_at, attempts) VALUES (?, ?, ?, ?, ?, 1)",
+            ((c.profile, c.chat_id, c.text, json.dumps(c.job_ids), now) for c in chunks),
+        )
+        self._db.commit()
+
+    def remove(self, chunks: Iterable[Chunk]):
+        self._db.executemany("DELETE FROM outbox WHERE id = ?", ((c.outbox_id,) for c in chunks))
+        self._db.commit()
+
+    def record_failure(self, chunks: Iterable[Chunk], max_attempts: int = DEFAULT_MAX_ATTEMPTS) -> list[Chunk]:
+        """Count another failed attempt; chunks out of attempts are dropped and returned."""
+        dropped = []
+        for chunk in chunks:
+            chunk.attempts += 1
+            if chunk.attempts >= max_attempts:
+                dropped.append(chunk)
+                self._db.execute("DELETE FROM outbox WHERE id = ?", (chunk.outbox_id,))
+            else:
+                self._db.execute("UPDATE outbox SET attempts = ? WHERE id = ?", (chunk.attempts, chunk.outbox_id))
+        self._db.commit()
+        return dropped
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM outbox").fetchone()[0]
+
+    def close(self):
+        self._db.close()
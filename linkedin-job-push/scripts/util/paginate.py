@@ -0,0 +1,103 @@
+"""Concurrent search-page prefetching with in-order delivery.
+
+LinkedIn's guest search is paged by offset, so later pages can be requested
+before earlier ones are processed. ``PagePrefetcher`` keeps up to ``depth``
+page requests in flight (all still passing through the shared rate limiter),
+hands pages back strictly in offset order, and abandons whatever is still
+outstanding once the caller has enough jobs or hits the last page.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Iterator
+
+
+def pages_needed(remaining: int, kept: int, cards: int, page_size: int) -> int:
+    """Estimate how many more pages yield ``remaining`` jobs at the observed pass rate.
+
+    The rate is smoothed with one pseudo-card that passed, so the estimate
+    starts optimistic (every card passes) and never divides by zero.
+    """
+    if remaining <= 0:
+        return 0
+    rate = (kept + 1) / (cards + 1)
+    return math.ceil(remaining / (rate * page_size))
+
+
+class PagePrefetcher:
+    """Iterate ``(offset, cards)`` pages while prefetching the next offsets.
+
+    Args:
+        fetch_page: Called on a worker thread as ``fetch_page(offset, cancel)``;
+            should give up early once the ``cancel`` event is set.
+        start: First offset to request.
+        page_size: Offset step between pages.
+        max_start: Offsets at or past this are never requested.
+        max_depth: Upper bound on requests in flight.
+    """
+
+    def __init__(
+        self,
+        fetch_page: Callable[[int, threading.Event], list[dict]],
+        start: int,
+        *,
+        page_size: int,
+        max_start: int,
+        max_depth: int = 4,
+    ):
+        self._fetch_page = fetch_page
+        self._page_size = page_size
+        self._max_start = max_start
+        self.max_depth = max(1, max_depth)
+        self.depth = 1
+        self._next_submit = start
+        self._next_yield = start
+        self._pending: dict[int, Future] = {}
+        self._cancel = threading.Event()
+        self._pool = ThreadPoolExecutor(max_workers=self.max_depth, thread_name_prefix="search-page")
+        self._lock = threading.Lock()
+        self.fetched = 0   # pages whose request completed
+        self.consumed = 0  # pages handed to the caller
+
+    def set_depth(self, depth: int):
+        """Change how many page requests may be in flight (clamped to 1..max_depth)."""
+        self.depth = max(1, min(self.max_depth, depth))
+
+    def _fetch(self, offset: int) -> list[dict]:
+        cards = self._fetch_page(offset, self._cancel)
+        with self._lock:
+            self.fetched += 1
+        return cards
+
+    def _fill(self):
+        while len(self._pending) < self.depth and self._next_submit < self._max_start:
+            self._pending[self._next_submit] = self._pool.submit(self._fetch, self._next_submit)
+            self._next_submit += self._page_size
+
+    def __iter__(self) -> Iterator[tuple[int, list[dict]]]:
+        while True:
+            self._fill()
+            future = self._pending.pop(self._next_yield, None)
+            if future is None:
+                return
+            offset = self._next_yield
+            self._next_yield += self._page_size
+            cards = future.result()  # request errors surface to the caller here
+            self.consumed += 1
+            yield offset, cards
+
+    def close(self):
+        """Abandon outstanding requests: queued ones are dropped, waiting ones give up."""
+        self._cancel.set()
+        for future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+        self._pool.shutdown(wait=True)
+
+    @property
+    def unused(self) -> int:
+        """Pages that were fetched but never needed."""
+        return self.fetched - self.consumed
@@ -0,0 +1,267 @@
+"""HTML extraction for LinkedIn search cards and job postings.
+
+Three interchangeable backends produce identical output:
+
+- ``selectolax`` (lexbor) and ``lxml`` parse in C and query only the
+  targeted nodes; they are used when installed.
+- ``bs4`` is the always-available fallback. It uses a ``SoupStrainer`` so
+  html.parser only builds the targeted subtrees instead of the whole page.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+
+BACKENDS = ("selectolax", "lxml", "bs4")
+
+_CARD_CLASS = "base-card"
+_DESC_CLASS = "show-more-less-html__markup"
+_SEP = "\x00"
+
+
+def job_id_from_url(job_url: str) -> str:
+    """Extract the job ID from a LinkedIn job URL."""
+    if "view/" in job_url:
+        return job_url.split("view/")[-1].rstrip("/")
+    if "-" in job_url:
+        return job_url.split("-")[-1].rstrip("/")
+    return ""
+
+
+def _card_dict(title: str, company: str | None, location: str | None, href: str, posted: str | None) -> dict:
+    job_url = href.split("?")[0]
+    return {
+        "id": job_id_from_url(job_url),
+        "title": title,
+        "company": company or "Unknown",
+        "location": location or "Unknown",
+        "url": job_url,
+        "posted": posted or "",
+    }
+
+
+def _join_text(text: str, separator: str = " ") -> str:
+    """Collapse sentinel-separated, stripped text pieces like bs4's get_text(strip=True)."""
+    return separator.join(piece for piece in text.split(_SEP) if piece)
+
+
+def _ld_json_description(scripts) -> str | None:
+    """Return the JobPosting description HTML from ld+json script bodies, if any."""
+    for body in scripts:
+        try:
+            data = json.loads(body or "")
+            if data.get("@type") == "JobPosting" and data.get("description"):
+                return data["description"]
+        except (json.JSONDecodeError, AttributeError):
+            continue
+    return None
+
+
+def _class_token(name: str) -> re.Pattern:
+    return re.compile(rf"(?:^|\s){re.escape(name)}(?:\s|$)")
+
+
+class Bs4Parser:
+    name = "bs4"
+
+    def __init__(self):
+        from bs4 import BeautifulSoup, SoupStrainer
+
+        self._soup = BeautifulSoup
+        # Newer bs4 matches strainers against the raw class attribute, so match one token of it
+        self._cards_only = SoupStrainer("div", class_=_class_token(_CARD_CLASS))
+        self._desc_only = SoupStrainer("div", class_=_class_token(_DESC_CLASS))
+        self._ld_json_only = SoupStrainer("script", type="application/ld+json")
+        self._testid_only = SoupStrainer(attrs={"data-testid": "expandable-text-box"})
+
+    def parse_cards(self, html: str) -> list[dict]:
+        soup = self._soup(html, "html.parser", parse_only=self._cards_only)
+        cards = []
+        for card in soup.find_all("div", class_=_CARD_CLASS):
+            job = parse_job_card(card)
+            if job:
+                cards.append(job)
+        return cards
+
+    def parse_description(self, html: str) -> str:
+        # Each html.parser pass tokenizes the whole page, so skip passes that cannot match
+
+        # Primary: guest API returns this structure
+        if _DESC_CLASS in html:
+            desc_el = self._soup(html, "html.parser", parse_only=self._desc_only).find("div", class_=_DESC_CLASS)
+            if desc_el:
+                return desc_el.get_text(strip=True, separator=" ")
+
+        # Fallback: JSON-LD structured data (schema.org JobPosting)
+        if "application/ld+json" in html:
+            soup = self._soup(html, "html.parser", parse_only=self._ld_json_only)
+            description = _ld_json_description(s.string for s in soup.find_all("script"))
+            if description:
+                return self._soup(description, "html.parser").get_text(strip=True, separator=" ")
+
+        # Last resort: new LinkedIn design (requires login)
+        if "expandable-text-box" in html:
+            desc_el = self._soup(html, "html.parser", parse_only=self._testid_only).find(
+                attrs={"data-testid": "expandable-text-box"})
+            if desc_el:
+                return desc_el.get_text(strip=True, separator=" ")
+        return ""
+
+
+def parse_job_card(card) -> dict | None:
+    """Parse a single LinkedIn job card from a BeautifulSoup tag."""
+    title_el = card.find("h3", class_="base-search-card__title")
+    link_el = card.find("a", class_="base-card__full-link")
+    if not title_el or not link_el:
+        return None
+
+    company_el = card.find("h4", class_="base-search-card__subtitle")
+    location_el = card.find("span", class_="job-search-card__location")
+    time_el = card.find("time")
+    return _card_dict(
+        title_el.get_text(strip=True),
+        company_el.get_text(strip=True) if company_el else None,
+        location_el.get_text(strip=True) if location_el else None,
+        link_el.get("href", ""),
+        time_el.get("datetime", "") if time_el else None,
+    )
+
+
+class SelectolaxParser:
+    name = "selectolax"
+
+    def __init__(self):
+        from selectolax.lexbor import LexborHTMLParser
+
+        self._parse = LexborHTMLParser
+
+    @staticmethod
+    def _text(node, separator: str = " ") -> str:
+        return _join_text(node.text(separator=_SEP, strip=True), separator)
+
+    def parse_cards(self, html: str) -> list[dict]:
+        cards = []
+        for card in self._parse(html).css(f"div.{_CARD_CLASS}"):
+            title_el = card.css_first("h3.base-search-card__title")
+            link_el = card.css_first("a.base-card__full-link")
+            if title_el is None or link_el is None:
+                continue
+            company_el = card.css_first("h4.base-search-card__subtitle")
+            location_el = card.css_first("span.job-search-card__location")
+            time_el = card.css_first("time")
+            cards.append(_card_dict(
+                self._text(title_el, ""),
+                self._text(company_el, "") if company_el else None,
+                self._text(location_el, "") if location_el else None,
+                link_el.attributes.get("href") or "",
+                time_el.attributes.get("datetime") if time_el else None,
+            ))
+        return cards
+
+    def parse_description(self, html: str) -> str:
+        tree = self._parse(html)
+        desc_el = tree.css_first(f"div.{_DESC_CLASS}")
+        if desc_el is not None:
+            return self._text(desc_el)
+
+        description = _ld_json_description(
+            s.text(deep=True) for s in tree.css('script[type="application/ld+json"]'))
+        if description:
+            return self._text(self._parse(description).root)
+
+        desc_el = tree.css_first('[data-testid="expandable-text-box"]')
+        return self._text(desc_el) if desc_el is not None else ""
+
+
+class LxmlParser:
+    name = "lxml"
+
+    _CARD_XPATH = f"//div[contains(concat(' ', normalize-space(@class), ' '), ' {_CARD_CLASS} ')]"
+    _DESC_XPATH = f"//div[contains(concat(' ', normalize-space(@class), ' '), ' {_DESC_CLASS} ')]"
+
+    def __init__(self):
+        import lxml.html
+
+        self._parse = lxml.html.fromstring
+
+    @staticmethod
+    def _text(el, separator: str = " ") -> str:
+        return separator.join(t.strip() for t in el.itertext() if t.strip())
+
+    @staticmethod
+    def _first(el, xpath: str):
+        found = el.xpath(xpath)
+        return found[0] if found else None
+
+    def _tree(self, html: str):
+        return self._parse(html) if html.strip() else None
+
+    def parse_cards(self, html: str) -> list[dict]:
+        tree = self._tree(html)
+        if tree is None:
+            return []
+        cards = []
+        # Card search starts from the root so a fragment whose root is a card still matches
+        for card in tree.xpath(f"descendant-or-self::{self._CARD_XPATH[2:]}"):
+            title_el = self._first(card, ".//h3[contains(@class, 'base-search-card__title')]")
+            link_el = self._first(card, ".//a[contains(@class, 'base-card__full-link')]")
+            if title_el is None or link_el is None:
+                continue
+            company_el = self._first(card, ".//h4[contains(@class, 'base-search-card__subtitle')]")
+            location_el = self._first(card, ".//span[contains(@class, 'job-search-card__location')]")
+            time_el = self._first(card, ".//time")
+            cards.append(_card_dict(
+                self._text(title_el, ""),
+                self._text(company_el, "") if company_el is not None else None,
+                self._text(location_el, "") if location_el is not None else None,
+                link_el.get("href", ""),
+                time_el.get("datetime", "") if time_el is not None else None,
+            ))
+        return cards
+
+    def parse_description(self, html: str) -> str:
+        tree = self._tree(html)
+        if tree is None:
+            return ""
+        desc_el = self._first(tree, f"descendant-or-self::{self._DESC_XPATH[2:]}")
+        if desc_el is not None:
+            return self._text(desc_el)
+
+        description = _ld_json_description(
+            s.text for s in tree.xpath("//script[@type='application/ld+json']"))
+        if description:
+            fragment = self._tree(description)
+            return self._text(fragment) if fragment is not None else ""
+
+        desc_el = self._first(tree, "//*[@data-testid='expandable-text-box']")
+        return self._text(desc_el) if desc_el is not None else ""
+
+
+_PARSERS = {"selectolax": SelectolaxParser, "lxml": LxmlParser, "bs4": Bs4Parser}
+
+
+def available_backends() -> list[str]:
+    """Backends whose libraries import, fastest first."""
+    names = []
+    for name in BACKENDS:
+        try:
+            _PARSERS[name]()
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def get_parser(backend: str = "auto"):
+    """Return a parser for ``backend``, or the fastest installed one for ``"auto"``."""
+    if backend == "html.parser":
+        backend = "bs4"
+    if backend != "auto":
+        return _PARSERS[backend]()
+    for name in BACKENDS:
+        try:
+            return _PARSERS[name]()
+        except ImportError:
+            continue
+    raise ImportError("No HTML parser available; install beautifulsoup4")
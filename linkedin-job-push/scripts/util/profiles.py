@@ -0,0 +1,52 @@
+"""Named search profiles: several people or regions served from one config.
+
+A config may list ``profiles``, each with its own ``filters`` (merged over
+the top-level ``filters``) and optional ``telegram.chatId``. Without a
+``profiles`` list the whole config is a single profile named "default".
+Each resolved profile is a config-shaped dict, so the existing filter
+functions take it unchanged.
+"""
+
+from __future__ import annotations
+
+DEFAULT_PROFILE = "default"
+
+
+def load_profiles(config: dict) -> list[dict]:
+    """Resolve ``config`` into one config-shaped dict per profile."""
+    base_filters = config.get("filters", {})
+    entries = config.get("profiles") or [{"name": DEFAULT_PROFILE}]
+
+    profiles = []
+    for entry in entries:
+        profile = {key: value for key, value in config.items() if key != "profiles"}
+        profile.update({key: value for key, value in entry.items() if key != "filters"})
+        profile["filters"] = {**base_filters, **entry.get("filters", {})}
+        profile.setdefault("name", DEFAULT_PROFILE)
+        profiles.append(profile)
+
+    names = [p["name"] for p in profiles]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Duplicate profile names in config: {names}")
+    return profiles
+
+
+def search_key(profile: dict) -> tuple[str, str]:
+    """Identify the LinkedIn search a profile needs: (keyword query, country)."""
+    filters = profile.get("filters", {})
+    keywords = sorted(k.strip().lower() for k in filters.get("keywords", []))
+    return " OR ".join(keywords), filters.get("country", "Canada").strip().lower()
+
+
+def group_by_search(profiles: list[dict]) -> dict[tuple[str, str], list[dict]]:
+    """Group profiles that can share the same search result pages."""
+    groups: dict[tuple[str, str], list[dict]] = {}
+    for profile in profiles:
+        groups.setdefault(search_key(profile), []).append(profile)
+    return groups
+
+
+def job_targets(job: dict, profile_name: str) -> bool:
+    """Whether a fetched job was collected for ``profile_name`` (untagged jobs serve everyone)."""
+    tagged = job.get("profiles")
+    return tagged is None or profile_name in tagged
@@ -0,0 +1,184 @@
+"""Rate limiting shared by concurrent LinkedIn request workers."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+
+class RequestCancelled(Exception):
+    """A request was abandoned while waiting for the rate limiter."""
+
+
+class TokenBucket:
+    """Thread-safe token bucket.
+
+    Tokens are added at ``rate`` per second up to ``capacity``. Every request
+    calls ``acquire()`` first, so total throughput stays at ``rate`` no matter
+    how many worker threads share the bucket. ``pause()`` holds back all
+    callers, which is how a 429 backoff in one worker applies to every worker.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self._lock = threading.Lock()
+        self._paused_until = 0.0
+        self.configure(rate, capacity)
+
+    def configure(self, rate: float, capacity: float = 1.0):
+        """Reset the bucket with a new rate (tokens/second) and burst size."""
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        with self._lock:
+            self.rate = rate
+            self.capacity = max(capacity, 1.0)
+            self._tokens = self.capacity
+            self._updated = time.monotonic()
+
+    def acquire(self, cancel: threading.Event | None = None) -> bool:
+        """Block until a token is available, then consume it.
+
+        Returns False without consuming a token if ``cancel`` is set first.
+        """
+        while True:
+            if cancel is not None and cancel.is_set():
+                return False
+            with self._lock:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                else:
+                    elapsed = max(0.0, now - self._updated)
+                    self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+                    self._updated = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return True
+                    wait = (1 - self._tokens) / self.rate
+            if cancel is not None:
+                cancel.wait(wait)
+            else:
+                time.sleep(wait)
+
+    def pause(self, seconds: float):
+        """Stop handing out tokens for ``seconds``; the bucket restarts empty."""
+        with self._lock:
+            until = time.monotonic() + seconds
+            if until > self._paused_until:
+                self._paused_until = until
+                self._tokens = 0.0
+                self._updated = until
+
+
+class AdaptiveRateLimiter(TokenBucket):
+    """Token bucket whose rate follows server health (AIMD).
+
+    Each healthy response adds ``increase`` tokens/second up to ``max_rate``;
+    each throttled one (429/5xx) multiplies the rate by ``decrease``, down to
+    ``min_rate``, and pauses every caller for the server's requested wait.
+    ``max_rate`` defaults to the configured rate, so by default the limiter
+    only recovers from a slowdown and never runs faster than asked.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0, **bounds):
+        super().__init__(rate, capacity)
+        self.configure(rate, capacity, **bounds)
+
+    def configure(
+        self,
+        rate: float,
+        capacity: float = 1.0,
+        *,
+        min_rate: float | None = None,
+        max_rate: float | None = None,
+        increase: float | None = None,
+        decrease: float = 0.5,
+    ):
+        """Reset the bucket; bounds default to rate/10 .. rate, stepping by rate/20."""
+        super().configure(rate, capacity)
+        with self._lock:
+            self.min_rate = min(rate, min_rate if min_rate is not None else rate / 10)
+            self.max_rate = max(rate, max_rate if max_rate is not None else rate)
+            self.increase = increase if increase is not None else rate / 20
+            self.decrease = decrease
+            self.successes = 0
+            self.throttles = 0
+
+    def _set_rate(self, rate: float):
+        # Credit tokens earned at the old rate before switching (caller holds the lock)
+        now = time.monotonic()
+        if now > self._updated:
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+        self.rate = rate
+
+    def record_success(self):
+        with self._lock:
+            self.successes += 1
+            self._set_rate(min(self.max_rate, self.rate + self.increase))
+
+    def record_throttle(self, wait: float):
+        with self._lock:
+            self.throttles += 1
+            self._set_rate(max(self.min_rate, self.rate * self.decrease))
+        self.pause(wait)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"rate": self.rate, "successes": self.successes, "throttles": self.throttles}
+
+
+class CircuitOpen(Exception):
+    """The server is throttling hard enough that the run should stop."""
+
+
+class CircuitBreaker:
+    """Trips after too many consecutive throttled responses, or one overlong wait.
+
+    Once open, ``check()`` raises ``CircuitOpen`` so every caller stops
+    promptly instead of queueing behind ever longer backoffs.
+    """
+
+    def __init__(self, max_consecutive: int = 5, max_wait: float = 300.0):
+        self._lock = threading.Lock()
+        self.configure(max_consecutive, max_wait)
+
+    def configure(self, max_consecutive: int = 5, max_wait: float = 300.0):
+        with self._lock:
+            self.max_consecutive = max(1, max_consecutive)
+            self.max_wait = max_wait
+            self.consecutive = 0
+            self.statuses: dict[int, int] = {}
+            self.reason: str | None = None
+
+    @property
+    def is_open(self) -> bool:
+        return self.reason is not None
+
+    def record_success(self):
+        with self._lock:
+            self.consecutive = 0
+
+    def record_throttle(self, status: int, wait: float):
+        with self._lock:
+            self.consecutive += 1
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+            if self.reason is not None:
+                return
+            if self.consecutive >= self.max_consecutive:
+                self.reason = f"{self.consecutive} throttled responses in a row"
+            elif wait > self.max_wait:
+                self.reason = f"server asked to wait {wait:.0f}s (limit {self.max_wait:.0f}s)"
+
+    def check(self):
+        if self.reason is not None:
+            raise CircuitOpen(self.reason)
+
+
+def format_stats(limiter: dict, breaker: CircuitBreaker) -> str:
+    line = (f"Rate limit: ended at {limiter['rate']:.2f} req/s "
+            f"({limiter['successes']} ok, {limiter['throttles']} throttled)")
+    if breaker.statuses:
+        line += " — " + ", ".join(f"{status} x{n}" for status, n in sorted(breaker.statuses.items()))
+    if breaker.is_open:
+        line += f"\nStopped early: {breaker.reason}"
+    return line
@@ -0,0 +1,123 @@
+"""Offline replay: compare a candidate config's push filters with the current ones.
+
+Both configs run over the same stored jobs (archive.db or a jobs.json /
+jobs.jsonl snapshot) without network access or seen-state, so a filter
+change can be checked in well under a second. The report shows each
+stage's drops and time side by side, and every job the candidate newly
+includes or excludes together with the stage responsible.
+"""
+
+from __future__ import annotations
+
+from util.filter import FilterPipeline, build_pipeline
+from util.profiles import job_targets
+
+_NOT_IN_CONFIG = "profile not in this config"
+
+
+class ProfileReplay:
+    """One profile's filters under the current and the candidate config."""
+
+    __slots__ = ("name", "current", "candidate", "kept_current", "kept_candidate",
+                 "newly_included", "newly_excluded", "max_send")
+
+    def __init__(self, name: str, current: FilterPipeline | None, candidate: FilterPipeline | None):
+        self.name = name
+        self.current = current      # None when the profile exists only in the other config
+        self.candidate = candidate
+        self.kept_current = 0
+        self.kept_candidate = 0
+        self.newly_included: list[tuple[dict, str]] = []  # with the current config's drop reason
+        self.newly_excluded: list[tuple[dict, str]] = []  # with the candidate config's drop reason
+        self.max_send: tuple[int, int] = (0, 0)
+
+
+def _verdict(pipeline: FilterPipeline | None, job: dict) -> str | None:
+    """The drop reason, or None if the job is kept."""
+    if pipeline is None:
+        return _NOT_IN_CONFIG
+    dropped = pipeline.explain(job)
+    if dropped is None:
+        return None
+    stage, reason = dropped
+    return f"{stage.name.split(' ')[0]}: {reason}"
+
+
+def replay_profile(name: str, current: dict | None, candidate: dict | None, jobs: list[dict]) -> ProfileReplay:
+    """Run both versions of profile ``name`` (either may be None) over ``jobs``."""
+    result = ProfileReplay(
+        name,
+        build_pipeline(current, verbose=False) if current is not None else None,
+        build_pipeline(candidate, verbose=False) if candidate is not None else None,
+    )
+    for job in jobs:
+        if not job_targets(job, name):
+            continue
+        before = _verdict(result.current, job)
+        after = _verdict(result.candidate, job)
+        result.kept_current += before is None
+        result.kept_candidate += after is None
+        if before is not None and after is None:
+            result.newly_included.append((job, before))
+        elif before is None and after is not None:
+            result.newly_excluded.append((job, after))
+    result.max_send = tuple(
+        (profile or {}).get("filters", {}).get("maxSend", 10) for profile in (current, candidate)
+    )
+    return result
+
+
+def replay(current_profiles: list[dict], candidate_profiles: list[dict], jobs: list[dict]) -> list[ProfileReplay]:
+    """Replay every profile found in either config, matched by name.
+
+    Stages are matched across the two configs by their first word, so
+    "experience (≤3yr)" lines up with "experience (≤5yr)".
+    """
+    current = {p["name"]: p for p in current_profiles}
+    candidate = {p["name"]: p for p in candidate_profiles}
+    names = list(candidate) + [name for name in current if name not in candidate]
+    return [replay_profile(name, current.get(name), candidate.get(name), jobs) for name in names]
+
+
+def _stage_rows(result: ProfileReplay) -> list[str]:
+    columns: dict[str, list] = {}
+    for side, pipeline in enumerate((result.current, result.candidate)):
+        for stage in pipeline.stages if pipeline is not None else []:
+            columns.setdefault(stage.name.split(" ")[0], [None, None])[side] = stage
+
+    def cell(stage) -> str:
+        return f"{'—':>18}" if stage is None else f"{stage.dropped:>7} ({stage.seconds * 1000:5.1f} ms)"
+
+    rows = [f"  {'dropped by':<34} {'current':>18} {'candidate':>18}"]
+    for kind, (before, after) in columns.items():
+        names = [stage.name for stage in (before, after) if stage is not None]
+        label = names[0]
+        if len(set(names)) > 1:  # "experience (≤3yr -> ≤5yr)"
+            label = f"{kind} ({' -> '.join(name[len(kind):].strip(' ()') for name in names)})"
+        rows.append(f"  {label:<34} {cell(before)} {cell(after)}")
+    return rows
+
+
+def _job_line(sign: str, job: dict, reason: str) -> str:
+    return f"  {sign} {job.get('title', '')[:55]} — {job.get('company', '')} ({job.get('location', '')})  [{reason}]"
+
+
+def format_replay(results: list[ProfileReplay], limit: int = 30) -> str:
+    lines = []
+    for result in results:
+        lines.append(f"\n=== Profile: {result.name} ===")
+        lines += _stage_rows(result)
+        gained, lost = len(result.newly_included), len(result.newly_excluded)
+        lines.append(f"Kept: {result.kept_current} -> {result.kept_candidate} "
+                     f"(+{gained} newly included, -{lost} newly excluded); "
+                     f"would send {min(result.kept_current, result.max_send[0])} -> "
+                     f"{min(result.kept_candidate, result.max_send[1])} (maxSend)")
+        for title, sign, changed in (("Newly included", "+", result.newly_included),
+                                     ("Newly excluded", "-", result.newly_excluded)):
+            if not changed:
+                continue
+            lines.append(f"{title} (reason {'it was' if sign == '+' else 'it is now'} dropped):")
+            lines += [_job_line(sign, job, reason) for job, reason in changed[:limit]]
+            if len(changed) > limit:
+                lines.append(f"  ... and {len(changed) - limit} more")
+    return "\n".join(lines)
@@ -0,0 +1,92 @@
+"""Schedule slots: when a profile should run, and whether a slot is still owed.
+
+A ``schedule`` block holds a ``timezone`` and either one ``time`` or a list
+of ``times`` (HH:MM). Every time on every day is a slot. A slot is due once
+the clock passes it, until a run is recorded at or after it, so a run that
+was missed (machine asleep, daemon down) is caught up on the next check and
+each slot runs only once. Several missed slots are caught up by one run.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, time, timedelta, tzinfo
+from functools import lru_cache
+
+try:
+    from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+except ImportError:  # Python 3.8
+    ZoneInfo = None
+
+DEFAULT_TIMEZONE = "America/Toronto"
+
+# Without any recorded run, only a slot this recent counts as due
+FIRST_RUN_GRACE = timedelta(minutes=5)
+
+
+def schedule_times(schedule: dict) -> list[time]:
+    """The configured slot times of day, sorted."""
+    raw = schedule.get("times") or ([schedule["time"]] if schedule.get("time") else [])
+    times = []
+    for value in raw:
+        hour, minute = map(int, value.split(":"))
+        times.append(time(hour, minute))
+    return sorted(set(times))
+
+
+@lru_cache(maxsize=None)
+def _timezone(name: str) -> tzinfo:
+    """The stdlib zone; pytz only on Python 3.8 or without a tz database (tzdata)."""
+    if ZoneInfo is not None:
+        try:
+            return ZoneInfo(name)
+        except ZoneInfoNotFoundError:
+            pass
+    import pytz
+
+    return pytz.timezone(name)
+
+
+def _localize(tz: tzinfo, naive: datetime) -> datetime:
+    if hasattr(tz, "localize"):  # pytz zones need localize() for the right UTC offset
+        return tz.localize(naive)
+    return naive.replace(tzinfo=tz)
+
+
+def _slots(schedule: dict, now: datetime, days: range) -> list[datetime]:
+    tz = _timezone(schedule.get("timezone", DEFAULT_TIMEZONE))
+    today = now.astimezone(tz).date()
+    return [
+        _localize(tz, datetime.combine(today + timedelta(days=offset), at))
+        for offset in days
+        for at in schedule_times(schedule)
+    ]
+
+
+def latest_slot(schedule: dict, now: datetime) -> datetime | None:
+    """The most recent slot at or before ``now`` (an aware datetime)."""
+    past = [slot for slot in _slots(schedule, now, range(-1, 1)) if slot <= now]
+    return max(past) if past else None
+
+
+def next_slot(schedule: dict, now: datetime) -> datetime | None:
+    """The first slot after ``now``."""
+    future = [slot for slot in _slots(schedule, now, range(0, 2)) if slot > now]
+    return min(future) if future else None
+
+
+def due_slot(schedule: dict, now: datetime, last_run: datetime | None) -> datetime | None:
+    """The slot a run should cover now, or None if the latest slot already ran."""
+    slot = latest_slot(schedule, now)
+    if slot is None:
+        return None
+    if last_run is None:
+        return slot if now - slot <= FIRST_RUN_GRACE else None
+    return slot if last_run < slot else None
+
+
+def parse_time(value: str | None) -> datetime | None:
+    """Read a timestamp written by ``datetime.isoformat()`` into state.json."""
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo is not None else parsed.astimezone()  # naive: local time
@@ -0,0 +1,101 @@
+"""Store of job IDs already pushed, kept in SQLite next to state.json.
+
+Replaces the ``seen_job_ids`` list that used to live in state.json: lookups
+hit a B-tree index instead of a rebuilt set, updates only insert new rows,
+and old IDs can expire. IDs are tracked per search profile, since each
+profile sends to its own chat. The legacy list is migrated on first open.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import time
+from pathlib import Path
+from typing import Iterable
+
+from util.profiles import DEFAULT_PROFILE
+from util.state import load_state, save_state
+
+
+class SeenStore:
+    """Set-like view of one profile's seen job IDs: ``in``, ``len()`` and ``add_many()``.
+
+    ``for_profile()`` returns a view of another profile over the same connection.
+    """
+
+    def __init__(self, path: Path, profile: str = DEFAULT_PROFILE, _db: sqlite3.Connection | None = None):
+        self.path = path
+        self.profile = profile
+        self._owner = _db is None
+        self._db = _db if _db is not None else self._connect(path)
+
+    @staticmethod
+    def _connect(path: Path) -> sqlite3.Connection:
+        db = sqlite3.connect(str(path))
+        columns = [row[1] for row in db.execute("PRAGMA table_info(seen)")]
+        if columns and "profile" not in columns:
+            # Single-profile layout: move its rows to the default profile
+            db.execute("ALTER TABLE seen RENAME TO seen_single")
+        db.execute(
+            """CREATE TABLE IF NOT EXISTS seen (
+                profile TEXT NOT NULL,
+                job_id TEXT NOT NULL,
+                first_seen REAL NOT NULL,
+                PRIMARY KEY (profile, job_id)
+            ) WITHOUT ROWID"""
+        )
+        if columns and "profile" not in columns:
+            db.execute(
+                "INSERT OR IGNORE INTO seen (profile, job_id, first_seen) "
+                "SELECT ?, job_id, first_seen FROM seen_single",
+                (DEFAULT_PROFILE,),
+            )
+            db.execute("DROP TABLE seen_single")
+        db.commit()
+        return db
+
+    def for_profile(self, profile: str) -> "SeenStore":
+        return SeenStore(self.path, profile, _db=self._db)
+
+    def __contains__(self, job_id: object) -> bool:
+        row = self._db.execute(
+            "SELECT 1 FROM seen WHERE profile = ? AND job_id = ?", (self.profile, job_id)
+        ).fetchone()
+        return row is not None
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM seen WHERE profile = ?", (self.profile,)).fetchone()[0]
+
+    def add_many(self, job_ids: Iterable[str], when: float | None = None):
+        """Record job IDs as seen; IDs already present keep their first-seen time."""
+        when = time.time() if when is None else when
+        self._db.executemany(
+            "INSERT OR IGNORE INTO seen (profile, job_id, first_seen) VALUES (?, ?, ?)",
+            ((self.profile, job_id, when) for job_id in job_ids),
+        )
+        self._db.commit()
+
+    def expire(self, days: float) -> int:
+        """Forget IDs first seen more than ``days`` ago; returns how many were removed."""
+        cur = self._db.execute(
+            "DELETE FROM seen WHERE profile = ? AND first_seen < ?", (self.profile, time.time() - days * 86400)
+        )
+        self._db.commit()
+        return cur.rowcount
+
+    def close(self):
+        if self._owner:
+            self._db.close()
+
+
+def open_seen_store(db_path: Path, state_path: Path) -> SeenStore:
+    """Open the store, first moving any legacy ``seen_job_ids`` list out of state.json."""
+    store = SeenStore(db_path)
+    if state_path.exists():
+        state = load_state(state_path)
+        legacy = state.pop("seen_job_ids", None)
+        if legacy is not None:
+            store.add_many(legacy)
+            save_state(state, state_path)
+            print(f"Migrated {len(legacy)} seen job IDs from {state_path.name} to {db_path.name}")
+    return store
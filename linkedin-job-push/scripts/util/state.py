@@ -0,0 +1,43 @@
+"""Persistent run state (state.json) shared by fetch and push."""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import IO
+
+
+def load_state(path: Path) -> dict:
+    if path.exists():
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return {"last_run": None}
+
+
+def try_lock(path: Path) -> IO | None:
+    """Take an exclusive lock on ``path`` without waiting; None if another process holds it.
+
+    The lock lasts until the returned file is closed or the process exits.
+    """
+    lock_file = open(path, "w")
+    try:
+        import fcntl
+    except ImportError:
+        return lock_file  # no advisory locks on this platform
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return None
+    return lock_file
+
+
+def save_state(state: dict, path: Path):
+    """Write state.json atomically, so a crash never leaves it half-written."""
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
@@ -0,0 +1,168 @@
+"""Telegram delivery: concurrent across chats, ordered and rate-limited within each.
+
+Each chat's messages go out in order on one worker, spaced by a per-chat
+token bucket; every send also takes a token from one global bucket, keeping
+the bot under Telegram's overall limit. A 429 pauses that chat for the
+``retry_after`` Telegram asks for. A chunk that still fails stops its chat,
+and the rest of that chat's chunks are reported undelivered.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from constants import TELEGRAM_SEND_MESSAGE_URL
+from util.http import get_client, retry_after
+from util.ratelimit import TokenBucket
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_PER_CHAT_INTERVAL = 1.0    # seconds between messages to one chat
+DEFAULT_MESSAGES_PER_SECOND = 25.0  # across all chats (Telegram allows about 30)
+DEFAULT_MAX_RETRY_AFTER = 60.0     # a longer requested wait leaves the chunk for the next run
+DEFAULT_RETRIES = 3
+
+
+class Chunk:
+    """One message to one chat, and the jobs it announces."""
+
+    __slots__ = ("profile", "chat_id", "text", "job_ids", "outbox_id", "attempts")
+
+    def __init__(self, profile: str, chat_id: str, text: str, job_ids: list[str],
+                 outbox_id: int | None = None, attempts: int = 0):
+        self.profile = profile
+        self.chat_id = chat_id
+        self.text = text
+        self.job_ids = job_ids
+        self.outbox_id = outbox_id  # set when the chunk was loaded from the outbox
+        self.attempts = attempts
+
+
+class TelegramSender:
+    """Send chunks through the Bot API ``sendMessage`` method.
+
+    Args:
+        token: Bot token.
+        api_url: ``sendMessage`` URL template with a ``{token}`` field.
+        concurrency: Chats served in parallel.
+        per_chat_interval: Minimum seconds between messages to one chat.
+        messages_per_second: Rate shared by all chats.
+        max_retry_after: Give up on a chunk if Telegram asks to wait longer.
+        retries: Attempts per chunk on 429, 5xx and connection errors.
+    """
+
+    def __init__(
+        self,
+        token: str,
+        api_url: str = TELEGRAM_SEND_MESSAGE_URL,
+        *,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        per_chat_interval: float = DEFAULT_PER_CHAT_INTERVAL,
+        messages_per_second: float = DEFAULT_MESSAGES_PER_SECOND,
+        max_retry_after: float = DEFAULT_MAX_RETRY_AFTER,
+        retries: int = DEFAULT_RETRIES,
+    ):
+        self.url = api_url.format(token=token)
+        self.concurrency = max(1, concurrency)
+        self.per_chat_rate = 1 / per_chat_interval if per_chat_interval > 0 else float("inf")
+        self.max_retry_after = max_retry_after
+        self.retries = max(1, retries)
+        self._global = TokenBucket(messages_per_second)
+        self._chats: dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+        self.sent = 0
+        self.rate_limited = 0
+
+    def _chat_bucket(self, chat_id: str) -> TokenBucket | None:
+        if self.per_chat_rate == float("inf"):
+            return None
+        with self._lock:
+            bucket = self._chats.get(chat_id)
+            if bucket is None:
+                bucket = self._chats[chat_id] = TokenBucket(self.per_chat_rate)
+            return bucket
+
+    def send(self, chunk: Chunk) -> bool:
+        """Send one chunk, retrying 429s (after ``retry_after``), 5xx and connection errors."""
+        bucket = self._chat_bucket(chunk.chat_id)
+        payload = {
+            "chat_id": chunk.chat_id,
+            "text": chunk.text,
+            "parse_mode": "HTML",
+            "disable_web_page_preview": True,
+        }
+        for attempt in range(self.retries):
+            if bucket is not None:
+                bucket.acquire()
+            self._global.acquire()
+            try:
+                resp = get_client().post(self.url, json=payload, timeout=30)
+                result = resp.json()
+            except (requests.RequestException, ValueError) as e:
+                print(f"Telegram send to {chunk.chat_id} failed: {e}", file=sys.stderr)
+                time.sleep(2 ** attempt)
+                continue
+
+            if result.get("ok"):
+                with self._lock:
+                    self.sent += 1
+                print(f"Telegram message sent to {chunk.chat_id}.")
+                return True
+
+            if resp.status_code == 429:
+                wait = result.get("parameters", {}).get("retry_after") or retry_after(resp) or 1
+                with self._lock:
+                    self.rate_limited += 1
+                if wait > self.max_retry_after:
+                    print(f"Telegram asked to wait {wait}s for chat {chunk.chat_id}; leaving it for the next run",
+                          file=sys.stderr)
+                    return False
+                print(f"  Telegram rate limit for chat {chunk.chat_id}, retrying in {wait}s...", file=sys.stderr)
+                if bucket is not None:
+                    bucket.pause(wait)
+                else:
+                    time.sleep(wait)
+                continue
+
+            print(f"Telegram API error for chat {chunk.chat_id}: {result}", file=sys.stderr)
+            if resp.status_code < 500:
+                return False  # bad request, blocked bot, unknown chat: retrying will not help
+            time.sleep(2 ** attempt)
+        return False
+
+    def _send_chat(self, chunks: list[Chunk]) -> tuple[list[Chunk], list[Chunk]]:
+        for i, chunk in enumerate(chunks):
+            if not self.send(chunk):
+                return chunks[:i], chunks[i:]  # keep the chat's messages in order
+        return chunks, []
+
+    def deliver(self, chunks: list[Chunk]) -> tuple[list[Chunk], list[Chunk]]:
+        """Send every chunk, chats in parallel; returns (delivered, undelivered)."""
+        by_chat: dict[str, list[Chunk]] = {}
+        for chunk in chunks:
+            by_chat.setdefault(chunk.chat_id, []).append(chunk)
+
+        delivered: list[Chunk] = []
+        undelivered: list[Chunk] = []
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, max(1, len(by_chat)))) as pool:
+            for ok, failed in pool.map(self._send_chat, by_chat.values()):
+                delivered += ok
+                undelivered += failed
+        return delivered, undelivered
+
+
+def create_sender(config: dict, token: str, api_url: str = TELEGRAM_SEND_MESSAGE_URL) -> TelegramSender:
+    """Build a sender from the optional ``telegram`` config block."""
+    telegram_cfg = config.get("telegram", {})
+    return TelegramSender(
+        token,
+        api_url,
+        concurrency=telegram_cfg.get("concurrency", DEFAULT_CONCURRENCY),
+        per_chat_interval=telegram_cfg.get("perChatInterval", DEFAULT_PER_CHAT_INTERVAL),
+        messages_per_second=telegram_cfg.get("messagesPerSecond", DEFAULT_MESSAGES_PER_SECOND),
+        max_retry_after=telegram_cfg.get("maxRetryAfter", DEFAULT_MAX_RETRY_AFTER),
+    )